@@ -53,6 +53,7 @@ def main():
         slice_metrics_prefs_path,
         text_slice_progress_path,
     )
+    from src.backend.integration.ott_segment_provider import shutdown_prefetch_executor
     from src.backend.integration.slice_metrics_prefs_store import SliceMetricsPrefsStore
     from src.backend.integration.text_slice_progress_store import TextSliceProgressStore
 
@@ -106,8 +107,11 @@ def main():
 
     # 事件循环 + 清理
     exit_code = app.exec()
-    services.char_stats.flush()
+    services.char_stats.close()
+    gateways.typing_history.close()
     providers.federation.close()
+    shutdown_prefetch_executor()
+    text_slice_progress_store.close()
     if adapters.key_listener:
         adapters.key_listener.stop()
     del engine
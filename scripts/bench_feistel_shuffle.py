@@ -0,0 +1,83 @@
+"""全文虚拟乱序排列基准：SHA-256 版逐个 encode vs 批量 encode_many。
+
+用法：
+    uv run python scripts/bench_feistel_shuffle.py [--chars 10000000] [--slice 500] [--runs 20]
+
+对同一 seed 在 [0, chars) 上取 runs 个随机起点，每次编码 slice 个连续下标
+（即一片乱序文本所需的排列计算），分别测量：
+旧路径（SHA-256 F 函数，逐个 encode）、SHA-256 批量、SplitMix64 批量。
+打印各路径的中位数 / p90 / 平均耗时（毫秒）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# 让脚本能从项目根导入 src 包
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.backend.application.usecases.text_session_usecase import (
+    SHUFFLE_VERSION_MIX64,
+    SHUFFLE_VERSION_SHA256,
+    _FeistelPermutation,
+)
+
+
+def measure(
+    encode: Callable[[range], object], starts: list[int], size: int
+) -> list[float]:
+    timings: list[float] = []
+    for start in starts:
+        begin = time.perf_counter()
+        encode(range(start, start + size))
+        timings.append((time.perf_counter() - begin) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+    print(
+        f"{label:<14} median={statistics.median(timings):8.2f}"
+        f"  p90={p90:8.2f}  mean={statistics.fmean(timings):8.2f}  (ms, n={len(timings)})"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=10_000_000)
+    parser.add_argument("--slice", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=12345)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    size = min(args.slice, args.chars)
+    starts = [rng.randrange(0, args.chars - size + 1) for _ in range(args.runs)]
+
+    legacy = _FeistelPermutation(args.chars, args.seed, SHUFFLE_VERSION_SHA256)
+    mixed = _FeistelPermutation(args.chars, args.seed, SHUFFLE_VERSION_MIX64)
+
+    per_index = measure(lambda r: [legacy.encode(i) for i in r], starts, size)
+    legacy_batch = measure(legacy.encode_many, starts, size)
+    mixed_batch = measure(mixed.encode_many, starts, size)
+
+    report("sha256/encode", per_index)
+    report("sha256/batch", legacy_batch)
+    report("mix64/batch", mixed_batch)
+    print(
+        f"speedup (median, mix64 vs sha256/encode): "
+        f"{statistics.median(per_index) / statistics.median(mixed_batch):.1f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
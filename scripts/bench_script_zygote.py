@@ -0,0 +1,73 @@
+"""ott-script 冷启动 vs zygote 预热路径基准。
+
+用法：
+    uv run python scripts/bench_script_zygote.py [--runs 20]
+
+对同一个平凡的 fetch_entries() 脚本分别用冷启动（每次新起解释器）与
+zygote（预热父进程 fork 子进程）执行 runs 次，打印每条路径的
+首次 / 中位数 / p90 / 平均耗时（毫秒）。zygote 的首次耗时含其自身启动。
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 让脚本能从项目根导入 src 包
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.backend.integration.ott_script_client import ScriptSandbox
+from src.backend.integration.ott_script_zygote import ScriptZygotePool
+
+TRIVIAL_SCRIPT = 'def fetch_entries():\n    return [{"title": "T", "content": "ok"}]\n'
+
+
+def measure(sandbox: ScriptSandbox, runs: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        entries = sandbox.execute_strict(TRIVIAL_SCRIPT, "bench://trivial")
+        timings.append((time.perf_counter() - start) * 1000)
+        if not entries:
+            print("错误：脚本执行失败（沙箱不可用？）", file=sys.stderr)
+            sys.exit(1)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+    print(
+        f"{label:<6} first={timings[0]:8.1f}  median={statistics.median(timings):8.1f}"
+        f"  p90={p90:8.1f}  mean={statistics.fmean(timings):8.1f}  (ms, n={len(timings)})"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    if not ScriptZygotePool.supported():
+        print("当前平台不支持 fork，zygote 路径不可用", file=sys.stderr)
+        return 1
+
+    cold = measure(ScriptSandbox(), args.runs)
+    pool = ScriptZygotePool()
+    try:
+        warm = measure(ScriptSandbox(zygote_pool=pool), args.runs)
+    finally:
+        pool.close()
+
+    report("cold", cold)
+    report("zygote", warm)
+    print(f"speedup (median): {statistics.median(cold) / statistics.median(warm):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,15 +2,89 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import date, datetime, time, timedelta
 from typing import Any, Callable
 
 from ...ports.typing_history_store import TypingHistoryStore
 
+_PERIODS = ("hour", "day", "week", "month")
+
+
+class _HistoryAggregates:
+    """历史记录的物化聚合：各粒度字数桶 + 摘要累计量。
+
+    每条记录只解析一次日期，按 hour/day/week/month 键累加字数；速度与键准
+    的和、计数随增删同步加减，速度按取值计数以便删除最大值后精确重算。
+    """
+
+    __slots__ = (
+        "buckets",
+        "key_accuracy_count",
+        "key_accuracy_sum",
+        "max_speed",
+        "speed_count",
+        "speed_counts",
+        "speed_sum",
+        "total",
+        "total_chars",
+    )
+
+    def __init__(self) -> None:
+        self.buckets: dict[str, dict[str, int]] = {p: {} for p in _PERIODS}
+        self.total = 0
+        self.total_chars = 0
+        self.speed_sum = 0.0
+        self.speed_count = 0
+        self.key_accuracy_sum = 0.0
+        self.key_accuracy_count = 0
+        self.speed_counts: dict[float, int] = {}
+        self.max_speed = 0.0
+
+    def add(self, record: dict[str, Any]) -> None:
+        self._apply(record, 1)
+
+    def remove(self, record: dict[str, Any]) -> None:
+        self._apply(record, -1)
+
+    def _apply(self, record: dict[str, Any], sign: int) -> None:
+        chars = TypingHistoryGateway._safe_int(record.get("charNum"))
+        self.total += sign
+        self.total_chars += sign * chars
+        for period, key in TypingHistoryGateway._bucket_keys(record.get("date")):
+            bucket = self.buckets[period]
+            value = bucket.get(key, 0) + sign * chars
+            if value:
+                bucket[key] = value
+            else:
+                bucket.pop(key, None)
+
+        speed = record.get("speed")
+        if isinstance(speed, (int, float)) and speed >= 0:
+            speed = float(speed)
+            self.speed_sum += sign * speed
+            self.speed_count += sign
+            remaining = self.speed_counts.get(speed, 0) + sign
+            if remaining > 0:
+                self.speed_counts[speed] = remaining
+            else:
+                self.speed_counts.pop(speed, None)
+            if sign > 0:
+                self.max_speed = max(self.max_speed, speed)
+            elif speed >= self.max_speed and remaining <= 0:
+                self.max_speed = max(self.speed_counts, default=0.0)
+
+        ka = record.get("keyAccuracy")
+        if isinstance(ka, (int, float)) and ka >= 0:
+            self.key_accuracy_sum += sign * float(ka)
+            self.key_accuracy_count += sign
+
 
 class TypingHistoryGateway:
-    """维护本地持久化的打字历史记录，并提供聚合统计。"""
+    """维护本地持久化的打字历史记录，并提供聚合统计。
+
+    摘要与趋势读取物化聚合（首次使用时从存储重建一次），之后随
+    append_record 与保留上限删除增量维护，统计页查询代价只与桶数相关。
+    """
 
     def __init__(
         self,
@@ -21,57 +95,58 @@ class TypingHistoryGateway:
         self._store = store
         self._max_records = max_records
         self._today_provider = today_provider
+        self._aggregates: _HistoryAggregates | None = None
 
     def append_record(self, record: dict[str, Any]) -> None:
-        """追加一条历史记录。"""
-        data = self._load_normalized()
+        """追加一条历史记录，超出保留上限的最旧记录由存储层删除。"""
         clean = self._normalize_record(record)
-        data["records"].insert(0, clean)
-        if len(data["records"]) > self._max_records:
-            data["records"] = data["records"][: self._max_records]
-        self._store.save(data)
+        evicted = self._store.append(clean, self._max_records)
+        if self._aggregates is not None:
+            self._aggregates.add(clean)
+            for old in evicted:
+                self._aggregates.remove(old)
 
     def get_records(self, limit: int = 50) -> list[dict[str, Any]]:
         """返回最近 N 条历史记录。"""
-        data = self._load_normalized()
-        return list(data["records"][:limit])
+        return self._store.recent(limit)
 
     def get_count(self) -> int:
-        return len(self._load_normalized()["records"])
+        return self._store.count()
+
+    def set_max_records(self, max_records: int) -> None:
+        """更新保留上限并立即删除超限的最旧记录。"""
+        self._max_records = max_records
+        evicted = self._store.truncate(max_records)
+        if self._aggregates is not None:
+            for old in evicted:
+                self._aggregates.remove(old)
+
+    def rebuild_aggregates(self) -> None:
+        """从存储全量重建聚合（存储被外部改写后调用）。"""
+        aggregates = _HistoryAggregates()
+        for record in self._load_normalized()["records"]:
+            if isinstance(record, dict):
+                aggregates.add(record)
+        self._aggregates = aggregates
+
+    def close(self) -> None:
+        self._store.close()
 
     def get_summary(self) -> dict[str, float | int]:
         """返回历史记录聚合摘要。"""
-        records = self._load_normalized()["records"]
-        total = len(records)
-        if total == 0:
-            return {
-                "total_sessions": 0,
-                "average_speed": 0.0,
-                "max_speed": 0.0,
-                "average_key_accuracy": 0.0,
-                "total_chars": 0,
-            }
-
-        speeds: list[float] = []
-        key_accuracies: list[float] = []
-        total_chars = 0
-        for r in records:
-            speed = r.get("speed")
-            if isinstance(speed, (int, float)) and speed >= 0:
-                speeds.append(float(speed))
-            ka = r.get("keyAccuracy")
-            if isinstance(ka, (int, float)) and ka >= 0:
-                key_accuracies.append(float(ka))
-            total_chars += self._safe_int(r.get("charNum"))
-
+        agg = self._ensure_aggregates()
         return {
-            "total_sessions": total,
-            "average_speed": round(sum(speeds) / len(speeds), 2) if speeds else 0.0,
-            "max_speed": round(max(speeds), 2) if speeds else 0.0,
-            "average_key_accuracy": round(sum(key_accuracies) / len(key_accuracies), 2)
-            if key_accuracies
+            "total_sessions": agg.total,
+            "average_speed": round(agg.speed_sum / agg.speed_count, 2)
+            if agg.speed_count
+            else 0.0,
+            "max_speed": round(agg.max_speed, 2) if agg.speed_count else 0.0,
+            "average_key_accuracy": round(
+                agg.key_accuracy_sum / agg.key_accuracy_count, 2
+            )
+            if agg.key_accuracy_count
             else 0.0,
-            "total_chars": total_chars,
+            "total_chars": agg.total_chars,
         }
 
     def get_trend(self, period: str = "day") -> list[dict[str, Any]]:
@@ -86,32 +161,16 @@ class TypingHistoryGateway:
 
     def get_daily_trend(self, days: int = 30) -> list[dict[str, Any]]:
         """返回最近 days 天每日字数列表（按日期升序）。"""
-        records = self._load_normalized()["records"]
-        daily: dict[str, int] = defaultdict(int)
-        for r in records:
-            date_key = self._extract_date_key(r.get("date"))
-            if date_key:
-                daily[date_key] += self._safe_int(r.get("charNum"))
-
+        daily = self._ensure_aggregates().buckets["day"]
         today = self._today_provider()
-
         result = []
         for i in range(days - 1, -1, -1):
-            day = today - timedelta(days=i)
-            key = day.isoformat()
+            key = (today - timedelta(days=i)).isoformat()
             result.append({"date": key, "period": "day", "chars": daily.get(key, 0)})
         return result
 
     def _get_hourly_trend(self) -> list[dict[str, Any]]:
-        records = self._load_normalized()["records"]
-        hourly: dict[str, int] = defaultdict(int)
-        for r in records:
-            dt = self._parse_record_datetime(r.get("date"))
-            if dt:
-                hourly[dt.strftime("%Y-%m-%d %H:00")] += self._safe_int(
-                    r.get("charNum")
-                )
-
+        hourly = self._ensure_aggregates().buckets["hour"]
         today_start = datetime.combine(self._today_provider(), time.min)
         result = []
         for i in range(24):
@@ -121,15 +180,7 @@ class TypingHistoryGateway:
         return result
 
     def _get_weekly_trend(self, weeks: int = 12) -> list[dict[str, Any]]:
-        records = self._load_normalized()["records"]
-        weekly: dict[str, int] = defaultdict(int)
-        for r in records:
-            dt = self._parse_record_datetime(r.get("date"))
-            if dt:
-                weekly[self._iso_week_key(dt.date())] += self._safe_int(
-                    r.get("charNum")
-                )
-
+        weekly = self._ensure_aggregates().buckets["week"]
         current_week_start = self._today_provider() - timedelta(
             days=self._today_provider().weekday()
         )
@@ -141,13 +192,7 @@ class TypingHistoryGateway:
         return result
 
     def _get_monthly_trend(self, months: int = 12) -> list[dict[str, Any]]:
-        records = self._load_normalized()["records"]
-        monthly: dict[str, int] = defaultdict(int)
-        for r in records:
-            dt = self._parse_record_datetime(r.get("date"))
-            if dt:
-                monthly[dt.strftime("%Y-%m")] += self._safe_int(r.get("charNum"))
-
+        monthly = self._ensure_aggregates().buckets["month"]
         today = self._today_provider()
         result = []
         for i in range(months - 1, -1, -1):
@@ -158,6 +203,25 @@ class TypingHistoryGateway:
             )
         return result
 
+    def _ensure_aggregates(self) -> _HistoryAggregates:
+        if self._aggregates is None:
+            self.rebuild_aggregates()
+        return self._aggregates
+
+    @staticmethod
+    def _bucket_keys(date_str: Any) -> list[tuple[str, str]]:
+        """返回记录所属的 (粒度, 桶键) 列表；日期只解析一次。"""
+        keys: list[tuple[str, str]] = []
+        date_key = TypingHistoryGateway._extract_date_key(date_str)
+        if date_key:
+            keys.append(("day", date_key))
+        dt = TypingHistoryGateway._parse_record_datetime(date_str)
+        if dt:
+            keys.append(("hour", dt.strftime("%Y-%m-%d %H:00")))
+            keys.append(("week", TypingHistoryGateway._iso_week_key(dt.date())))
+            keys.append(("month", dt.strftime("%Y-%m")))
+        return keys
+
     def _load_normalized(self) -> dict[str, Any]:
         data = self._store.load()
         records = data.get("records")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 from ...models.dto.text_session import SegmentResult, TextHandle
@@ -10,25 +11,78 @@ if TYPE_CHECKING:
     pass
 
 
+# 虚拟全文乱序的排列版本（随 shuffle_seed 一起存入进度，保证恢复时得到同一顺序）
+# 1：每轮 SHA-256 作 F 函数（旧进度没有版本字段，按此复现）
+# 2：每轮 SplitMix64 整数混淆作 F 函数，逐轮批量计算
+SHUFFLE_VERSION_SHA256 = 1
+SHUFFLE_VERSION_MIX64 = 2
+SHUFFLE_VERSION = SHUFFLE_VERSION_MIX64
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MIX_MUL1 = 0xBF58476D1CE4E5B9
+_MIX_MUL2 = 0x94D049BB133111EB
+
+
+def _splitmix64(state: int) -> int:
+    z = (state + _GOLDEN_GAMMA) & _MASK64
+    z = ((z ^ (z >> 30)) * _MIX_MUL1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX_MUL2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _mix64_round(values: list[int], key: int, mask: int) -> list[int]:
+    """对一批右半部分做 SplitMix64 终混（内联展开，省去逐个函数调用）。"""
+    out = []
+    append = out.append
+    for v in values:
+        z = (v + key) & _MASK64
+        z = ((z ^ (z >> 30)) * _MIX_MUL1) & _MASK64
+        z = ((z ^ (z >> 27)) * _MIX_MUL2) & _MASK64
+        append((z ^ (z >> 31)) & mask)
+    return out
+
+
 class _FeistelPermutation:
     """基于平衡 Feistel 网络的可逆伪随机排列。
 
     对 [0, range) 内的整数建立双射映射，只需 O(1) 内存。
     使用平衡 Feistel（等宽左右半部分）+ cycle walking 确保输出在 [0, range) 内。
-    F 函数使用 SHA-256 混淆，保证 cycle walking 快速收敛（期望 2 轮以内）。
+
+    version 决定 F 函数：SHUFFLE_VERSION_SHA256 为旧版（每次调用一次 SHA-256），
+    SHUFFLE_VERSION_MIX64 为 SplitMix64 整数混淆。两者排列不同，
+    同一 (seed, version) 的排列永远不变。encode_many 按轮对整批下标计算，
+    cycle walking 只对仍越界的子集继续迭代。
     """
 
     _ROUNDS = 8
+    # SplitMix64 已是强混淆，6 轮足以打散（Luby-Rackoff 要求至少 4 轮）
+    _MIX_ROUNDS = 6
 
-    def __init__(self, range_: int, seed: int) -> None:
+    def __init__(
+        self, range_: int, seed: int, version: int = SHUFFLE_VERSION_SHA256
+    ) -> None:
+        if version not in (SHUFFLE_VERSION_SHA256, SHUFFLE_VERSION_MIX64):
+            raise ValueError(f"未知的乱序版本: {version}")
         self._range = range_
-        total_bits = max(2, (range_ - 1).bit_length() + 1)
+        self._version = version
+        # 旧版多留 1 位（domain 为 range 的 2~8 倍）；新版取最紧的偶数位宽
+        # （1~4 倍），cycle walking 的期望迭代次数随之减半以上
+        extra_bit = 1 if version == SHUFFLE_VERSION_SHA256 else 0
+        total_bits = max(2, (range_ - 1).bit_length() + extra_bit)
         if total_bits % 2:
             total_bits += 1
         self._half_bits = total_bits // 2
         self._half_mask = (1 << self._half_bits) - 1
         self._domain = 1 << total_bits
-        self._round_keys = self._derive_round_keys(seed)
+        if version == SHUFFLE_VERSION_SHA256:
+            self._round_keys = self._derive_round_keys(seed)
+        else:
+            self._round_keys = self._derive_mix_keys(seed)
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     @staticmethod
     def _derive_round_keys(seed: int) -> list[int]:
@@ -40,11 +94,28 @@ class _FeistelPermutation:
             keys.append(current)
         return keys
 
+    @staticmethod
+    def _derive_mix_keys(seed: int) -> list[int]:
+        keys = []
+        state = seed & _MASK64
+        for _ in range(_FeistelPermutation._MIX_ROUNDS):
+            state = (state + _GOLDEN_GAMMA) & _MASK64
+            keys.append(_splitmix64(state))
+        return keys
+
     def _F(self, value: int, round_key: int) -> int:
+        if self._version == SHUFFLE_VERSION_MIX64:
+            return _mix64_round([value], round_key, self._half_mask)[0]
         data = (value ^ round_key).to_bytes(32, "big")
         h = hashlib.sha256(data).digest()
         return int.from_bytes(h[:8], "big") & self._half_mask
 
+    def _round_many(self, rights: list[int], round_key: int) -> list[int]:
+        if self._version == SHUFFLE_VERSION_MIX64:
+            return _mix64_round(rights, round_key, self._half_mask)
+        F = self._F
+        return [F(r, round_key) for r in rights]
+
     def _feistel(self, value: int) -> int:
         left = value >> self._half_bits
         right = value & self._half_mask
@@ -52,6 +123,15 @@ class _FeistelPermutation:
             left, right = right, (left ^ self._F(right, rk)) & self._half_mask
         return (left << self._half_bits) | right
 
+    def _feistel_many(self, values: list[int]) -> list[int]:
+        half_bits = self._half_bits
+        lefts = [v >> half_bits for v in values]
+        rights = [v & self._half_mask for v in values]
+        for rk in self._round_keys:
+            mixed = self._round_many(rights, rk)
+            lefts, rights = rights, [lft ^ f for lft, f in zip(lefts, mixed)]
+        return [(lft << half_bits) | r for lft, r in zip(lefts, rights)]
+
     def encode(self, index: int) -> int:
         if self._range <= 1:
             return index
@@ -60,9 +140,26 @@ class _FeistelPermutation:
             result = self._feistel(result)
         return result
 
+    def encode_many(self, indices: Sequence[int]) -> list[int]:
+        """批量编码：逐轮对整批计算，越界结果收集成子批继续 cycle walking。"""
+        if self._range <= 1:
+            return list(indices)
+        limit = self._range
+        result = self._feistel_many(list(indices))
+        pending = [k for k, v in enumerate(result) if v >= limit]
+        while pending:
+            walked = self._feistel_many([result[k] for k in pending])
+            still = []
+            for k, v in zip(pending, walked):
+                result[k] = v
+                if v >= limit:
+                    still.append(k)
+            pending = still
+        return result
+
 
 class _ShuffledSegmentProvider:
-    """通过虚拟 permutation 从原始 provider 逐字符构造乱序段。"""
+    """通过虚拟 permutation 从原始 provider 构造乱序段（一次 gather 读取）。"""
 
     def __init__(
         self, original: TextSegmentProvider, perm: _FeistelPermutation
@@ -77,12 +174,12 @@ class _ShuffledSegmentProvider:
         if start >= total:
             return ""
         actual_length = min(length, total - start)
-        indices = [self._perm.encode(start + i) for i in range(actual_length)]
-        sorted_pairs = sorted(enumerate(indices), key=lambda p: p[1])
-        result = [""] * actual_length
-        for dest_idx, orig_idx in sorted_pairs:
-            result[dest_idx] = self._original.get_segment(orig_idx, 1)
-        return "".join(result)
+        return self.get_chars(range(start, start + actual_length))
+
+    def get_chars(self, indices: Sequence[int]) -> str:
+        total = self._original.get_total_chars()
+        wanted = [i for i in indices if 0 <= i < total]
+        return self._original.get_chars(self._perm.encode_many(wanted))
 
     def get_total_chars(self) -> int:
         return self._original.get_total_chars()
@@ -111,6 +208,7 @@ class TextSessionUseCase:
         self._total_chars = provider.get_total_chars()
         self._full_shuffle_threshold = full_shuffle_threshold
         self._in_memory_provider_cls = in_memory_provider_cls
+        self._shuffle_version: int | None = None
 
     @property
     def handle(self) -> TextHandle:
@@ -139,18 +237,32 @@ class TextSessionUseCase:
         rng.shuffle(chars)
         return "".join(chars)
 
-    def shuffle_all_virtual(self, seed: int) -> "TextSessionUseCase":
+    @property
+    def shuffle_version(self) -> int | None:
+        """全文乱序所用排列版本；未乱序为 None。"""
+        return self._shuffle_version
+
+    def shuffle_all_virtual(
+        self, seed: int, shuffle_version: int | None = SHUFFLE_VERSION
+    ) -> "TextSessionUseCase":
         """全文虚拟乱序：小文本全量 shuffle，大文本用 Feistel permutation。
 
+        shuffle_version 只影响 Feistel 路径：新会话用默认的当前版本；
+        恢复进度时传入保存的版本，旧进度没有版本字段（None）按 SHA-256 版复现。
         返回新的 TextSessionUseCase，后续分片操作在乱序后的序列上进行。
         """
         if self._total_chars <= 0:
             return self
 
+        version = (
+            shuffle_version if shuffle_version is not None else SHUFFLE_VERSION_SHA256
+        )
         if self._total_chars <= self._full_shuffle_threshold:
-            return self._shuffle_full(seed)
-
-        return self._shuffle_feistel(seed)
+            shuffled = self._shuffle_full(seed)
+        else:
+            shuffled = self._shuffle_feistel(seed, version)
+        shuffled._shuffle_version = version
+        return shuffled
 
     def _shuffle_full(self, seed: int) -> "TextSessionUseCase":
         """小文本：全量读入内存 shuffle，创建新的 InMemory provider。"""
@@ -187,9 +299,9 @@ class TextSessionUseCase:
             in_memory_provider_cls=self._in_memory_provider_cls,
         )
 
-    def _shuffle_feistel(self, seed: int) -> "TextSessionUseCase":
+    def _shuffle_feistel(self, seed: int, version: int) -> "TextSessionUseCase":
         """大文本：用 Feistel permutation 做虚拟乱序。"""
-        perm = _FeistelPermutation(self._total_chars, seed)
+        perm = _FeistelPermutation(self._total_chars, seed, version)
         new_provider = _ShuffledSegmentProvider(self._provider, perm)
         new_handle = TextHandle(
             kind=self._handle.kind,
@@ -154,6 +154,11 @@ def typing_history_path() -> Path:
     return user_data_dir() / "typing_history.json"
 
 
+def typing_history_db_path() -> Path:
+    """打字历史记录 SQLite 数据库路径（旧版 JSON 首次打开时迁入）。"""
+    return user_data_dir() / "typing_history.db"
+
+
 def score_retry_db_path() -> Path:
     """成绩重试队列 SQLite 数据库路径。"""
     return user_data_dir() / "score_retry.db"
@@ -17,6 +17,7 @@ from .app_paths import (
     ensure_user_trainer_seeded,
     ensure_user_ziti_seeded,
     load_common_chars,
+    typing_history_db_path,
     typing_history_path,
     typing_totals_path,
     user_fonts_dir,
@@ -270,7 +271,7 @@ def create_gateways(
     from ..application.gateways.trainer_gateway import TrainerGateway
     from ..application.gateways.typing_history_gateway import TypingHistoryGateway
     from ..application.gateways.typing_totals_gateway import TypingTotalsGateway
-    from ..integration.json_typing_history_store import JsonTypingHistoryStore
+    from ..integration.sqlite_typing_history_store import SqliteTypingHistoryStore
     from ..integration.json_typing_totals_store import JsonTypingTotalsStore
 
     return Gateways(
@@ -291,7 +292,9 @@ def create_gateways(
             store=JsonTypingTotalsStore(typing_totals_path())
         ),
         typing_history=TypingHistoryGateway(
-            store=JsonTypingHistoryStore(typing_history_path()),
+            store=SqliteTypingHistoryStore(
+                typing_history_db_path(), legacy_json_path=typing_history_path()
+            ),
             max_records=runtime_config.typing_history_max_records,
         ),
     )
@@ -347,6 +350,7 @@ def create_services(infra: Infra, runtime_config: RuntimeConfig) -> Services:
     char_stats_service = CharStatsService(
         repository=char_stats_repo,
         async_executor=async_executor,
+        cache_capacity=runtime_config.char_stats_cache_capacity,
     )
     common_chars = load_common_chars()
     if common_chars:
@@ -391,7 +395,7 @@ def create_adapters(
     from ..presentation.adapters.update_adapter import UpdateAdapter
     from ..application.gateways.font_gateway import FontGateway
     from ..integration.qt_async_executor import QtAsyncExecutor
-    from ..integration.entry_snapshot_store import EntrySnapshotStore
+    from ..integration.sqlite_entry_snapshot_store import SqliteEntrySnapshotStore
     from ..integration.refresh_scheduler import RefreshScheduler
     from ..integration.source_status_store import SourceStatusStore
     from ..application.services.snapshot_catalog_service import SnapshotCatalogService
@@ -447,7 +451,7 @@ def create_adapters(
 
     # OTT Repo 联邦目录适配层（订阅配置直接注入，不穿透 federation 私有字段）
     # 动态源快照目录：物化落盘 + 快照优先载入 + 用户 per-source 覆盖 + 常驻调度
-    snapshot_store = EntrySnapshotStore(
+    snapshot_store = SqliteEntrySnapshotStore(
         cache_dir=registry_cache_dir(), max_per_source=5
     )
     source_status_store = SourceStatusStore(cache_dir=registry_cache_dir())
@@ -110,6 +110,14 @@ class AiConfig:
             self.max_chars = 50
 
 
+# 单源物化截止时间默认值：须大于 ott-script 下载（10s）与执行（30s）超时
+# 之和，正常跑满超时的脚本源不会先被判为刷新失败
+DEFAULT_LIST_SOURCE_DEADLINE_S = 60
+
+# 缓存正文 blob 层总大小上限默认值（256 MiB）
+DEFAULT_BLOB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
 def _default_scripts_enabled() -> bool:
     """ott-script（L3）默认开关：Windows 默认禁用（无 Landlock/Job Object 沙箱）。"""
     return sys.platform != "win32"
@@ -127,6 +135,11 @@ class OttConfig:
       与 manifest mirrors 不同——这是客户端侧全局候选，不随仓库声明）
     - route_probe_ttl_seconds：智能路由探测结果缓存 TTL（秒；TTL 内直接
       复用上次排序，不重复探测；默认 300s）
+    - list_concurrency：联邦全量物化时并行执行的源数上限（1 = 逐源串行）
+    - list_per_host_concurrency：同一主机上同时物化的源数上限
+    - list_source_deadline_seconds：单源物化截止时间（秒；超时计入刷新失败）
+    - blob_cache_max_bytes：缓存正文共享 blob 层的总大小上限（超出按 LRU 回收）
+    - route_hedging：智能路由对冲请求（最优候选迟迟不响应时并行尝试下一候选）
     """
 
     cache_ttl_seconds: int = 3600
@@ -134,6 +147,11 @@ class OttConfig:
     scripts_enabled: bool = field(default_factory=_default_scripts_enabled)
     route_mirrors: list[str] = field(default_factory=list)
     route_probe_ttl_seconds: int = 300
+    list_concurrency: int = 6
+    list_per_host_concurrency: int = 2
+    list_source_deadline_seconds: int = DEFAULT_LIST_SOURCE_DEADLINE_S
+    blob_cache_max_bytes: int = DEFAULT_BLOB_CACHE_MAX_BYTES
+    route_hedging: bool = True
 
     def __post_init__(self) -> None:
         if self.cache_ttl_seconds < 0:
@@ -152,6 +170,25 @@ class OttConfig:
             or self.route_probe_ttl_seconds < 1
         ):
             self.route_probe_ttl_seconds = 300
+        if not isinstance(self.list_concurrency, int) or self.list_concurrency < 1:
+            self.list_concurrency = 6
+        if (
+            not isinstance(self.list_per_host_concurrency, int)
+            or self.list_per_host_concurrency < 1
+        ):
+            self.list_per_host_concurrency = 2
+        if (
+            not isinstance(self.list_source_deadline_seconds, int)
+            or self.list_source_deadline_seconds < 1
+        ):
+            self.list_source_deadline_seconds = DEFAULT_LIST_SOURCE_DEADLINE_S
+        if (
+            not isinstance(self.blob_cache_max_bytes, int)
+            or self.blob_cache_max_bytes < 1
+        ):
+            self.blob_cache_max_bytes = DEFAULT_BLOB_CACHE_MAX_BYTES
+        if not isinstance(self.route_hedging, bool):
+            self.route_hedging = True
 
 
 @dataclass
@@ -291,6 +328,7 @@ class RuntimeConfig:
     V1_LEGACY_KEYS: ClassVar[tuple[str, ...]] = ("base_url", "api_timeout", "registry")
 
     typing_history_max_records: int = 2000  # 打字历史最多保留条数
+    char_stats_cache_capacity: int = 8000  # 字符统计内存缓存最多条目数（LRU）
     blocked_content_hashes: list[str] = field(default_factory=list)
 
     text_source_config: TextSourceConfig = field(default_factory=TextSourceConfig)
@@ -683,6 +721,18 @@ class RuntimeConfig:
             route_probe_ttl_seconds=cls._safe_int(
                 ott_data.get("route_probe_ttl_seconds"), 300
             ),
+            list_concurrency=cls._safe_int(ott_data.get("list_concurrency"), 6),
+            list_per_host_concurrency=cls._safe_int(
+                ott_data.get("list_per_host_concurrency"), 2
+            ),
+            list_source_deadline_seconds=cls._safe_int(
+                ott_data.get("list_source_deadline_seconds"),
+                DEFAULT_LIST_SOURCE_DEADLINE_S,
+            ),
+            blob_cache_max_bytes=cls._safe_int(
+                ott_data.get("blob_cache_max_bytes"), DEFAULT_BLOB_CACHE_MAX_BYTES
+            ),
+            route_hedging=cls._safe_bool(ott_data.get("route_hedging"), True),
         )
 
         update_data = data.get("update", {})
@@ -761,6 +811,9 @@ class RuntimeConfig:
             typing_history_max_records=cls._safe_int(
                 data.get("typing_history_max_records"), 2000
             ),
+            char_stats_cache_capacity=cls._safe_int(
+                data.get("char_stats_cache_capacity"), 8000
+            ),
             blocked_content_hashes=blocked_content_hashes,
             text_source_config=text_source_config,
             wenlai=wenlai,
@@ -1161,6 +1214,7 @@ class RuntimeConfig:
             data = json.loads(path.read_text(encoding="utf-8"))
             updated = self._from_dict(data)
             self.typing_history_max_records = updated.typing_history_max_records
+            self.char_stats_cache_capacity = updated.char_stats_cache_capacity
             self.blocked_content_hashes = updated.blocked_content_hashes
             self.text_source_config = updated.text_source_config
             self.wenlai = updated.wenlai
@@ -1186,6 +1240,7 @@ class RuntimeConfig:
             "schema_version": self.SCHEMA_VERSION,
             "default_text_source_key": self.default_text_source_key,
             "typing_history_max_records": self.typing_history_max_records,
+            "char_stats_cache_capacity": self.char_stats_cache_capacity,
             "blocked_content_hashes": list(self.blocked_content_hashes),
             "text_sources": {
                 key: {
@@ -1200,6 +1255,11 @@ class RuntimeConfig:
                 "scripts_enabled": self.ott.scripts_enabled,
                 "route_mirrors": list(self.ott.route_mirrors),
                 "route_probe_ttl_seconds": self.ott.route_probe_ttl_seconds,
+                "list_concurrency": self.ott.list_concurrency,
+                "list_per_host_concurrency": self.ott.list_per_host_concurrency,
+                "list_source_deadline_seconds": self.ott.list_source_deadline_seconds,
+                "blob_cache_max_bytes": self.ott.blob_cache_max_bytes,
+                "route_hedging": self.ott.route_hedging,
             },
             "update": {
                 "enabled": self.update.enabled,
@@ -1,9 +1,11 @@
 import heapq
+import threading
+from datetime import datetime
 
-from ...models.entity.char_stat import CharStat
+from ...models.entity.char_stat import CharStat, CharStatTable
 from ...ports.async_executor import AsyncExecutor
 from ...ports.char_stats_repository import CharStatsRepository
-from ...utils.logger import log_debug
+from ...utils.logger import lazy, log_debug
 
 
 def _is_cjk(char: str) -> bool:
@@ -36,7 +38,15 @@ class CharStatsService:
     """字符统计领域服务，纯业务逻辑。
 
     采用按需加载（lazy loading）：首次遇到字符时才从数据库读取，
-    避免启动时全量加载到内存。
+    避免启动时全量加载到内存。载文时通过 prefetch() 把整篇文本涉及的
+    字符一次性批量读入缓存，打字期间的 accumulate 不再触盘；
+    仍然发生的同步读取计入 cold_misses，用于确认命中率。
+
+    全局缓存是容量受限的 LRU：超出 cache_capacity 时从最久未用的一端
+    淘汰，但脏条目与正在后台写入的条目永不淘汰——只有落盘完成后才可能
+    被逐出，因此淘汰不会丢失任何未持久化的累积。统计值按列存放在
+    CharStatTable 的平行数组中，LRU 表只记录 字符 → 槽位；last_seen
+    在每次落盘时统一盖戳，而不是每次击键格式化一次时间。
 
     职责：
     - 字符统计数据的缓存管理
@@ -48,26 +58,48 @@ class CharStatsService:
     - 异步任务执行（由 AsyncExecutor 负责）
     """
 
+    DEFAULT_CACHE_CAPACITY = 8000
+    MIN_CACHE_CAPACITY = 500
+
     def __init__(
         self,
         repository: CharStatsRepository,
         async_executor: AsyncExecutor | None = None,
+        cache_capacity: int = DEFAULT_CACHE_CAPACITY,
     ):
         self._repo = repository
         self._async_executor = async_executor
-        self._cache: dict[str, CharStat] = {}  # 全局数据（持久化，弱字分析用）
+        self._capacity = max(self.MIN_CACHE_CAPACITY, cache_capacity)
+        # 全局数据（持久化，弱字分析用）：列式存储，驻留字符按最近使用排序
+        self._table = CharStatTable()
         self._dirty: set[str] = set()  # 全局脏标记
+        self._pending_writes: dict[str, int] = {}  # 已提交后台写入、尚未落盘
+        self._lock = threading.Lock()  # 预取/落盘回调在工作线程修改缓存
         self._session_cache: dict[str, CharStat] = {}  # 会话数据（慢字统计用）
         self._session_dirty: set[str] = set()
+        self._hits = 0
+        self._cold_misses = 0
+        self._evictions = 0
         self._repo.init_db()
 
     def accumulate(self, char: str, keystroke_ms: float, is_error: bool) -> None:
         # 全局缓存（持久化，弱字分析）
-        if char not in self._cache:
-            existing = self._repo.get(char)
-            self._cache[char] = existing if existing else CharStat(char)
-        self._cache[char].accumulate(keystroke_ms, is_error)
-        self._dirty.add(char)
+        # 先标脏再累积：脏条目不会被工作线程的落盘回调淘汰
+        with self._lock:
+            slot = self._table.slot_of(char)
+            if slot is not None:
+                self._hits += 1
+                self._table.touch(char)
+                self._dirty.add(char)
+        if slot is None:
+            # 冷未命中：预取未覆盖到的字符，只能在 UI 线程同步读库
+            loaded = self._repo.get(char) or CharStat(char)
+            with self._lock:
+                self._cold_misses += 1
+                slot = self._put_locked(loaded)
+                self._dirty.add(char)
+                self._evict_locked()
+        self._table.accumulate(slot, keystroke_ms, is_error)
 
         # 会话缓存（慢字统计，从零开始）
         if char not in self._session_cache:
@@ -78,38 +110,138 @@ class CharStatsService:
         session_stat.accumulate(keystroke_ms, is_error)
         self._session_dirty.add(char)
         log_debug(
-            f"[CharStatsService] accumulate: char='{char}' "
-            f"input_ms={keystroke_ms:.0f} session_count={old_count} session_avg={old_avg:.0f}ms "
-            f"→ session_count={session_stat.char_count} session_avg={session_stat.avg_ms:.0f}ms"
+            "[CharStatsService] accumulate: char='%s' "
+            "input_ms=%.0f session_count=%d session_avg=%.0fms "
+            "→ session_count=%d session_avg=%.0fms",
+            char,
+            keystroke_ms,
+            old_count,
+            old_avg,
+            session_stat.char_count,
+            session_stat.avg_ms,
         )
 
     def warm_chars(self, chars: list[str]) -> None:
         if not chars:
             return
-        existing = self._repo.get_batch(chars)
-        for stat in existing:
-            self._cache[stat.char] = stat
-        for char in chars:
-            if char not in self._cache:
-                self._cache[char] = CharStat(char)
+        self._install(chars)
+
+    def prefetch(self, text: str) -> None:
+        """载文时预取文本内全部不同字符的统计（有执行器时在工作线程批量读库）。"""
+        with self._lock:
+            missing = [c for c in set(text) if c not in self._table]
+        if not missing:
+            return
+        if self._async_executor:
+            self._async_executor.submit(lambda: self._install(missing))
+        else:
+            self._install(missing)
+
+    def _install(self, chars: list[str]) -> None:
+        """一次 get_batch 读入并装入缓存；库中没有的字符装入空统计。
+
+        只填补缺失项（setdefault），不会覆盖 UI 线程在预取期间已累积的数据。
+        """
+        existing = {stat.char: stat for stat in self._repo.get_batch(chars)}
+        with self._lock:
+            for char in chars:
+                self._put_locked(existing.get(char) or CharStat(char))
+                self._table.touch(char)
+            # 刚装入的预取条目本轮不参与淘汰，否则缓存被待写条目占满时会被立即逐出
+            self._evict_locked(protect=set(chars))
+
+    def _put_locked(self, stat: CharStat) -> int:
+        """装入缓存（已驻留则保留现值），返回槽位（调用方持有 _lock）。"""
+        slot = self._table.slot_of(stat.char)
+        if slot is None:
+            slot = self._table.put(stat)
+        return slot
+
+    def _evict_locked(self, protect: set[str] | None = None) -> None:
+        """超出容量时从 LRU 端淘汰已落盘的条目（调用方持有 _lock）。"""
+        overflow = len(self._table) - self._capacity
+        if overflow <= 0:
+            return
+        victims: list[str] = []
+        for char in self._table:
+            if char in self._dirty or char in self._pending_writes:
+                continue
+            if protect and char in protect:
+                continue
+            victims.append(char)
+            if len(victims) >= overflow:
+                break
+        for char in victims:
+            self._table.remove(char)
+        self._evictions += len(victims)
+
+    def cache_stats(self) -> dict[str, int]:
+        """全局缓存计数：命中、冷未命中（打字期间同步读库）、淘汰与容量。"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "cold_misses": self._cold_misses,
+                "evictions": self._evictions,
+                "size": len(self._table),
+                "capacity": self._capacity,
+            }
 
     def flush(self) -> None:
-        if not self._dirty:
+        entries = self._take_dirty()
+        if not entries:
             return
-        entries = [self._cache[c] for c in self._dirty if c in self._cache]
-        self._repo.save_batch(entries)
-        self._dirty.clear()
+        self._write(entries)
 
     def flush_async(self) -> None:
-        if not self._dirty:
+        entries = self._take_dirty()
+        if not entries:
             return
-        entries = [self._cache[c] for c in self._dirty if c in self._cache]
-        self._dirty.clear()
 
         if self._async_executor:
-            self._async_executor.submit(lambda: self._repo.save_batch(entries))
+            self._async_executor.submit(lambda: self._write(entries))
         else:
+            self._write(entries)
+
+    def _take_dirty(self) -> list[CharStat]:
+        """物化脏条目快照并登记为待写入：落盘完成前它们仍不可被淘汰。
+
+        last_seen 在这里按批次统一盖戳（每次落盘一次，而非每次击键一次）。
+        """
+        with self._lock:
+            if not self._dirty:
+                return []
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            entries: list[CharStat] = []
+            for char in self._dirty:
+                slot = self._table.slot_of(char)
+                if slot is None:
+                    continue
+                self._table.last_seen[slot] = now
+                entries.append(self._table.materialize(slot))
+            for stat in entries:
+                self._pending_writes[stat.char] = (
+                    self._pending_writes.get(stat.char, 0) + 1
+                )
+            self._dirty.clear()
+        return entries
+
+    def _write(self, entries: list[CharStat]) -> None:
+        try:
             self._repo.save_batch(entries)
+        finally:
+            with self._lock:
+                for stat in entries:
+                    remaining = self._pending_writes.get(stat.char, 0) - 1
+                    if remaining > 0:
+                        self._pending_writes[stat.char] = remaining
+                    else:
+                        self._pending_writes.pop(stat.char, None)
+                self._evict_locked()
+
+    def close(self) -> None:
+        """同步落盘剩余脏数据并释放仓储连接（应用退出时调用）。"""
+        self.flush()
+        self._repo.close()
 
     def get_weakest_chars(
         self,
@@ -120,7 +252,11 @@ class CharStatsService:
         return self._repo.get_chars_by_sort(sort_mode, weights, n)
 
     def get_all(self) -> dict[str, CharStat]:
-        return dict(self._cache)
+        with self._lock:
+            return {
+                char: self._table.materialize(slot)
+                for char, slot in self._table.items()
+            }
 
     def get_slow_chars(
         self, threshold_ms: float = 500.0, limit: int = 10
@@ -177,8 +313,11 @@ class CharStatsService:
         phrase = phrase_positions or set()
 
         log_debug(
-            f"[CharStatsService] get_slow_entries: text='{text}' "
-            f"slow_positions={sorted(slow_positions)} phrase_positions={sorted(phrase)}"
+            "[CharStatsService] get_slow_entries: text='%s' "
+            "slow_positions=%s phrase_positions=%s",
+            text,
+            lazy(sorted, slow_positions),
+            lazy(sorted, phrase),
         )
 
         # 1. 提取 phrase_positions 中的连续区间（词组区间）
@@ -11,12 +11,13 @@
 - 信号发射（由 TypingAdapter 负责）
 """
 
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
 from time import time
 
 from ...models.entity.session_stat import SessionStat
-from ...utils.logger import log_debug
+from ...utils.logger import lazy, log_debug
 from .char_stats_service import CharStatsService
 
 # 标顶排除标点集——输入法使用标点符号把首选字顶上屏时，
@@ -29,6 +30,59 @@ EXCLUDE_PUNCTS: frozenset[str] = frozenset(
 )
 
 
+class ErrorFenwickTree:
+    """按位置记录错字标记的树状数组（Fenwick tree）。
+
+    每个位置一个 0/1 错字标记；单点改写与任意区间错字计数均为 O(log n)，
+    内存为两个按 total_chars 预分配的定长数组。删除/回改时只需改写受影响
+    位置的标记，其后位置的计数自然保持正确（不再依赖逐位置前缀和重写）。
+    """
+
+    __slots__ = ("_flags", "_size", "_tree")
+
+    def __init__(self, size: int = 0) -> None:
+        self._size = max(0, size)
+        self._flags = bytearray(self._size)
+        self._tree = array("l", bytes(array("l").itemsize * (self._size + 1)))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def is_error(self, pos: int) -> bool:
+        return 0 <= pos < self._size and self._flags[pos] == 1
+
+    def set(self, pos: int, is_error: bool) -> None:
+        """设置 pos 的错字标记（越界位置忽略）。"""
+        if not 0 <= pos < self._size:
+            return
+        value = 1 if is_error else 0
+        delta = value - self._flags[pos]
+        if delta == 0:
+            return
+        self._flags[pos] = value
+        i = pos + 1
+        tree = self._tree
+        while i <= self._size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, end: int) -> int:
+        """[0, end) 区间内的错字数。"""
+        i = min(max(end, 0), self._size)
+        total = 0
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def range_count(self, begin: int, end: int) -> int:
+        """[begin, end) 区间内的错字数。"""
+        if end <= begin:
+            return 0
+        return self.prefix(end) - self.prefix(begin)
+
+
 @dataclass
 class TypingState:
     """打字会话状态。"""
@@ -46,7 +100,7 @@ class TypingState:
     cursor_position: int = 0
     is_started: bool = False
     is_read_only: bool = False
-    wrong_char_prefix_sum: dict[int, int] = field(default_factory=dict)
+    wrong_chars: ErrorFenwickTree = field(default_factory=ErrorFenwickTree)
     last_commit_time_ms: float = 0.0
     plain_doc: str = ""
     text_id: int | None = None
@@ -54,7 +108,6 @@ class TypingState:
     peak_speed: float = 0.0
     peak_key_stroke: float = 0.0
     peak_code_length: float = float("inf")
-    char_commit_times: dict[int, float] = field(default_factory=dict)
     phrase_positions: set[int] = field(default_factory=set)
     last_punct_key_time_ms: float = 0.0
     last_punct_key_code: int = 0
@@ -192,7 +245,6 @@ class TypingService:
         self._state.score_data.peak_key_stroke = 0.0
         self._state.score_data.peak_code_length = 0.0
         self._state.last_commit_time_ms = 0.0
-        self._state.char_commit_times.clear()
         self._state.phrase_positions.clear()
         self._state.last_punct_key_time_ms = 0.0
         self._state.last_punct_key_code = 0
@@ -208,7 +260,7 @@ class TypingService:
         self._state.total_chars = total
         self._state.score_data.char_count = 0
         self._state.score_data.wrong_char_count = 0
-        self._state.wrong_char_prefix_sum = {}
+        self._state.wrong_chars = ErrorFenwickTree(total)
         self._state.peak_speed = 0.0
         self._state.peak_key_stroke = 0.0
         self._state.peak_code_length = float("inf")
@@ -300,20 +352,8 @@ class TypingService:
                 char = self._state.plain_doc[pos]
                 is_error = s[i] != char
                 char_updates.append((pos, char, is_error))
+                self._state.wrong_chars.set(pos, is_error)
 
-                # 更新 prefix_sum
-                pre_sum = (
-                    self._state.wrong_char_prefix_sum.get(pos - 1, 0) if pos > 0 else 0
-                )
-                self._state.wrong_char_prefix_sum[pos] = pre_sum + (
-                    1 if is_error else 0
-                )
-                self._state.score_data.wrong_char_count = (
-                    self._state.wrong_char_prefix_sum.get(pos, 0)
-                )
-
-                # 记录每个字符的提交时间（毫秒时间戳）
-                self._state.char_commit_times[pos] = now_ms
                 is_phrase = (
                     grow_length > 1
                     and pos >= self._state.score_data.char_count
@@ -323,11 +363,21 @@ class TypingService:
                 if is_phrase:
                     self._state.phrase_positions.add(pos)
                 log_debug(
-                    f"[TypingService] handle_committed_text: "
-                    f"s='{s}' grow_length={grow_length} begin_pos={begin_pos} "
-                    f"pos={pos} char='{char}' char_count_before={self._state.score_data.char_count} "
-                    f"elapsed_ms={elapsed_ms:.0f} per_char_ms={per_char_ms:.0f} "
-                    f"is_phrase={is_phrase} phrase_positions={sorted(self._state.phrase_positions)}"
+                    "[TypingService] handle_committed_text: "
+                    "s='%s' grow_length=%d begin_pos=%d "
+                    "pos=%d char='%s' char_count_before=%d "
+                    "elapsed_ms=%.0f per_char_ms=%.0f "
+                    "is_phrase=%s phrase_positions=%s",
+                    s,
+                    grow_length,
+                    begin_pos,
+                    pos,
+                    char,
+                    self._state.score_data.char_count,
+                    elapsed_ms,
+                    per_char_ms,
+                    is_phrase,
+                    lazy(sorted, self._state.phrase_positions),
                 )
                 # 累积字符统计
                 if self._char_stats_service:
@@ -335,6 +385,9 @@ class TypingService:
 
             self._state.last_commit_time_ms = now_ms
             self._state.score_data.char_count += grow_length
+            self._state.score_data.wrong_char_count = self._state.wrong_chars.prefix(
+                self._state.score_data.char_count
+            )
 
             # 检测标顶事件：复刻 TypeSunny 时序匹配逻辑
             # 标点键按下 → 记录时间；文本提交 → 匹配 20ms 窗口内的标点键事件
@@ -345,18 +398,14 @@ class TypingService:
                     self._state.score_data.biao_ding_count += 1
                     self._state.last_punct_key_time_ms = 0.0
 
-            # 检查是否完成
+            # 检查是否完成：如果最后一个字正确则完成，否则允许回改（Issue #2）
             if (
                 self._state.total_chars > 0
                 and self._state.score_data.char_count >= self._state.total_chars
                 and self._state.is_started
+                and not self._state.wrong_chars.is_error(self._state.total_chars - 1)
             ):
-                # 如果最后一个字正确则完成，否则允许回改（Issue #2）
-                last_pos = self._state.total_chars - 1
-                prev_wrong = self._state.wrong_char_prefix_sum.get(last_pos - 1, 0)
-                last_wrong = self._state.wrong_char_prefix_sum.get(last_pos, prev_wrong)
-                if last_wrong == prev_wrong:
-                    is_completed = True
+                is_completed = True
         else:
             # 删除字符 / 纯替换
             for i in range(len(s)):
@@ -365,19 +414,7 @@ class TypingService:
                 char = self._state.plain_doc[begin_pos + i]
                 is_error = s[i] != char
                 char_updates.append((begin_pos + i, char, is_error))
-
-                # 更新 prefix_sum
-                pre_sum = (
-                    self._state.wrong_char_prefix_sum.get(begin_pos + i - 1, 0)
-                    if begin_pos + i > 0
-                    else 0
-                )
-                self._state.wrong_char_prefix_sum[begin_pos + i] = pre_sum + (
-                    1 if is_error else 0
-                )
-                self._state.score_data.wrong_char_count = (
-                    self._state.wrong_char_prefix_sum.get(begin_pos + i, 0)
-                )
+                self._state.wrong_chars.set(begin_pos + i, is_error)
 
             # 删除时清除被删除位置
             if grow_length < 0:
@@ -385,14 +422,23 @@ class TypingService:
                 for i in range(char_count + grow_length, char_count):
                     char_updates.append((i, "", False))
                     self._state.phrase_positions.discard(i)
+                    self._state.wrong_chars.set(i, False)
                 self._state.last_commit_time_ms = now_ms
 
             self._state.score_data.char_count += grow_length
+            self._state.score_data.wrong_char_count = self._state.wrong_chars.prefix(
+                self._state.score_data.char_count
+            )
             # NOTE: grow_length=0（纯替换）时不更新 last_commit_time_ms，
             # 避免输入法 preedit 变化等无意义事件重置时间基准
 
         return char_updates, is_completed
 
+    def prefetch_char_stats(self) -> None:
+        """预取当前文本涉及字符的统计，避免打字时逐字同步读库。"""
+        if self._char_stats_service:
+            self._char_stats_service.prefetch(self._state.plain_doc)
+
     def flush_char_stats(self) -> None:
         """刷新字符统计。"""
         if self._char_stats_service:
@@ -405,9 +451,9 @@ class TypingService:
         """
         if self._char_stats_service:
             log_debug(
-                f"[TypingService] capture_slow_chars: "
-                f"plain_doc='{self._state.plain_doc}' "
-                f"phrase_positions={sorted(self._state.phrase_positions)}"
+                "[TypingService] capture_slow_chars: plain_doc='%s' phrase_positions=%s",
+                self._state.plain_doc,
+                lazy(sorted, self._state.phrase_positions),
             )
             self._state.score_data.slow_chars = (
                 self._char_stats_service.get_slow_entries(
@@ -468,8 +514,10 @@ class TypingService:
         total_input = self._state.score_data.char_count
 
         log_debug(
-            f"[TypingService] _compute_word_typing_rate: "
-            f"total_input={total_input} phrase_positions={sorted(phrase)}"
+            "[TypingService] _compute_word_typing_rate: "
+            "total_input=%d phrase_positions=%s",
+            total_input,
+            lazy(sorted, phrase),
         )
 
         if total_input <= 0 or not phrase:
@@ -0,0 +1,171 @@
+"""内容寻址的压缩 blob 层（OTT 缓存正文共享存储）。
+
+缓存正文按 sha256(原始字节) 命名、zlib 压缩后落在 ``root/ab/<digest>.z``：
+同一内容无论来自哪个 authority / 镜像 / 缓存键都只存一份，重复写入只刷新
+mtime、不再落盘。mtime 即最近访问时间，总大小超过上限时按 mtime 从旧到新
+淘汰（LRU），回落到上限的 90%。被淘汰 blob 的引用方读到 None，按缓存未命中
+重新拉取即可，因此 GC 无需追踪引用。
+
+zstd 不在标准库（3.14 前），压缩选用 zlib：正文多为中文文本/JSON，
+压缩比与速度都足够，且无需新增依赖。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from ..config.runtime_config import DEFAULT_BLOB_CACHE_MAX_BYTES
+from ..utils.logger import log_warning
+
+DEFAULT_MAX_BYTES = DEFAULT_BLOB_CACHE_MAX_BYTES
+# GC 回落水位：淘汰到上限的该比例，避免每次写入都触发一轮扫描
+_GC_LOW_WATERMARK = 0.9
+# 读命中时 mtime 早于该秒数才刷新，避免热点 blob 每次读都多一次 utime
+_TOUCH_INTERVAL_S = 60.0
+_SUFFIX = ".z"
+
+
+class ContentBlobStore:
+    """sha256 寻址 + zlib 压缩的 blob 存储，带按总大小限额的 LRU 回收。
+
+    线程安全：写入走临时文件 + os.replace 原子落盘；总大小计数与 GC 由
+    锁保护。多个 OttCachedFetcher（不同 authority）共享同一实例。
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compress_level: int = 6,
+    ) -> None:
+        self._root = root
+        self._max_bytes = max(0, max_bytes)
+        self._level = compress_level
+        self._lock = threading.Lock()
+        # 首次写入时扫描目录得到；None = 尚未统计
+        self._total_bytes: int | None = None
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def path_for(self, digest: str) -> Path:
+        return self._root / digest[:2] / f"{digest}{_SUFFIX}"
+
+    def put(self, data: bytes) -> str | None:
+        """存入一段内容，返回其 digest；落盘失败返回 None。"""
+        digest = self.digest(data)
+        path = self.path_for(digest)
+        if path.exists():
+            # 去重命中：只刷新 LRU 时间戳
+            self._touch(path)
+            return digest
+        compressed = zlib.compress(data, self._level)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wb") as f:
+                f.write(compressed)
+            with self._lock:
+                # 并发写入同一新内容时只有首个落盘者计入总大小
+                created = not path.exists()
+                if created:
+                    tmp_path.replace(path)
+                else:
+                    tmp_path.unlink()
+                if self._total_bytes is None:
+                    self._total_bytes = self._scan_total()
+                elif created:
+                    self._total_bytes += len(compressed)
+                over_budget = self._max_bytes and self._total_bytes > self._max_bytes
+        except OSError as e:
+            log_warning(f"[ContentBlobStore] 写入失败: {digest[:12]} — {e}")
+            tmp_path.unlink(missing_ok=True)
+            return None
+        if over_budget:
+            self.gc()
+        return digest
+
+    def get(self, digest: str) -> bytes | None:
+        """读出内容；不存在（已被 GC）或损坏返回 None，损坏的 blob 顺手删除。"""
+        path = self.path_for(digest)
+        try:
+            with path.open("rb") as f:
+                compressed = f.read()
+            data = zlib.decompress(compressed)
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error) as e:
+            log_warning(f"[ContentBlobStore] blob 损坏，已丢弃: {digest[:12]} — {e}")
+            path.unlink(missing_ok=True)
+            return None
+        self._touch(path)
+        return data
+
+    def gc(self) -> int:
+        """按 mtime 从旧到新淘汰，直到总大小不超过上限的 90%。返回释放字节数。"""
+        if not self._max_bytes:
+            return 0
+        with self._lock:
+            blobs = self._scan()
+            total = sum(size for _, size, _ in blobs)
+            target = int(self._max_bytes * _GC_LOW_WATERMARK)
+            freed = 0
+            if total > self._max_bytes:
+                for path, size, _ in sorted(blobs, key=lambda b: b[2]):
+                    if total - freed <= target:
+                        break
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+                    except OSError:
+                        continue
+                    freed += size
+            self._total_bytes = total - freed
+        return freed
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total()
+            return self._total_bytes
+
+    def _touch(self, path: Path) -> None:
+        try:
+            now = time.time()
+            if now - path.stat().st_mtime > _TOUCH_INTERVAL_S:
+                os.utime(path, (now, now))
+        except OSError:
+            pass
+
+    def _scan(self) -> list[tuple[Path, int, float]]:
+        blobs: list[tuple[Path, int, float]] = []
+        try:
+            shards = list(os.scandir(self._root))
+        except OSError:
+            return blobs
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            try:
+                entries = list(os.scandir(shard.path))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                blobs.append((Path(entry.path), stat.st_size, stat.st_mtime))
+        return blobs
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._scan())
@@ -4,6 +4,9 @@
 - 列表展示的物化内容落盘，选中载入直接从快照取（不重新执行规则/脚本）
 - 保留最近 N 条（prune），旧快照可回看/可继续打
 - on_demand 快照虽立即过期，但不入自动调度（防无限刷新循环）
+
+应用装配使用 SqliteEntrySnapshotStore（单文件索引库，接口相同）；本文件版
+布局保留作为其旧数据迁移来源。
 """
 
 from __future__ import annotations
@@ -1,28 +1,101 @@
 import hashlib
+import io
 import json
+import os
 import re
 import codecs
+import threading
+import time
+from fnmatch import fnmatch
+from array import array
+from bisect import bisect_right
 from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from ..config.app_paths import user_indexes_dir
 from ..models.dto.local_article import LocalArticleCatalogItem
 from ..ports.local_article_repository import LocalArticleRepository
+from .file_segment_provider import build_char_index
+
+# 扫描块大小：每读完一块记录一个精确的 字符→字节 索引点
+_SCAN_CHUNK_BYTES = 64 * 1024
+# 依次尝试的编码：UTF-8 严格解码失败即回退 GB18030
+_CANDIDATE_ENCODINGS = ("utf-8", "gb18030")
+# 目录 mtime 距扫描时刻不足该秒数视为不可信（同一时间粒度内可能还有改动），
+# 下次刷新仍重扫该目录（同 git 的 racy timestamp 处理）
+_RACY_MTIME_S = 2.0
+# 未知 id 触发全量重扫（兜底目录 mtime 不可靠的文件系统）的最小间隔
+_FULL_RESCAN_INTERVAL_S = 30.0
+
+
+@dataclass(slots=True)
+class _ArticleMeta:
+    """单篇文章的元数据缓存，(size, mtime_ns) 任一变化即失效。
+
+    index_chars[i] 个字符（按文本模式的换行转换计数）之前恰好是
+    index_bytes[i] 个字节；只存在于内存，首次按片读取时补建。
+    """
+
+    size: int
+    mtime_ns: int
+    encoding: str
+    char_count: int
+    index_chars: array | None = None
+    index_bytes: array | None = None
+
+
+@dataclass(slots=True)
+class _DirEntry:
+    """id 索引中的一个目录：上次扫描时的 mtime 及其直接包含的文章与子目录。"""
+
+    mtime_ns: int | None
+    files: list[str]
+    subdirs: list[str]
 
 
 class FileLocalArticleRepository(LocalArticleRepository):
-    """基于文件目录的本地长文库仓储。"""
+    """基于文件目录的本地长文库仓储。
+
+    每篇文章的编码、总字数按 (size, mtime_ns) 缓存并持久化到 index_dir 下
+    按文库根目录命名的元数据文件（不写进文库目录，免得改动其 mtime），
+    文库列表无需每次重新解码全部文件；一次流式扫描同时完成编码判定、计数
+    和稀疏索引，按片读取从最近的索引点 seek，不再从文件头解码。
+
+    article_id → 相对路径 维护为内存索引：命中时只校验该文件仍在，
+    未命中或列表时按目录 mtime 增量刷新，只重扫有增删的目录；仍未命中
+    才全量重扫（限频），确认不存在的 id 记为未命中，直到有目录变化。
+    """
 
     PROGRESS_FILENAME = ".typetype_progress.json"
+    # 旧版写在文库根目录的元数据文件：首次载入时迁移到 index_dir 后删除
+    LEGACY_META_FILENAME = ".typetype_article_meta.json"
 
     def __init__(
         self,
         article_dir: str | Path,
         progress_filename: str = PROGRESS_FILENAME,
         bundled_source_dir: str | Path | None = None,
+        index_dir: str | Path | None = None,
     ) -> None:
         self._article_dir = Path(article_dir).expanduser().resolve()
         self._progress_file = self._article_dir / progress_filename
+        self._index_dir = Path(index_dir) if index_dir is not None else None
+        self._legacy_meta_file: Path | None = None
+        # 相对路径（posix）→ 元数据；None = 尚未从磁盘载入
+        self._meta_cache: dict[str, _ArticleMeta] | None = None
+        self._meta_lock = threading.RLock()
+        self._meta_dirty = False
+        # list_articles 所在线程整表扫描完再统一落盘（线程局部：不影响其他线程的查找）
+        self._meta_batch = threading.local()
+        # article_id → 相对路径（posix）；相对目录（根为 ""）→ 目录扫描记录
+        self._id_to_rel: dict[str, str] = {}
+        self._dirs: dict[str, _DirEntry] = {}
+        # 全量重扫后仍找不到的 id；任一目录重扫/移除时清空
+        self._missing_ids: set[str] = set()
+        self._last_full_rescan = float("-inf")
+        self._index_lock = threading.RLock()
         self._bundled_names: set[str] = set()
         if bundled_source_dir is not None:
             src = Path(bundled_source_dir)
@@ -31,11 +104,22 @@ class FileLocalArticleRepository(LocalArticleRepository):
 
     def list_articles(self) -> list[LocalArticleCatalogItem]:
         articles: list[LocalArticleCatalogItem] = []
-        for path in self._article_paths():
-            try:
-                articles.append(self._build_catalog_item(path))
-            except (OSError, UnicodeDecodeError):
-                continue
+        paths = self._article_paths()
+        self._meta_batch.active = True
+        try:
+            for path in paths:
+                try:
+                    articles.append(self._build_catalog_item(path))
+                except (OSError, UnicodeDecodeError):
+                    continue
+        finally:
+            self._meta_batch.active = False
+        # 整个列表扫描完再统一落盘一次元数据
+        with self._meta_lock:
+            self._prune_meta(
+                {path.relative_to(self._article_dir).as_posix() for path in paths}
+            )
+            self._save_meta_cache()
         return articles
 
     def get_article(self, article_id: str) -> LocalArticleCatalogItem:
@@ -92,20 +176,84 @@ class FileLocalArticleRepository(LocalArticleRepository):
         return f"{slug}-{digest}"
 
     def _article_paths(self) -> list[Path]:
-        if not self._article_dir.exists():
-            return []
-        paths = [
-            path
-            for path in self._article_dir.rglob("*.txt")
-            if path.is_file() and not path.is_symlink()
-        ]
-        return sorted(
-            paths,
-            key=lambda path: (
-                len(path.relative_to(self._article_dir).parts),
-                path.relative_to(self._article_dir).as_posix(),
-            ),
-        )
+        with self._index_lock:
+            self._refresh_id_index()
+            rel_paths = list(self._id_to_rel.values())
+        rel_paths.sort(key=lambda rel: (rel.count("/") + 1, rel))
+        return [self._article_dir / rel for rel in rel_paths]
+
+    def _refresh_id_index(self, full: bool = False) -> None:
+        """按目录 mtime 增量刷新 id 索引：stat 每个已知目录，只重扫有变化的。
+
+        目录的 mtime 只随其直接条目的增删改名变化，因此 O(目录数) 次 stat
+        即可发现全部变化；full=True 时丢弃记录的 mtime 强制全部重扫。
+        与 rglob("*.txt") 一致：不跟随目录符号链接，跳过文件符号链接。
+        """
+        if full:
+            for entry in self._dirs.values():
+                entry.mtime_ns = None
+        if not self._article_dir.is_dir():
+            self._dirs.clear()
+            self._id_to_rel.clear()
+            return
+        self._dirs.setdefault("", _DirEntry(None, [], []))
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            entry = self._dirs.get(rel_dir)
+            if entry is None:
+                continue
+            try:
+                mtime_ns = os.stat(self._article_dir / rel_dir).st_mtime_ns
+            except OSError:
+                self._drop_dir(rel_dir)
+                continue
+            if entry.mtime_ns is None or entry.mtime_ns != mtime_ns:
+                self._rescan_dir(rel_dir, entry, mtime_ns)
+            pending.extend(entry.subdirs)
+
+    def _rescan_dir(self, rel_dir: str, entry: _DirEntry, mtime_ns: int) -> None:
+        files: list[str] = []
+        subdirs: list[str] = []
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        try:
+            with os.scandir(self._article_dir / rel_dir) as it:
+                for item in it:
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            subdirs.append(prefix + item.name)
+                        elif fnmatch(item.name, "*.txt") and item.is_file(
+                            follow_symlinks=False
+                        ):
+                            files.append(prefix + item.name)
+                    except OSError:
+                        continue
+        except OSError:
+            self._drop_dir(rel_dir)
+            return
+        self._missing_ids.clear()
+        for rel in set(entry.files).difference(files):
+            self._id_to_rel.pop(self.make_article_id(rel), None)
+        for rel in set(files).difference(entry.files):
+            self._id_to_rel[self.make_article_id(rel)] = rel
+        for rel in set(entry.subdirs).difference(subdirs):
+            self._drop_dir(rel)
+        for rel in subdirs:
+            self._dirs.setdefault(rel, _DirEntry(None, [], []))
+        entry.files = files
+        entry.subdirs = subdirs
+        racy = time.time_ns() - mtime_ns < _RACY_MTIME_S * 1e9
+        entry.mtime_ns = None if racy else mtime_ns
+
+    def _drop_dir(self, rel_dir: str) -> None:
+        entry = self._dirs.pop(rel_dir, None)
+        if entry is None:
+            return
+        self._missing_ids.clear()
+        for rel in entry.files:
+            self._id_to_rel.pop(self.make_article_id(rel), None)
+        for rel in entry.subdirs:
+            self._drop_dir(rel)
 
     def _build_catalog_item(self, path: Path) -> LocalArticleCatalogItem:
         stat = path.stat()
@@ -119,9 +267,33 @@ class FileLocalArticleRepository(LocalArticleRepository):
         )
 
     def _path_for_article_id(self, article_id: str) -> Path | None:
-        for path in self._article_paths():
-            if self.make_article_id(path.relative_to(self._article_dir)) == article_id:
-                return path
+        """O(1) 查找：命中且文件仍在直接返回；否则先增量刷新，仍未找到再全量重扫。
+
+        全量重扫至多每 _FULL_RESCAN_INTERVAL_S 秒一次；重扫后仍找不到的 id
+        记入未命中缓存，目录无变化时之后的查找只做增量刷新（O(目录数) 次 stat）。
+        """
+        with self._index_lock:
+            path = self._indexed_path(article_id)
+            if path is None:
+                self._refresh_id_index()
+                path = self._indexed_path(article_id)
+            if path is None and article_id not in self._missing_ids:
+                now = time.monotonic()
+                if now - self._last_full_rescan >= _FULL_RESCAN_INTERVAL_S:
+                    self._last_full_rescan = now
+                    self._refresh_id_index(full=True)
+                    path = self._indexed_path(article_id)
+                    if path is None:
+                        self._missing_ids.add(article_id)
+        return path
+
+    def _indexed_path(self, article_id: str) -> Path | None:
+        rel = self._id_to_rel.get(article_id)
+        if rel is None:
+            return None
+        path = self._article_dir / rel
+        if path.is_file() and not path.is_symlink():
+            return path
         return None
 
     def resolve_article_path(self, article_id: str) -> str | None:
@@ -131,47 +303,165 @@ class FileLocalArticleRepository(LocalArticleRepository):
         return str(path.resolve())
 
     def _read_article(self, path: Path) -> str:
-        return "".join(self._iter_decoded_chunks(path))
+        encoding = self._article_meta(path).encoding
+        return "".join(self._iter_text_file(path, encoding))
 
     def _count_article_chars(self, path: Path) -> int:
-        return sum(len(chunk) for chunk in self._iter_decoded_chunks(path))
+        return self._article_meta(path).char_count
 
     def _read_article_segment(self, path: Path, start: int, length: int) -> str:
-        remaining_skip = start
-        remaining_take = length
-        parts: list[str] = []
-        for chunk in self._iter_decoded_chunks(path):
-            if remaining_skip >= len(chunk):
-                remaining_skip -= len(chunk)
+        """通过稀疏索引读取字符范围：一次 seek + 一次有界读取。"""
+        meta = self._article_meta(path, with_index=True)
+        chars = meta.index_chars
+        offsets = meta.index_bytes
+        if start >= meta.char_count:
+            return ""
+        lo = bisect_right(chars, start) - 1
+        hi = min(bisect_right(chars, start + length - 1), len(chars) - 1)
+        with path.open("rb") as f:
+            f.seek(offsets[lo])
+            raw = f.read(offsets[hi] - offsets[lo])
+        text = self._newline_decoder(meta.encoding).decode(raw, final=True)
+        skip = start - chars[lo]
+        return text[skip : skip + length]
+
+    @staticmethod
+    def _newline_decoder(encoding: str) -> io.IncrementalNewlineDecoder:
+        """与文本模式 open() 一致的解码器：严格解码 + 通用换行转换。"""
+        return io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(encoding)(), translate=True
+        )
+
+    def _article_meta(self, path: Path, with_index: bool = False) -> _ArticleMeta:
+        """取文章元数据；缓存失效（或需要索引而尚未建立）时扫描一次文件。
+
+        解码扫描在锁外进行，锁只护住缓存的读取与发布：大文件不阻塞其他查找。
+        """
+        stat = path.stat()
+        key = path.relative_to(self._article_dir).as_posix()
+        with self._meta_lock:
+            cached = self._load_meta_cache().get(key)
+        if (
+            cached is not None
+            and cached.size == stat.st_size
+            and cached.mtime_ns == stat.st_mtime_ns
+        ):
+            if not with_index or cached.index_chars is not None:
+                return cached
+            encodings: tuple[str, ...] = (cached.encoding,)
+        else:
+            encodings = _CANDIDATE_ENCODINGS
+        meta = self._scan_article(path, stat.st_size, stat.st_mtime_ns, encodings)
+        with self._meta_lock:
+            self._load_meta_cache()[key] = meta
+            self._meta_dirty = True
+            if not getattr(self._meta_batch, "active", False):
+                self._save_meta_cache()
+        return meta
+
+    def _scan_article(
+        self, path: Path, size: int, mtime_ns: int, encodings: tuple[str, ...]
+    ) -> _ArticleMeta:
+        """单次流式扫描：按候选编码依次严格解码，同时计数并记录索引点。
+
+        UTF-8 文件只读一遍；只有 UTF-8 解码失败才以 GB18030 重扫。
+        最后一个候选也失败时抛出 UnicodeDecodeError（与整篇读取一致）。
+        """
+        for encoding in encodings[:-1]:
+            try:
+                return self._index_article(path, size, mtime_ns, encoding)
+            except UnicodeDecodeError:
                 continue
-            if remaining_skip:
-                chunk = chunk[remaining_skip:]
-                remaining_skip = 0
-            if remaining_take <= 0:
-                break
-            parts.append(chunk[:remaining_take])
-            remaining_take -= len(parts[-1])
-            if remaining_take <= 0:
-                break
-        return "".join(parts)
-
-    def _iter_decoded_chunks(self, path: Path) -> Iterator[str]:
-        encoding = self._detect_encoding(path)
-        yield from self._iter_text_file(path, encoding)
-
-    def _detect_encoding(self, path: Path) -> str:
-        decoder = codecs.getincrementaldecoder("utf-8")()
+        return self._index_article(path, size, mtime_ns, encodings[-1])
+
+    def _index_article(
+        self, path: Path, size: int, mtime_ns: int, encoding: str
+    ) -> _ArticleMeta:
+        """按 encoding 严格解码整个文件，同时计数（文本模式换行）并建立稀疏索引。"""
+        count, chars, offsets = build_char_index(
+            path, self._newline_decoder(encoding), chunk_bytes=_SCAN_CHUNK_BYTES
+        )
+        return _ArticleMeta(size, mtime_ns, encoding, count, chars, offsets)
+
+    def _load_meta_cache(self) -> dict[str, _ArticleMeta]:
+        if self._meta_cache is not None:
+            return self._meta_cache
+        cache: dict[str, _ArticleMeta] = {}
+        legacy_file = self._article_dir / self.LEGACY_META_FILENAME
         try:
-            with path.open("rb") as f:
-                while True:
-                    chunk = f.read(64 * 1024)
-                    if not chunk:
-                        break
-                    decoder.decode(chunk)
-                decoder.decode(b"", final=True)
-        except UnicodeDecodeError:
-            return "gb18030"
-        return "utf-8"
+            data = json.loads(self._meta_path().read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            data = self._read_legacy_meta(legacy_file)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        if isinstance(data, dict):
+            for key, item in data.items():
+                try:
+                    cache[key] = _ArticleMeta(
+                        size=int(item["size"]),
+                        mtime_ns=int(item["mtime_ns"]),
+                        encoding=str(item["encoding"]),
+                        char_count=int(item["char_count"]),
+                    )
+                except (KeyError, TypeError, ValueError):
+                    continue
+        self._meta_cache = cache
+        return cache
+
+    def _read_legacy_meta(self, legacy_file: Path) -> Any:
+        try:
+            data = json.loads(legacy_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        # 迁移到 index_dir：下次落盘写入新位置后删除旧文件
+        self._legacy_meta_file = legacy_file
+        self._meta_dirty = True
+        return data
+
+    def _meta_path(self) -> Path:
+        """元数据文件按文库根目录的绝对路径命名（多个文库互不覆盖）。"""
+        index_dir = self._index_dir or user_indexes_dir()
+        digest = hashlib.sha256(str(self._article_dir).encode()).hexdigest()[:16]
+        return index_dir / f"{digest}.articles.json"
+
+    def _prune_meta(self, live_keys: set[str]) -> None:
+        cache = self._load_meta_cache()
+        for key in [key for key in cache if key not in live_keys]:
+            del cache[key]
+            self._meta_dirty = True
+
+    def _save_meta_cache(self) -> None:
+        if not self._meta_dirty or self._meta_cache is None:
+            return
+        data = {
+            key: {
+                "size": meta.size,
+                "mtime_ns": meta.mtime_ns,
+                "encoding": meta.encoding,
+                "char_count": meta.char_count,
+            }
+            for key, meta in sorted(self._meta_cache.items())
+        }
+        meta_path = self._meta_path()
+        tmp_path = meta_path.with_name(f"{meta_path.name}.tmp")
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(
+                json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+            tmp_path.replace(meta_path)
+        except OSError:
+            # 元数据只是加速缓存，写失败下次重新扫描即可
+            return
+        self._meta_dirty = False
+        if self._legacy_meta_file is not None:
+            try:
+                self._legacy_meta_file.unlink(missing_ok=True)
+            except OSError:
+                return
+            self._legacy_meta_file = None
 
     def _iter_text_file(self, path: Path, encoding: str) -> Iterator[str]:
         with path.open("r", encoding=encoding) as f:
@@ -1,40 +1,111 @@
 from __future__ import annotations
 
-import hashlib
-import json
 import codecs
+import hashlib
+import io
+import struct
+import sys
+from array import array
 from bisect import bisect_right
+from collections.abc import Sequence
 from pathlib import Path
 
 from charset_normalizer import from_path
 
 from ..config.app_paths import user_indexes_dir
 
-_INDEX_INTERVAL = 10_000  # 每 10000 个字符记录一个索引点
+# 扫描块大小：每读完一块记录一个精确索引点，随机读取最多多读约一块
+_CHUNK_BYTES = 8 * 1024
+# gather 读取的分步解码粒度：块内只解码到最后一个所需字符为止
+_GATHER_DECODE_STEP = 8 * 1024
+
+# 索引文件：头部 + 编码名 + 字符偏移数组 + 字节偏移数组（小端 int64）
+_INDEX_MAGIC = b"TTSX"
+# v3：UTF-8 BOM 不再计入字符（v2 的 BOM 文件索引整体偏一位）
+_INDEX_VERSION = 3
+# magic, version, size, mtime_ns, total_chars, point_count, encoding_len
+_INDEX_HEADER = struct.Struct("<4sHqqqqH")
+
+# 无端序后缀的 UTF-16/32 依赖文件头 BOM 判定端序，从文件中部解码时必须显式指定
+_BOM_ENCODINGS: tuple[tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+
+def build_char_index(
+    path: Path,
+    decoder: codecs.IncrementalDecoder | io.IncrementalNewlineDecoder,
+    start_byte: int = 0,
+    chunk_bytes: int = _CHUNK_BYTES,
+) -> tuple[int, array, array]:
+    """单次流式扫描：返回 (总字符数, 索引字符数组, 索引字节数组)。
+
+    chars[i] 个字符之前恰好是 offsets[i] 个字节，从任一索引点起用同样的
+    解码器即可正确解码。增量解码器在块尾可能缓存半个多字节字符，getstate()
+    给出缓存字节数，因此块边界处 “已解码字符数 ↔ 文件位置 - 缓存字节数”
+    是精确对应的；除缓存字节外还带状态的边界（如换行解码器缓存着可能与
+    下一块开头 \n 合并的 \r）不记索引点。
+
+    计数口径由 decoder 决定：errors="replace" 容忍坏字节，严格解码遇坏字节
+    抛 UnicodeDecodeError；包一层 io.IncrementalNewlineDecoder 即按文本模式
+    的换行转换计数。start_byte 跳过 BOM 等文件头。
+    """
+    chars = array("q", [0])
+    offsets = array("q", [start_byte])
+    count = 0
+    with path.open("rb") as f:
+        f.seek(start_byte)
+        while True:
+            raw = f.read(chunk_bytes)
+            if not raw:
+                break
+            count += len(decoder.decode(raw))
+            pending, flag = decoder.getstate()
+            if not flag:
+                chars.append(count)
+                offsets.append(f.tell() - len(pending))
+        count += len(decoder.decode(b"", final=True))
+        if chars[-1] != count:
+            # 文件尾残缺字节（被替换为 U+FFFD）或待定 \r：补一个落在文件末尾的终点
+            chars.append(count)
+            offsets.append(f.tell())
+    return count, chars, offsets
 
 
 class FileSegmentProvider:
     """基于磁盘文件的文本段提供者。
 
     小文件（< small_file_threshold）：首次访问时全量读入内存，后续等同于字符串切片。
-    大文件（>= small_file_threshold）：构建稀疏字符索引，按需读取字符窗口。
+    大文件（>= small_file_threshold）：一次流式扫描建立精确的 字符→字节 稀疏索引，
+    按需 seek 到索引点读取一段有界字节窗口。索引以二进制文件缓存在 index_dir，
+    打开时自动加载，文件大小或 mtime 变化即失效重建。
     """
 
-    def __init__(self, path: str | Path, small_file_threshold: int = 100_000) -> None:
+    def __init__(
+        self,
+        path: str | Path,
+        small_file_threshold: int = 100_000,
+        index_dir: str | Path | None = None,
+    ) -> None:
         # NOTE: small_file_threshold 的默认值由 RuntimeConfig.text_session.small_file_threshold
         # 覆盖，text_adapter.startFileTextSession 显式传入。此处默认值仅作 fallback。
         self._path = Path(path)
         self._small_file_threshold = small_file_threshold
+        self._index_dir = Path(index_dir) if index_dir is not None else None
         self._encoding: str | None = None
         self._total_chars: int | None = None
         # 小文件：全量加载后的字符串
         self._text: str | None = None
-        # 大文件：稀疏索引 [(char_offset, byte_offset), ...]
-        self._index: list[tuple[int, int]] = []
+        # 大文件：稀疏索引，_index_chars[i] 个字符之前恰好是 _index_bytes[i] 个字节
+        self._index_chars = array("q")
+        self._index_bytes = array("q")
 
     def get_total_chars(self) -> int:
-        if self._total_chars is None:
-            self._total_chars = self._count_chars()
+        if self._total_chars is None and not self.load_index_cache():
+            self._build_index()
         return self._total_chars
 
     def get_segment(self, start: int, length: int) -> str:
@@ -47,15 +118,24 @@ class FileSegmentProvider:
             return self._text[start : start + length]
         return self._read_segment_from_file(start, length)
 
+    def get_chars(self, indices: Sequence[int]) -> str:
+        if not indices:
+            return ""
+        self._ensure_loaded()
+        if self._text is not None:
+            text = self._text
+            size = len(text)
+            return "".join(text[i] for i in indices if 0 <= i < size)
+        return self._gather_from_file(indices)
+
     def _ensure_loaded(self) -> None:
-        if self._text is not None or self._index:
+        if self._text is not None or self._index_chars:
             return
-        self._detect_encoding()
         total = self.get_total_chars()
         if total < self._small_file_threshold:
-            self._text = self._read_all()
-        else:
-            self._build_index()
+            self._text = self._read_all(self._index_bytes[0])
+            self._index_chars = array("q")
+            self._index_bytes = array("q")
 
     def _detect_encoding(self) -> str:
         if self._encoding is not None:
@@ -64,125 +144,200 @@ class FileSegmentProvider:
         self._encoding = result.encoding if result else "utf-8"
         return self._encoding
 
-    def _count_chars(self) -> int:
-        encoding = self._detect_encoding()
-        total = 0
-        with self._path.open("r", encoding=encoding) as f:
-            while True:
-                chunk = f.read(64 * 1024)
-                if not chunk:
-                    break
-                total += len(chunk)
-        return total
-
-    def _read_all(self) -> str:
-        encoding = self._detect_encoding()
-        return self._path.read_text(encoding=encoding)
+    def _read_all(self, start_byte: int) -> str:
+        with self._path.open("rb") as f:
+            f.seek(start_byte)
+            raw = f.read()
+        return raw.decode(self._detect_encoding(), errors="replace")
 
     def _build_index(self) -> None:
-        """扫描全文件，建立稀疏字符索引。"""
+        """单次流式扫描：统计总字符数，并在每个读块边界记录精确索引点。"""
+        encoding, start_byte = self._seekable_encoding()
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        char_count, chars, offsets = build_char_index(self._path, decoder, start_byte)
+        self._index_chars = chars
+        self._index_bytes = offsets
+        self._total_chars = char_count
+        if char_count >= self._small_file_threshold:
+            self.save_index_cache()
+
+    def _seekable_encoding(self) -> tuple[str, int]:
+        """返回可从任意索引点起解码的编码名，以及正文起始字节（跳过 BOM）。"""
         encoding = self._detect_encoding()
-        self._index = [(0, 0)]
-        char_count = 0
+        name = codecs.lookup(encoding).name
+        if name not in {"utf-8", "utf-8-sig", "utf-16", "utf-32"}:
+            return encoding, 0
         with self._path.open("rb") as f:
-            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
-            while True:
-                raw = f.read(64 * 1024)
-                if not raw:
-                    break
-                text = decoder.decode(raw)
-                new_char_count = char_count + len(text)
-                # 检查是否跨越了索引间隔边界
-                prev_interval = char_count // _INDEX_INTERVAL
-                new_interval = new_char_count // _INDEX_INTERVAL
-                if new_interval > prev_interval:
-                    byte_pos = f.tell() - len(raw)
-                    # 为每个跨越的间隔记录索引
-                    for i in range(prev_interval + 1, new_interval + 1):
-                        # 估算该间隔对应的 byte offset
-                        chars_at_interval = i * _INDEX_INTERVAL
-                        ratio = (chars_at_interval - char_count) / max(1, len(text))
-                        estimated_byte = byte_pos + int(ratio * len(raw))
-                        self._index.append((chars_at_interval, estimated_byte))
-                char_count = new_char_count
-            decoder.decode(b"", final=True)
+            head = f.read(4)
+        if name in {"utf-8", "utf-8-sig"}:
+            # charset_normalizer 对带 BOM 的 UTF-8 文件也报 utf_8：直接看文件头
+            self._encoding = "utf-8"
+            bom_len = len(codecs.BOM_UTF8) if head.startswith(codecs.BOM_UTF8) else 0
+            return "utf-8", bom_len
+        for bom, explicit in _BOM_ENCODINGS:
+            if head.startswith(bom) and explicit.startswith(name):
+                self._encoding = explicit
+                return explicit, len(bom)
+        explicit = f"{name}-{'le' if sys.byteorder == 'little' else 'be'}"
+        self._encoding = explicit
+        return explicit, 0
 
     def _read_segment_from_file(self, start: int, length: int) -> str:
-        """通过稀疏索引从文件中读取指定字符范围。"""
-        if not self._index:
+        """通过稀疏索引读取指定字符范围：一次 seek + 一次有界读取。"""
+        if not self._index_chars:
+            return ""
+        chars = self._index_chars
+        offsets = self._index_bytes
+        end = start + length
+        lo = bisect_right(chars, start) - 1
+        hi = bisect_right(chars, end - 1)
+        if hi >= len(chars):
+            hi = len(chars) - 1
+        if lo < 0 or chars[lo] >= self._total_chars:
             return ""
 
-        # 二分查找最近的索引点
-        idx = bisect_right(self._index, (start,)) - 1
-        if idx < 0:
-            idx = 0
-        char_offset, byte_offset = self._index[idx]
-
-        encoding = self._detect_encoding()
-        remaining_skip = start - char_offset
-        remaining_take = length
-        parts: list[str] = []
+        with self._path.open("rb") as f:
+            f.seek(offsets[lo])
+            raw = f.read(offsets[hi] - offsets[lo])
+        decoder = codecs.getincrementaldecoder(self._encoding)(errors="replace")
+        text = decoder.decode(raw, final=True)
+        skip = start - chars[lo]
+        return text[skip : skip + length]
 
+    def _gather_from_file(self, indices: Sequence[int]) -> str:
+        """批量随机读取：下标排序去重后按索引块分组，相邻块合并为一次读取，
+        全程复用一个文件句柄；每块从自身索引点起解码，到块内最后一个所需
+        字符即止（合并只省系统调用，不让中间块被整块解码）。"""
+        if not self._index_chars:
+            return ""
+        chars = self._index_chars
+        offsets = self._index_bytes
+        total = self._total_chars
+        wanted = sorted({i for i in indices if 0 <= i < total})
+        # (索引点, 该块在 wanted 中的起止位置)
+        groups: list[list[int]] = []
+        for k, i in enumerate(wanted):
+            point = bisect_right(chars, i) - 1
+            if groups and groups[-1][0] == point:
+                groups[-1][2] = k + 1
+            else:
+                groups.append([point, k, k + 1])
+        found: dict[int, str] = {}
         with self._path.open("rb") as f:
-            f.seek(byte_offset)
-            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
-            while remaining_take > 0:
-                raw = f.read(64 * 1024)
-                if not raw:
-                    break
-                text = decoder.decode(raw)
-                if remaining_skip >= len(text):
-                    remaining_skip -= len(text)
-                    continue
-                if remaining_skip:
-                    text = text[remaining_skip:]
-                    remaining_skip = 0
-                parts.append(text[:remaining_take])
-                remaining_take -= len(parts[-1])
-            decoder.decode(b"", final=True)
+            g = 0
+            while g < len(groups):
+                run_end = g + 1
+                while (
+                    run_end < len(groups)
+                    and groups[run_end][0] == groups[run_end - 1][0] + 1
+                ):
+                    run_end += 1
+                first_point = groups[g][0]
+                last_point = min(groups[run_end - 1][0] + 1, len(chars) - 1)
+                f.seek(offsets[first_point])
+                raw = f.read(offsets[last_point] - offsets[first_point])
+                for point, lo, hi in groups[g:run_end]:
+                    block_start = offsets[point] - offsets[first_point]
+                    block_end = (
+                        offsets[min(point + 1, len(chars) - 1)] - offsets[first_point]
+                    )
+                    base = chars[point]
+                    text = self._decode_prefix(
+                        raw[block_start:block_end], wanted[hi - 1] - base + 1
+                    )
+                    for i in wanted[lo:hi]:
+                        if i - base < len(text):
+                            found[i] = text[i - base]
+                g = run_end
+        return "".join(found.get(i, "") for i in indices)
 
+    def _decode_prefix(self, raw: bytes, need: int) -> str:
+        """从索引点起分步解码 raw，得到至少 need 个字符（或全部）即停止。"""
+        decoder = codecs.getincrementaldecoder(self._encoding)(errors="replace")
+        parts: list[str] = []
+        decoded = 0
+        consumed = 0
+        while decoded < need and consumed < len(raw):
+            step = raw[consumed : consumed + _GATHER_DECODE_STEP]
+            consumed += len(step)
+            part = decoder.decode(step, final=consumed >= len(raw))
+            parts.append(part)
+            decoded += len(part)
         return "".join(parts)
 
     def _get_index_hash(self) -> str:
-        """生成索引文件名用的 hash。"""
-        stat = self._path.stat()
-        key = f"{self._path}:{stat.st_size}:{stat.st_mtime}"
-        return hashlib.sha256(key.encode()).hexdigest()[:16]
+        """生成索引文件名用的 hash（只取路径：文件变化后覆盖旧索引而不是堆积）。"""
+        return hashlib.sha256(str(self._path.resolve()).encode()).hexdigest()[:16]
 
     def _index_path(self) -> Path:
-        return user_indexes_dir() / f"{self._get_index_hash()}.json"
+        index_dir = self._index_dir or user_indexes_dir()
+        return index_dir / f"{self._get_index_hash()}.idx"
 
     def save_index_cache(self) -> None:
-        """将索引缓存写入磁盘。"""
-        if not self._index:
+        """将索引缓存写入磁盘（二进制）。"""
+        if not self._index_chars or self._encoding is None:
             return
+        stat = self._path.stat()
+        encoding = self._encoding.encode("ascii")
+        chars = array("q", self._index_chars)
+        offsets = array("q", self._index_bytes)
+        if sys.byteorder != "little":
+            chars.byteswap()
+            offsets.byteswap()
+        header = _INDEX_HEADER.pack(
+            _INDEX_MAGIC,
+            _INDEX_VERSION,
+            stat.st_size,
+            stat.st_mtime_ns,
+            self._total_chars or 0,
+            len(chars),
+            len(encoding),
+        )
         index_path = self._index_path()
-        index_path.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            "path": str(self._path),
-            "size": self._path.stat().st_size,
-            "mtime": self._path.stat().st_mtime,
-            "encoding": self._encoding,
-            "total_chars": self._total_chars,
-            "index": self._index,
-        }
-        tmp = index_path.with_suffix(".json.tmp")
-        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
-        tmp.replace(index_path)
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = index_path.with_suffix(".idx.tmp")
+            with tmp.open("wb") as f:
+                f.write(header)
+                f.write(encoding)
+                chars.tofile(f)
+                offsets.tofile(f)
+            tmp.replace(index_path)
+        except OSError:
+            # 索引只是加速缓存，写失败不影响本次读取
+            pass
 
     def load_index_cache(self) -> bool:
-        """尝试从磁盘加载索引缓存。返回是否成功。"""
-        index_path = self._index_path()
-        if not index_path.exists():
-            return False
+        """尝试从磁盘加载索引缓存（大小与 mtime 均一致才有效）。返回是否成功。"""
         try:
-            data = json.loads(index_path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            return False
-        stat = self._path.stat()
-        if data.get("size") != stat.st_size or data.get("mtime") != stat.st_mtime:
+            stat = self._path.stat()
+            with self._index_path().open("rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) != _INDEX_HEADER.size:
+                    return False
+                magic, version, size, mtime_ns, total, count, enc_len = (
+                    _INDEX_HEADER.unpack(header)
+                )
+                if (
+                    magic != _INDEX_MAGIC
+                    or version != _INDEX_VERSION
+                    or size != stat.st_size
+                    or mtime_ns != stat.st_mtime_ns
+                    or count <= 0
+                ):
+                    return False
+                encoding = f.read(enc_len).decode("ascii")
+                chars = array("q")
+                offsets = array("q")
+                chars.fromfile(f, count)
+                offsets.fromfile(f, count)
+        except (OSError, EOFError, UnicodeDecodeError, struct.error):
             return False
-        self._encoding = data.get("encoding", "utf-8")
-        self._total_chars = data.get("total_chars", 0)
-        self._index = [tuple(pair) for pair in data.get("index", [])]
+        if sys.byteorder != "little":
+            chars.byteswap()
+            offsets.byteswap()
+        self._encoding = encoding
+        self._total_chars = total
+        self._index_chars = chars
+        self._index_bytes = offsets
         return True
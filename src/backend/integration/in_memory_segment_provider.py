@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 
 class InMemorySegmentProvider:
     """基于内存字符串的文本段提供者。"""
@@ -12,5 +14,10 @@ class InMemorySegmentProvider:
             return ""
         return self._text[start : start + length]
 
+    def get_chars(self, indices: Sequence[int]) -> str:
+        text = self._text
+        size = len(text)
+        return "".join(text[i] for i in indices if 0 <= i < size)
+
     def get_total_chars(self) -> int:
         return len(self._text)
@@ -39,3 +39,6 @@ class NoopCharStatsRepository:
 
     def mark_synced(self, chars: list[str], synced_at: str) -> None:
         pass
+
+    def close(self) -> None:
+        pass
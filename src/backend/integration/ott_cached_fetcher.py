@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import json
+import os
 import threading
 import time
 from collections.abc import Callable
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import httpx
 
 from ..config.runtime_config import OttConfig
 from ..utils.logger import log_info, log_warning
+from .content_blob_store import ContentBlobStore
 from .ott_normalization import local_path_from_file_uri, redact_url, to_jsdelivr_url
 
 if TYPE_CHECKING:
@@ -18,7 +20,97 @@ if TYPE_CHECKING:
     from .smart_router import SmartRouteSelector
 
 
+# 引用文件中指向共享 blob 的键（OTT 协议字段不以 $ 开头，不会与正文冲突）
+_BLOB_REF_KEY = "$blob"
+
+
+class FetchResult(NamedTuple):
+    """一次 HTTP 拉取的结果：正文 + 服务端签发的校验器。
+
+    not_modified 为 True 时表示条件请求命中 304，body 为 None、缓存仍有效。
+    """
+
+    body: Any
+    url: str
+    etag: str = ""
+    last_modified: str = ""
+    not_modified: bool = False
+
+
+def _parse_json(response: httpx.Response) -> dict | None:
+    data = response.json()
+    return data if isinstance(data, dict) else None
+
+
+def _parse_text(response: httpx.Response) -> str:
+    return response.text
+
+
+def response_validators(response: httpx.Response) -> tuple[str, str]:
+    """取响应的 (ETag, Last-Modified)；缺失或非字符串记为空串。"""
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return "", ""
+    etag = headers.get("etag", "")
+    last_modified = headers.get("last-modified", "")
+    return (
+        etag if isinstance(etag, str) else "",
+        last_modified if isinstance(last_modified, str) else "",
+    )
+
+
+def conditional_headers(validators: dict[str, str] | None, url: str) -> dict[str, str]:
+    """由缓存的校验器构造条件请求头；校验器不是该地址签发的则不发。"""
+    if not validators or validators.get("url") != url:
+        return {}
+    headers: dict[str, str] = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def read_validators(path: Path) -> dict[str, str] | None:
+    """读校验器旁路文件（{cache_key}.meta.json）；不存在或损坏返回 None。"""
+    try:
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {key: str(data.get(key) or "") for key in ("url", "etag", "last_modified")}
+
+
+def write_validators(path: Path, url: str, etag: str, last_modified: str) -> None:
+    """原子写校验器旁路文件；两个校验器都为空时删除旧文件（防止过时的 304）。"""
+    try:
+        if not etag and not last_modified:
+            path.unlink(missing_ok=True)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {"url": url, "etag": etag, "last_modified": last_modified},
+                f,
+                ensure_ascii=False,
+            )
+        tmp_path.replace(path)
+    except OSError:
+        pass
+
+
 class OttCachedFetcher:
+    """OTT 数据面 HTTP 拉取 + 磁盘缓存（stale-while-revalidate）。
+
+    缓存文件 {cache_key}.json 只存正文（注入 blob_store 时只存指向共享
+    压缩 blob 的引用，正文跨 authority/镜像去重）；服务端签发的
+    ETag/Last-Modified 存在旁路文件 {cache_key}.meta.json。TTL 过期后的后台刷新以条件请求
+    发出，304 只刷新缓存文件 mtime（即新鲜度时间戳），不重下正文。
+    """
+
     def __init__(
         self,
         config: OttConfig,
@@ -26,6 +118,7 @@ class OttCachedFetcher:
         http_client: httpx.Client,
         async_executor: AsyncExecutor | None,
         router: "SmartRouteSelector | None" = None,
+        blob_store: ContentBlobStore | None = None,
     ) -> None:
         self._config = config
         self._cache_dir = cache_dir
@@ -33,6 +126,8 @@ class OttCachedFetcher:
         self._async_executor = async_executor
         # 智能路由：None = 保持固定 failover（原始 → jsDelivr），兼容旧调用
         self._router = router
+        # 正文共享存储：None = 正文内联写入 {cache_key}.json（兼容旧调用）
+        self._blob_store = blob_store
         self._refresh_locks: dict[str, threading.Lock] = {}
         self._refresh_locks_lock = threading.Lock()
 
@@ -45,24 +140,21 @@ class OttCachedFetcher:
         force: bool = False,
     ) -> dict | None:
         mirrors = [mirror_url] if mirror_url else None
-        if force:
-            # 手动刷新：绕过缓存读，直接拉取并写回（失败不读旧缓存）
-            data = self._fetch_json(url, max_bytes=max_bytes, mirrors=mirrors)
-            if data is not None:
-                self.write_cache(cache_key, data)
-            return data
-        cached = self.read_cache(cache_key)
-        if cached is not None:
-            if not self.is_cache_expired(cache_key):
+        if not force:
+            cached = self.read_cache(cache_key)
+            if cached is not None:
+                if not self.is_cache_expired(cache_key):
+                    return cached
+                self._maybe_refresh_json(cache_key, url, mirrors, max_bytes)
                 return cached
-            self._maybe_refresh_json(cache_key, url, mirrors, max_bytes)
-            return cached
-
-        data = self._fetch_json(url, max_bytes=max_bytes, mirrors=mirrors)
-        if data is not None:
-            self.write_cache(cache_key, data)
-            return data
-        return None
+        # 缓存未命中 / 手动刷新（绕过缓存读，失败不读旧缓存）：无条件拉取并写回
+        result = self._fetch(
+            url, max_bytes=max_bytes, mirrors=mirrors, parse=_parse_json
+        )
+        if result is None:
+            return None
+        self._store(cache_key, result)
+        return result.body
 
     def fetch_text_with_cache(
         self,
@@ -73,24 +165,21 @@ class OttCachedFetcher:
         force: bool = False,
     ) -> str | None:
         mirrors = [mirror_url] if mirror_url else None
-        if force:
-            # 手动刷新：绕过缓存读，直接拉取并写回（失败不读旧缓存）
-            content = self._fetch_text(url, max_bytes=max_bytes, mirrors=mirrors)
-            if content is not None:
-                self.write_cache(cache_key, {"content": content})
-            return content
-        cached = self.read_cache(cache_key)
-        if cached is not None and isinstance(cached.get("content"), str):
-            if not self.is_cache_expired(cache_key):
+        if not force:
+            cached = self.read_cache(cache_key)
+            if cached is not None and isinstance(cached.get("content"), str):
+                if not self.is_cache_expired(cache_key):
+                    return str(cached["content"])
+                self._maybe_refresh_text(cache_key, url, mirrors, max_bytes)
                 return str(cached["content"])
-            self._maybe_refresh_text(cache_key, url, mirrors, max_bytes)
-            return str(cached["content"])
-
-        content = self._fetch_text(url, max_bytes=max_bytes, mirrors=mirrors)
-        if content is not None:
-            self.write_cache(cache_key, {"content": content})
-            return content
-        return None
+        # 缓存未命中 / 手动刷新（绕过缓存读，失败不读旧缓存）：无条件拉取并写回
+        result = self._fetch(
+            url, max_bytes=max_bytes, mirrors=mirrors, parse=_parse_text
+        )
+        if result is None:
+            return None
+        self._store(cache_key, result)
+        return result.body
 
     def _maybe_refresh_json(
         self,
@@ -99,22 +188,7 @@ class OttCachedFetcher:
         mirrors: list[str] | None,
         max_bytes: int,
     ) -> None:
-        lock = self._acquire_refresh_lock(cache_key)
-        if lock is None:
-            return
-
-        def refresh() -> None:
-            try:
-                data = self._fetch_json(url, max_bytes=max_bytes, mirrors=mirrors)
-                if data is not None:
-                    self.write_cache(cache_key, data)
-                    log_info(f"[OttCachedFetcher] 后台刷新成功: {cache_key}")
-                else:
-                    log_warning(f"[OttCachedFetcher] 后台刷新失败: {cache_key}")
-            finally:
-                self._release_refresh_lock(cache_key, lock)
-
-        self._submit_refresh(refresh)
+        self._maybe_refresh(cache_key, url, mirrors, max_bytes, _parse_json)
 
     def _maybe_refresh_text(
         self,
@@ -123,18 +197,38 @@ class OttCachedFetcher:
         mirrors: list[str] | None,
         max_bytes: int,
     ) -> None:
+        self._maybe_refresh(cache_key, url, mirrors, max_bytes, _parse_text)
+
+    def _maybe_refresh(
+        self,
+        cache_key: str,
+        url: str,
+        mirrors: list[str] | None,
+        max_bytes: int,
+        parse: Callable[[httpx.Response], dict | str | None],
+    ) -> None:
+        """后台条件刷新：携带缓存的 ETag/Last-Modified，304 只续期不重下。"""
         lock = self._acquire_refresh_lock(cache_key)
         if lock is None:
             return
 
         def refresh() -> None:
             try:
-                content = self._fetch_text(url, max_bytes=max_bytes, mirrors=mirrors)
-                if content is not None:
-                    self.write_cache(cache_key, {"content": content})
-                    log_info(f"[OttCachedFetcher] 后台刷新成功: {cache_key}")
-                else:
+                result = self._fetch(
+                    url,
+                    max_bytes=max_bytes,
+                    mirrors=mirrors,
+                    parse=parse,
+                    validators=self.read_validators(cache_key),
+                )
+                if result is None:
                     log_warning(f"[OttCachedFetcher] 后台刷新失败: {cache_key}")
+                elif result.not_modified:
+                    self.touch_cache(cache_key)
+                    log_info(f"[OttCachedFetcher] 后台刷新未变化(304): {cache_key}")
+                else:
+                    self._store(cache_key, result)
+                    log_info(f"[OttCachedFetcher] 后台刷新成功: {cache_key}")
             finally:
                 self._release_refresh_lock(cache_key, lock)
 
@@ -167,102 +261,80 @@ class OttCachedFetcher:
     ) -> dict | None:
         """拉取 JSON。配置了智能路由时按实时延迟/连通性选路（原始/CDN/
         前缀镜像/显式镜像），否则保持固定 failover（主地址 → jsDelivr）。"""
-        if url.startswith("file://"):
-            return self._read_local_json(url, max_bytes=max_bytes)
-        if self._router is None:
-            # 兼容路径（无智能路由）：主 → jsDelivr(主) → 显式镜像 →
-            # jsDelivr(镜像)，保持固定 failover 原语义
-            for candidate in [url, *(mirrors or [])]:
-                data = self._fetch_json_once(candidate, max_bytes=max_bytes)
-                if data is not None:
-                    return data
-                fallback = to_jsdelivr_url(candidate)
-                if fallback:
-                    log_warning(
-                        f"[OttCachedFetcher] 主地址失败，jsDelivr CDN 降级: "
-                        f"{redact_url(candidate)} → {redact_url(fallback)}"
-                    )
-                    data = self._fetch_json_once(fallback, max_bytes=max_bytes)
-                    if data is not None:
-                        return data
-            return None
-        candidates = self._router.ordered_candidates(url, mirrors=mirrors)
-        for candidate in candidates:
-            t0 = time.monotonic()
-            data = self._fetch_json_once(candidate, max_bytes=max_bytes)
-            self._router.record(
-                candidate, ok=data is not None, latency=time.monotonic() - t0
-            )
-            if data is not None:
-                return data
-        return None
-
-    def _fetch_json_once(self, url: str, max_bytes: int = 0) -> dict | None:
-        try:
-            response = self._client.get(url)
-            response.raise_for_status()
-            headers = getattr(response, "headers", None)
-            if max_bytes > 0 and headers is not None:
-                try:
-                    declared = int(headers.get("content-length", -1))
-                except (TypeError, ValueError):
-                    declared = -1
-                if declared > max_bytes:
-                    log_warning(
-                        f"[OttCachedFetcher] 响应体超限: {redact_url(url)} ({declared} > {max_bytes})"
-                    )
-                    return None
-            if max_bytes > 0 and len(response.content) > max_bytes:
-                log_warning(
-                    f"[OttCachedFetcher] 响应体超限: {redact_url(url)} ({len(response.content)} > {max_bytes})"
-                )
-                return None
-            data = response.json()
-        except httpx.HTTPError as e:
-            log_warning(f"[OttCachedFetcher] HTTP 请求失败: {redact_url(url)} — {e}")
-            return None
-        except (ValueError, TypeError, OSError) as e:
-            log_warning(f"[OttCachedFetcher] 响应解析失败: {redact_url(url)} — {e}")
-            return None
-        return data if isinstance(data, dict) else None
+        result = self._fetch(
+            url, max_bytes=max_bytes, mirrors=mirrors, parse=_parse_json
+        )
+        return result.body if result is not None else None
 
     def _fetch_text(
         self, url: str, max_bytes: int = 0, mirrors: list[str] | None = None
     ) -> str | None:
         """拉取文本，路由策略同 _fetch_json（智能选路 / 固定 jsDelivr 降级）。"""
+        result = self._fetch(
+            url, max_bytes=max_bytes, mirrors=mirrors, parse=_parse_text
+        )
+        return result.body if result is not None else None
+
+    def _fetch(
+        self,
+        url: str,
+        *,
+        max_bytes: int,
+        mirrors: list[str] | None,
+        parse: Callable[[httpx.Response], dict | str | None],
+        validators: dict[str, str] | None = None,
+    ) -> FetchResult | None:
+        """按路由策略逐个候选拉取；全部失败返回 None。
+
+        validators 只发给签发它的那个候选地址（ETag 由服务端按地址签发，
+        跨 CDN/镜像不可比），其余候选照常无条件拉取。
+        """
         if url.startswith("file://"):
-            return self._read_local_text(url, max_bytes=max_bytes)
+            if parse is _parse_json:
+                body = self._read_local_json(url, max_bytes=max_bytes)
+            else:
+                body = self._read_local_text(url, max_bytes=max_bytes)
+            return FetchResult(body=body, url=url) if body is not None else None
         if self._router is None:
             # 兼容路径（无智能路由）：主 → jsDelivr(主) → 显式镜像 →
             # jsDelivr(镜像)，保持固定 failover 原语义
             for candidate in [url, *(mirrors or [])]:
-                content = self._fetch_text_once(candidate, max_bytes=max_bytes)
-                if content is not None:
-                    return content
+                result = self._fetch_once(candidate, max_bytes, parse, validators)
+                if result is not None:
+                    return result
                 fallback = to_jsdelivr_url(candidate)
                 if fallback:
                     log_warning(
                         f"[OttCachedFetcher] 主地址失败，jsDelivr CDN 降级: "
                         f"{redact_url(candidate)} → {redact_url(fallback)}"
                     )
-                    content = self._fetch_text_once(fallback, max_bytes=max_bytes)
-                    if content is not None:
-                        return content
+                    result = self._fetch_once(fallback, max_bytes, parse, validators)
+                    if result is not None:
+                        return result
             return None
-        candidates = self._router.ordered_candidates(url, mirrors=mirrors)
-        for candidate in candidates:
-            t0 = time.monotonic()
-            content = self._fetch_text_once(candidate, max_bytes=max_bytes)
-            self._router.record(
-                candidate, ok=content is not None, latency=time.monotonic() - t0
-            )
-            if content is not None:
-                return content
-        return None
+        return self._router.fetch_first(
+            url,
+            lambda candidate, client: self._fetch_once(
+                candidate, max_bytes, parse, validators, client=client
+            ),
+            mirrors=mirrors,
+        )
 
-    def _fetch_text_once(self, url: str, max_bytes: int = 0) -> str | None:
+    def _fetch_once(
+        self,
+        url: str,
+        max_bytes: int,
+        parse: Callable[[httpx.Response], dict | str | None],
+        validators: dict[str, str] | None = None,
+        client: httpx.Client | None = None,
+    ) -> FetchResult | None:
+        # client：对冲尝试独占的 client，缺省用共享 client
+        http = client if client is not None else self._client
+        headers = conditional_headers(validators, url)
         try:
-            response = self._client.get(url)
+            response = http.get(url, headers=headers) if headers else http.get(url)
+            if headers and response.status_code == 304:
+                return FetchResult(body=None, url=url, not_modified=True)
             response.raise_for_status()
             headers = getattr(response, "headers", None)
             if max_bytes > 0 and headers is not None:
@@ -280,10 +352,17 @@ class OttCachedFetcher:
                     f"[OttCachedFetcher] 响应体超限: {redact_url(url)} ({len(response.content)} > {max_bytes})"
                 )
                 return None
+            body = parse(response)
         except httpx.HTTPError as e:
             log_warning(f"[OttCachedFetcher] HTTP 请求失败: {redact_url(url)} — {e}")
             return None
-        return response.text
+        except (ValueError, TypeError, OSError) as e:
+            log_warning(f"[OttCachedFetcher] 响应解析失败: {redact_url(url)} — {e}")
+            return None
+        if body is None:
+            return None
+        etag, last_modified = response_validators(response)
+        return FetchResult(body=body, url=url, etag=etag, last_modified=last_modified)
 
     @staticmethod
     def _read_local_json(url: str, max_bytes: int = 0) -> dict | None:
@@ -334,19 +413,72 @@ class OttCachedFetcher:
                 data = json.load(f)
         except (OSError, json.JSONDecodeError):
             return None
-        return data if isinstance(data, dict) else None
+        if not isinstance(data, dict):
+            return None
+        digest = data.get(_BLOB_REF_KEY)
+        if digest is None:
+            return data
+        # 引用文件：正文在共享 blob 层；blob 已被 GC 或未注入存储时按未命中处理
+        if not isinstance(digest, str) or self._blob_store is None:
+            return None
+        raw = self._blob_store.get(digest)
+        if raw is None:
+            return None
+        try:
+            payload = json.loads(raw)
+        except (ValueError, UnicodeDecodeError):
+            return None
+        return payload if isinstance(payload, dict) else None
 
     def write_cache(self, cache_key: str, data: dict) -> None:
         path = self.cache_path(cache_key)
+        record = data
+        if self._blob_store is not None:
+            raw = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+            digest = self._blob_store.put(raw.encode("utf-8"))
+            if digest is not None:
+                record = {_BLOB_REF_KEY: digest}
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
             tmp_path = path.with_suffix(f"{path.suffix}.tmp")
             with tmp_path.open("w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                if record is data:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                else:
+                    json.dump(record, f)
             tmp_path.replace(path)
         except OSError:
             pass
 
+    def validators_path(self, cache_key: str) -> Path:
+        return self._cache_dir / f"{cache_key}.meta.json"
+
+    def read_validators(self, cache_key: str) -> dict[str, str] | None:
+        return read_validators(self.validators_path(cache_key))
+
+    def touch_cache(self, cache_key: str) -> None:
+        """304：正文未变，只把缓存文件 mtime（新鲜度时间戳）推到现在。"""
+        path = self.cache_path(cache_key)
+        try:
+            if path.exists():
+                now = time.time()
+                os.utime(path, (now, now))
+        except OSError:
+            pass
+
+    def _store(self, cache_key: str, result: FetchResult) -> None:
+        """写回正文与校验器；文本正文按 {"content": ...} 包装存储。"""
+        body = result.body
+        self.write_cache(
+            cache_key, body if isinstance(body, dict) else {"content": body}
+        )
+        write_validators(
+            self.validators_path(cache_key),
+            result.url,
+            result.etag,
+            result.last_modified,
+        )
+
     def is_cache_expired(self, cache_key: str) -> bool:
         path = self.cache_path(cache_key)
         try:
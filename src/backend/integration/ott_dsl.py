@@ -13,13 +13,12 @@ DslError 不暴露细节。全部原语为纯函数、无状态、无 I/O 副作
 
 from __future__ import annotations
 
+import atexit
 import base64
 import hashlib
 import hmac
 import json
 import random
-import subprocess
-import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
@@ -32,6 +31,7 @@ from .regex_worker import (
     REGEX_WORKER_MAX_INPUT_CHARS as REGEX_MAX_INPUT_CHARS,
     _has_nested_quantifier,
 )
+from .regex_worker_pool import RegexWorkerPool
 
 MAX_VALUE_BYTES = 1_048_576
 MAX_DEPTH = 32
@@ -39,35 +39,32 @@ MAX_CALLS = 1000
 MAX_STEPS = 8
 MAX_STEP_TRANSFER_BYTES = 2 * 1_048_576
 # ReDoS 防护（安全红线 3）：正则输入截断 ≤10KB（常量由 regex_worker 导出）；
-# 子进程执行 + 1s 硬超时。常量与子进程调度统一归本模块（低层），
+# 常驻子进程池执行 + 单条 1s 硬超时。常量与子进程调度统一归本模块（低层），
 # L1 解释器（ott_rule_interpreter）import 复用，避免重复定义。
 REGEX_TIMEOUT_S = 1.0
 REGEX_WORKER_PATH = Path(__file__).with_name("regex_worker.py")
 
 
+_REGEX_POOL = RegexWorkerPool(REGEX_WORKER_PATH, timeout=REGEX_TIMEOUT_S)
+atexit.register(_REGEX_POOL.close)
+
+
 def _run_regex(payload: dict) -> dict | None:
-    """子进程执行 regex_worker；超时/启动失败/非 JSON 输出返回 None。
+    """常驻子进程执行 regex_worker；超时/启动失败/非 JSON 输出返回 None。
 
-    供本模块正则原语与 L1 解释器（_extract_regex）复用的唯一子进程通道。
+    本模块正则原语的单条入口；L1 解释器按页批量走 _run_regex_batch。
     """
-    try:
-        proc = subprocess.run(
-            [sys.executable, str(REGEX_WORKER_PATH)],
-            input=json.dumps(payload).encode("utf-8"),
-            capture_output=True,
-            timeout=REGEX_TIMEOUT_S,
-        )
-    except (subprocess.TimeoutExpired, OSError):
-        return None
-    if proc.returncode != 0:
-        return None
-    try:
-        result = json.loads(proc.stdout)
-    except (json.JSONDecodeError, ValueError):
-        return None
-    if not isinstance(result, dict) or not result.get("ok"):
-        return None
-    return result
+    return _run_regex_batch([payload])[0]
+
+
+def _run_regex_batch(payloads: list[dict]) -> list[dict | None]:
+    """一次往返执行多条正则请求（每条仍独立受 1s 硬超时），结果与输入对齐。"""
+    if not payloads:
+        return []
+    return [
+        result if result is not None and result.get("ok") else None
+        for result in _REGEX_POOL.run_batch(payloads)
+    ]
 
 
 class DslError(Exception):
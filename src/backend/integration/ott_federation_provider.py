@@ -19,19 +19,22 @@ import re
 import threading
 import time
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
 
 import httpx
 
 from ..config.runtime_config import RuntimeConfig, SourceRepoEntry
 from ..utils.logger import log_info, log_warning
+from .content_blob_store import ContentBlobStore
 from .ott_cached_fetcher import OttCachedFetcher
 from .ott_normalization import _bridge_authority, _script_authority, redact_url
 from .ott_client import DEFAULT_STATIC_SEGMENT_SIZE, OttClient, FetchJson, FetchText
 from .ott_repo_manifest import RepoManifestCache, repo_cache_key
 from .ott_rule_interpreter import CLIENT_API_LEVEL, OttRuleInterpreter
-from .ott_script_client import ScriptCache, ScriptSandbox
+from .ott_script_client import ScriptCache, ScriptSandbox, shared_zygote_pool
 
 if TYPE_CHECKING:
     from ..ports.async_executor import AsyncExecutor
@@ -93,6 +96,19 @@ def _repo_incompatibility(manifest: dict) -> str | None:
     return None
 
 
+def _host_of(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or "").lower()
+    except (ValueError, OSError):
+        return ""
+
+
+# 物化结果哨兵：源在截止时间内未返回（区别于 client 契约里的 None = 源不可用）
+_DEADLINE_EXCEEDED = object()
+# 并行物化协调循环的最长等待片（秒）：有源在排队等主机名额时按此频率轮询
+_SCHEDULE_TICK_S = 0.05
+
+
 class _EntryCache:
     """rule/script 条目结果 TTL 缓存（复用 ott.cache_ttl_seconds）。"""
 
@@ -151,6 +167,11 @@ class _InstanceClient:
             profile = ep.get("profile")
             self._profiles[url] = profile if profile in ("service", "static") else None
 
+    @property
+    def host_key(self) -> str:
+        """并行物化的主机并发分组键：首选端点的主机名。"""
+        return _host_of(self._endpoints[0].get("url", "")) if self._endpoints else ""
+
     def _ordered_urls(self) -> list[str]:
         """按健康度排序的端点 URL：健康端点优先，同健康度按 priority。"""
         with self._lock:
@@ -356,6 +377,12 @@ class _RuleClient(_SourceClientBase):
         # authority 格式：rule:{repo_id}:{rule_id}（上游规范）
         self.authority = authority or f"rule:{rule_id}"
 
+    @property
+    def host_key(self) -> str:
+        request = self._rule.get("request") if isinstance(self._rule, dict) else None
+        url = request.get("url", "") if isinstance(request, dict) else ""
+        return _host_of(url) if isinstance(url, str) else ""
+
     def list_entries(self, force: bool = False) -> list[dict] | None:
         cache_key = f"rule:{self.authority}"
         cached = (
@@ -417,6 +444,10 @@ class _ScriptClient(_SourceClientBase):
         self._min_api_level = min_api_level
         self._checksum = checksum
 
+    @property
+    def host_key(self) -> str:
+        return _host_of(self.url)
+
     def list_entries(self, force: bool = False) -> list[dict] | None:
         cache_key = f"script:{self.url}"
         cached = (
@@ -485,6 +516,10 @@ class _BridgeClient(_SourceClientBase):
         self._entry_cache = entry_cache
         self._max_content_bytes = max_content_bytes
 
+    @property
+    def host_key(self) -> str:
+        return _host_of(self.endpoint)
+
     def list_entries(self, force: bool = False) -> list[dict] | None:
         if self.bridge_kind != "generic-http":
             log_warning(
@@ -701,6 +736,7 @@ class OttFederationProvider:
         # 动态分组键 —— 条目属于哪个订阅源就归入哪个源组（不硬编码）
         self._authority_meta: dict[str, dict] = {}
         self._shared_client: httpx.Client | None = None
+        self._blob_store: ContentBlobStore | None = None
 
     # ------------------------------------------------------------------
     # 内部：从 manifest 构建 authority → _InstanceClient 映射
@@ -736,6 +772,7 @@ class OttFederationProvider:
         sandbox = ScriptSandbox(
             enabled=self._runtime_config.ott.scripts_enabled,
             token_store=self._token_store,
+            zygote_pool=shared_zygote_pool(),
         )
 
         for repo in self._runtime_config.source_repos.enabled_repos:
@@ -811,11 +848,24 @@ class OttFederationProvider:
             )
         return self._shared_client
 
+    def _shared_blob_store(self) -> ContentBlobStore:
+        """所有 instance 缓存共用一个 blob 层：相同正文跨 authority/镜像只存一份。"""
+        if self._blob_store is None:
+            from ..config.app_paths import registry_cache_dir
+
+            self._blob_store = ContentBlobStore(
+                registry_cache_dir() / "blobs",
+                max_bytes=self._runtime_config.ott.blob_cache_max_bytes,
+            )
+        return self._blob_store
+
     def close(self) -> None:
-        """关闭共享 HTTP client（幂等；从未创建时安全无操作）。"""
+        """关闭共享 HTTP client 与选路器对冲线程池（幂等）。"""
         if self._shared_client is not None:
             self._shared_client.close()
             self._shared_client = None
+        if self._router is not None:
+            self._router.close()
 
     def _clients_signature(self) -> tuple[object, ...]:
         signature: list[object] = []
@@ -885,6 +935,7 @@ class OttFederationProvider:
             http_client=self._shared_http_client(),
             async_executor=self._async_executor,
             router=self._router,
+            blob_store=self._shared_blob_store(),
         )
         clients[authority] = _InstanceClient(
             authority=authority,
@@ -1001,24 +1052,23 @@ class OttFederationProvider:
         if not clients:
             self._last_list_ok, self._last_list_failed = [], []
             return []
+        outcomes = self._materialize(clients, force)
         all_entries: list[dict] = []
+        # 按 clients（manifest 声明）顺序合并，与并行完成顺序无关
         for authority, client in clients.items():
-            log_info(
-                f"[Federation] listing entries for {authority} ({type(client).__name__})"
-            )
-            try:
-                entries = client.list_entries(force=force)
-            except Exception as e:
-                log_warning(f"[Federation] list_entries 异常 {authority}: {e}")
+            entries = outcomes.get(authority, _DEADLINE_EXCEEDED)
+            if entries is _DEADLINE_EXCEEDED:
+                log_warning(
+                    f"[Federation] {authority} 超过 "
+                    f"{self._runtime_config.ott.list_source_deadline_seconds}s "
+                    "未返回，计入刷新失败"
+                )
                 failed_authorities.append(authority)
                 continue
             if entries is None:
                 # client 契约：None = 源不可用（异常已被 client 内部捕获）
                 failed_authorities.append(authority)
                 continue
-            log_info(
-                f"[Federation] {authority}: {len(entries) if entries else 0} entries"
-            )
             ok_authorities.append(authority)
             if entries:
                 self._decorate_with_repo_meta(client, authority, entries)
@@ -1029,6 +1079,97 @@ class OttFederationProvider:
         )
         return self._finalize(all_entries)
 
+    def _list_one(self, authority: str, client: Any, force: bool) -> list[dict] | None:
+        """物化单个源；异常吸收为 None（源不可用）。"""
+        log_info(
+            f"[Federation] listing entries for {authority} ({type(client).__name__})"
+        )
+        try:
+            entries = client.list_entries(force=force)
+        except Exception as e:
+            log_warning(f"[Federation] list_entries 异常 {authority}: {e}")
+            return None
+        if entries is not None:
+            log_info(f"[Federation] {authority}: {len(entries)} entries")
+        return entries
+
+    def _materialize(self, clients: dict[str, Any], force: bool) -> dict[str, Any]:
+        """物化全部源，返回 authority → entries / None / _DEADLINE_EXCEEDED。
+
+        ott.list_concurrency > 1 时并行：同时运行的源数受全局上限与同主机
+        上限约束（按 manifest 顺序出队，主机名额满的源让后面的源先跑）；
+        单源从开始运行起计时，超过截止时间即判失败并不再等待——工作线程
+        无法强杀，其迟到结果被丢弃，但它仍占着所在主机的名额直到真正
+        结束，避免同主机上叠加更多请求。仍在排队的源从刷新开始起计时，
+        同样超过截止时间即判失败（例如排在卡死源之后的同主机源），
+        因此整轮刷新至多约两倍截止时间。
+        """
+        ott = self._runtime_config.ott
+        if ott.list_concurrency <= 1 or len(clients) <= 1:
+            return {
+                authority: self._list_one(authority, client, force)
+                for authority, client in clients.items()
+            }
+
+        deadline = float(ott.list_source_deadline_seconds)
+        queue_deadline = time.monotonic() + deadline
+        queued = list(clients.items())
+        host_running: dict[str, int] = {}
+        running: dict[Future, tuple[str, str, float]] = {}
+        # 已判超时但线程仍在运行的源：future → host（结束后才归还主机名额）
+        overdue: dict[Future, str] = {}
+        outcomes: dict[str, Any] = {}
+        # 线程数按源数给足：超时被放弃的线程仍占着 worker，不能挤掉排队的源
+        executor = ThreadPoolExecutor(
+            max_workers=len(clients), thread_name_prefix="ott-federation"
+        )
+        try:
+            while queued or running:
+                for item in list(queued):
+                    if len(running) >= ott.list_concurrency:
+                        break
+                    authority, client = item
+                    host = getattr(client, "host_key", "")
+                    if host_running.get(host, 0) >= ott.list_per_host_concurrency:
+                        continue
+                    queued.remove(item)
+                    host_running[host] = host_running.get(host, 0) + 1
+                    future = executor.submit(self._list_one, authority, client, force)
+                    running[future] = (authority, host, time.monotonic())
+                now = time.monotonic()
+                if queued and now >= queue_deadline:
+                    for authority, _ in queued:
+                        outcomes[authority] = _DEADLINE_EXCEEDED
+                    queued.clear()
+                    if not running:
+                        break
+                deadlines = [started + deadline for _, _, started in running.values()]
+                if queued:
+                    deadlines.append(queue_deadline)
+                timeout = max(0.0, min(deadlines) - now)
+                if queued:
+                    timeout = min(timeout, _SCHEDULE_TICK_S)
+                # 有排队源时也等超时源结束：它归还的主机名额可让排队源开跑
+                waiting = [*running, *overdue] if queued else list(running)
+                done, _ = wait(waiting, timeout=timeout, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future in done & overdue.keys():
+                    host_running[overdue.pop(future)] -= 1
+                for future in list(running):
+                    authority, host, started = running[future]
+                    if future in done:
+                        outcomes[authority] = future.result()
+                        host_running[host] -= 1
+                    elif now - started >= deadline:
+                        outcomes[authority] = _DEADLINE_EXCEEDED
+                        overdue[future] = host
+                    else:
+                        continue
+                    del running[future]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return outcomes
+
     def refresh_source(self, authority: str, force: bool = True) -> list[dict]:
         """单源强制换新：只重新物化该 authority 一个源，返回其新条目。
 
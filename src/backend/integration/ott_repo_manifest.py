@@ -30,6 +30,13 @@ from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 
 from ..config.runtime_config import RuntimeConfig, SourceRepoEntry
 from ..utils.logger import log_info, log_warning
+from .ott_cached_fetcher import (
+    FetchResult,
+    conditional_headers,
+    read_validators,
+    response_validators,
+    write_validators,
+)
 from .ott_normalization import local_path_from_file_uri, redact_url, to_jsdelivr_url
 
 if TYPE_CHECKING:
@@ -404,15 +411,19 @@ class RepoManifestCache:
         return self._fetch_and_cache(cache_key, repo)
 
     def _fetch_and_cache(self, cache_key: str, repo: SourceRepoEntry) -> dict | None:
-        data, etag = self._fetch_manifest_with_mirrors(repo, cache_key)
-        if data is None:
+        result = self._fetch_manifest_with_mirrors(repo, cache_key)
+        if result is None:
             # 网络失败：离线兜底返回缓存（无视 TTL）
             return self._read_validated_cache(cache_key)
-        _, served = self._accept_manifest(cache_key, repo, data, etag)
+        if result.not_modified:
+            # 304：缓存即上游当前版本，已验签接受过，只续期不重验
+            self._touch_cache(cache_key)
+            return self._read_validated_cache(cache_key)
+        _, served = self._accept_manifest(cache_key, repo, result)
         return served
 
     def _accept_manifest(
-        self, cache_key: str, repo: SourceRepoEntry, data: dict, etag: str
+        self, cache_key: str, repo: SourceRepoEntry, result: FetchResult
     ) -> tuple[bool, dict | None]:
         """校验 + TUF-lite 检查 + 先验签后落盘 + 撤销/信任更新。
 
@@ -434,6 +445,7 @@ class RepoManifestCache:
             (True, new_manifest)  新 manifest 已接受；
             (False, served)      被拒绝，served 为回退的旧缓存（可为 None）。
         """
+        data = result.body
         validated = validate_repo_manifest(data)
         if validated is None:
             log_warning(f"[RepoManifest] manifest 校验失败: {redact_url(repo.url)}")
@@ -461,10 +473,16 @@ class RepoManifestCache:
             return False, self._read_validated_cache(cache_key)
         # 接受：缓存网络原始内容（字节口径与生产方一致），推进链参照
         self._write_cache(cache_key, data)
+        write_validators(
+            self.validators_path(cache_key),
+            result.url,
+            result.etag,
+            result.last_modified,
+        )
         if self._runtime_config is not None:
             self._runtime_config.update_source_repo_refresh(
                 repo.url,
-                etag=etag,
+                etag=result.etag,
                 last_snapshot_hash=manifest_hash(data),
             )
         if trust_result == "verified":
@@ -473,45 +491,46 @@ class RepoManifestCache:
 
     def _fetch_manifest_with_mirrors(
         self, repo: SourceRepoEntry, cache_key: str
-    ) -> tuple[dict | None, str]:
+    ) -> FetchResult | None:
         if self._router is not None:
             return self._fetch_manifest_routed(repo, cache_key)
-        data, etag = self._fetch_manifest(repo.url, cache_key, repo.etag)
-        if data is not None:
-            return data, etag
+        validators = self._cached_validators(cache_key, repo)
+        result = self._fetch_manifest(repo.url, validators)
+        if result is not None:
+            return result
         cached = self._read_validated_cache(cache_key)
         if not cached:
             # 首次拉取失败（无缓存可镜像）：尝试 jsDelivr CDN 降级，
             # 兜底 GitHub raw 直连超时（2026-08-13 实测）。
             fallback = to_jsdelivr_url(repo.url)
             if fallback:
-                data, etag = self._fetch_manifest(fallback, cache_key, repo.etag)
-                if data is not None:
+                result = self._fetch_manifest(fallback, validators)
+                if result is not None:
                     log_info(
                         f"[RepoManifest] 主地址失败，jsDelivr CDN 命中: "
                         f"{redact_url(fallback)}"
                     )
-                    return data, etag
-            return None, ""
+                    return result
+            return None
         for mirror in cached.get("mirrors", []):
             if not isinstance(mirror, dict):
                 continue
             url = str(mirror.get("url") or "")
             if not url.startswith(("http://", "https://")) or url == repo.url:
                 continue
-            data, etag = self._fetch_manifest(url, cache_key, repo.etag)
-            if data is not None:
+            result = self._fetch_manifest(url, validators)
+            if result is not None:
                 log_info(f"[RepoManifest] 主地址失败，镜像命中: {redact_url(url)}")
-                return data, etag
-        return None, ""
+                return result
+        return None
 
     def _fetch_manifest_routed(
         self, repo: SourceRepoEntry, cache_key: str
-    ) -> tuple[dict | None, str]:
+    ) -> FetchResult | None:
         """智能路由版 manifest 拉取：候选 = 原始 + jsDelivr + 已缓存镜像，
         按实时延迟/连通性排序逐个尝试（记录回写统计）。file:// 直读本地。"""
         if repo.url.startswith("file://"):
-            return self._fetch_manifest(repo.url, cache_key, repo.etag), ""
+            return self._fetch_manifest(repo.url)
         cached = self._read_validated_cache(cache_key)
         mirrors: list[str] = []
         if cached:
@@ -521,44 +540,68 @@ class RepoManifestCache:
                 url = str(mirror.get("url") or "")
                 if url.startswith(("http://", "https://")) and url != repo.url:
                     mirrors.append(url)
-        candidates = self._router.ordered_candidates(repo.url, mirrors=mirrors or None)
-        for url in candidates:
-            t0 = time.monotonic()
-            data, etag = self._fetch_manifest(url, cache_key, repo.etag)
-            self._router.record(url, ok=data is not None, latency=time.monotonic() - t0)
-            if data is not None:
-                log_info(
-                    f"[RepoManifest] 智能路由命中: {redact_url(url)}"
-                    + (f"（主地址 {redact_url(repo.url)}）" if url != repo.url else "")
+        validators = self._cached_validators(cache_key, repo)
+        result = self._router.fetch_first(
+            repo.url,
+            lambda url, client: self._fetch_manifest(url, validators, client),
+            mirrors=mirrors or None,
+        )
+        if result is not None:
+            log_info(
+                f"[RepoManifest] 智能路由命中: {redact_url(result.url)}"
+                + (
+                    f"（主地址 {redact_url(repo.url)}）"
+                    if result.url != repo.url
+                    else ""
                 )
-                return data, etag
-        return None, ""
+            )
+        return result
+
+    def _cached_validators(
+        self, cache_key: str, repo: SourceRepoEntry
+    ) -> dict[str, str] | None:
+        """条件请求用的校验器：旁路文件优先，旧版只有 repo.etag（视为主地址签发）。
+
+        无可用缓存时不发条件请求——304 之后没有内容可服务。
+        """
+        if self._read_validated_cache(cache_key) is None:
+            return None
+        validators = read_validators(self.validators_path(cache_key))
+        if validators is not None:
+            return validators
+        if repo.etag:
+            return {"url": repo.url, "etag": repo.etag, "last_modified": ""}
+        return None
 
     def _fetch_manifest(
-        self, url: str, cache_key: str = "", etag: str = ""
-    ) -> tuple[dict | None, str]:
+        self,
+        url: str,
+        validators: dict[str, str] | None = None,
+        client: httpx.Client | None = None,
+    ) -> FetchResult | None:
         # 支持 file:// 协议读取本地文件（内置 fallback manifest）
         if url.startswith("file://"):
-            return self._fetch_local_manifest(url), ""
-        headers = {"If-None-Match": etag} if etag else {}
+            data = self._fetch_local_manifest(url)
+            return FetchResult(body=data, url=url) if data is not None else None
+        headers = conditional_headers(validators, url)
+        # client：对冲尝试独占的 client，缺省用共享 client
+        http = client if client is not None else self._client
         try:
-            response = self._client.get(url, headers=headers)
-            if response.status_code == 304:
-                if cache_key:
-                    self._touch_cache(cache_key)
-                    return self._read_cache(cache_key), ""
-                return None, ""
+            response = http.get(url, headers=headers)
+            if headers and response.status_code == 304:
+                return FetchResult(body=None, url=url, not_modified=True)
             response.raise_for_status()
             data = response.json()
         except httpx.HTTPError as e:
             log_warning(f"[RepoManifest] HTTP 请求失败: {redact_url(url)} — {e}")
-            return None, ""
+            return None
         except (ValueError, TypeError, OSError) as e:
             log_warning(f"[RepoManifest] 响应解析失败: {redact_url(url)} — {e}")
-            return None, ""
-        return (data if isinstance(data, dict) else None), str(
-            response.headers.get("etag", "")
-        )
+            return None
+        if not isinstance(data, dict):
+            return None
+        etag, last_modified = response_validators(response)
+        return FetchResult(body=data, url=url, etag=etag, last_modified=last_modified)
 
     @staticmethod
     def _fetch_local_manifest(url: str) -> dict | None:
@@ -599,9 +642,14 @@ class RepoManifestCache:
 
         def refresh() -> None:
             try:
-                data, etag = self._fetch_manifest_with_mirrors(repo, cache_key)
-                if data is not None:
-                    accepted, _ = self._accept_manifest(cache_key, repo, data, etag)
+                result = self._fetch_manifest_with_mirrors(repo, cache_key)
+                if result is not None and result.not_modified:
+                    self._touch_cache(cache_key)
+                    log_info(
+                        f"[RepoManifest] 后台刷新未变化(304): {redact_url(repo.url)}"
+                    )
+                elif result is not None:
+                    accepted, _ = self._accept_manifest(cache_key, repo, result)
                     if accepted:
                         log_info(f"[RepoManifest] 后台刷新成功: {redact_url(repo.url)}")
                     else:
@@ -643,6 +691,9 @@ class RepoManifestCache:
     def cache_path(self, cache_key: str) -> Path:
         return self._cache_dir / f"{cache_key}.json"
 
+    def validators_path(self, cache_key: str) -> Path:
+        return self._cache_dir / f"{cache_key}.meta.json"
+
     def _read_cache(self, cache_key: str) -> dict | None:
         path = self.cache_path(cache_key)
         try:
@@ -780,9 +831,9 @@ class RepoManifestCache:
                     shutil.rmtree(self._cache_dir)
                     self._cache_dir.mkdir(parents=True, exist_ok=True)
             else:
-                path = self.cache_path(repo_cache_key(url))
-                if path.exists():
-                    path.unlink()
+                cache_key = repo_cache_key(url)
+                self.cache_path(cache_key).unlink(missing_ok=True)
+                self.validators_path(cache_key).unlink(missing_ok=True)
         except OSError:
             log_warning("[RepoManifest] 清除缓存失败")
 
@@ -13,10 +13,17 @@ entry 流，供联邦聚合层消费。
 from __future__ import annotations
 
 import hashlib
+import importlib.util
 import ipaddress
 import json
 import re
 import socket
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime, timezone
 from typing import Any
 from urllib.parse import urlparse
@@ -24,7 +31,7 @@ from urllib.parse import urlparse
 import httpx
 
 from ..utils.logger import log_warning
-from .ott_dsl import DslError, _run_regex, run_steps
+from .ott_dsl import DslError, _run_regex_batch, run_steps
 from .ott_normalization import normalize_summary
 from .regex_worker import (
     REGEX_WORKER_MAX_INPUT_CHARS as REGEX_MAX_INPUT_CHARS,
@@ -39,6 +46,9 @@ MAX_TOTAL_ENTRIES = 1000
 DEFAULT_MAX_BYTES = 1_048_576
 DEFAULT_MAX_PAGES = 5
 TOTAL_FETCH_TIMEOUT_S = 10.0
+# 分页预取窗口与声明限速的上限（不可信 manifest 的声明值被夹到此范围）
+MAX_PREFETCH_PAGES = 4
+MAX_MIN_INTERVAL_MS = 60_000
 # 客户端实现的 DSL API level（schema v2 rights.min_api_level 对照值）。
 # DSL 引擎（45 原语）+ schema v2 已落地 → 2；未来新增能力递增。
 CLIENT_API_LEVEL = 2
@@ -231,6 +241,46 @@ def _parse_page_int(value: Any) -> int | None:
         return None
 
 
+def _parse_prefetch(pagination: Any) -> tuple[int | None, int | None]:
+    """解析 pagination.prefetch（预取页数）与 min_interval_ms（请求最小间隔）。
+
+    缺省均为 0（逐页串行、不限速）；非法值返回 None（调用方拒绝整条规则），
+    合法值夹到 [0, MAX_PREFETCH_PAGES] / [0, MAX_MIN_INTERVAL_MS]。
+    """
+    if not isinstance(pagination, dict):
+        return 0, 0
+    prefetch = _parse_page_int(pagination.get("prefetch", 0))
+    interval = _parse_page_int(pagination.get("min_interval_ms", 0))
+    if prefetch is not None:
+        prefetch = min(max(prefetch, 0), MAX_PREFETCH_PAGES)
+    if interval is not None:
+        interval = min(max(interval, 0), MAX_MIN_INTERVAL_MS)
+    return prefetch, interval
+
+
+# _iter_pages 产出的 URL 校验失败标记（区别于抓取失败的 None）
+_INVALID_URL = object()
+
+
+class _RateGate:
+    """按声明的最小间隔排队发放请求时隙（多线程预取共享同一闸门）。"""
+
+    def __init__(self, min_interval: float) -> None:
+        self._interval = min_interval
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self._interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_at)
+            self._next_at = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 def _declares_content_type(headers: dict) -> bool:
     """请求体规则必须显式声明 Content-Type（大小写不敏感）。"""
     return any(isinstance(k, str) and k.lower() == "content-type" for k in headers)
@@ -245,7 +295,11 @@ def _extract_json_path(data: Any, path: str) -> str:
     """从 JSON 数据中按 $.a.b 或 items[*].title 简写提取文本。"""
     if not path or data is None:
         return ""
+    return _eval_json_path(data, _compile_json_path(path))
+
 
+def _compile_json_path(path: str) -> tuple[str, Any]:
+    """预解析 JSON path：("root", None) / ("index", "[0][*]") / ("parts", [...])。"""
     raw = path.strip()
     # 去掉 "$." 或 "$" 前缀
     if raw.startswith("$."):
@@ -255,15 +309,22 @@ def _extract_json_path(data: Any, path: str) -> str:
     elif raw == "$":
         raw = ""
     if not raw:
-        return _stringify(data)
-
-    # 处理纯索引路径：$[0]、[*]、[0][1]
+        return ("root", None)
+    # 纯索引路径：$[0]、[*]、[0][1]
     if raw.startswith("["):
-        return _stringify(_navigate_index_only(data, raw))
+        return ("index", raw)
+    return ("parts", raw.split("."))
+
 
-    parts = raw.split(".")
-    result = _navigate_parts(data, parts, 0)
-    return _stringify(result)
+def _eval_json_path(data: Any, compiled: tuple[str, Any]) -> str:
+    if data is None:
+        return ""
+    kind, arg = compiled
+    if kind == "root":
+        return _stringify(data)
+    if kind == "index":
+        return _stringify(_navigate_index_only(data, arg))
+    return _stringify(_navigate_parts(data, arg, 0))
 
 
 def _navigate_index_only(data: Any, raw: str) -> Any:
@@ -362,20 +423,29 @@ def _stringify(value: Any) -> str:
     return str(value)
 
 
-def _extract_regex(text: str, pattern: str) -> dict[str, str]:
-    """用命名正则提取字段。失败返回空 dict。
+def _extract_regex_batch(jobs: list[tuple[str, str]]) -> list[dict[str, str]]:
+    """用命名正则批量提取字段，一次子进程往返；结果与输入对齐，失败项为空 dict。
 
-    ReDoS 防护（安全红线 3）：正则不在宿主进程执行，由 regex_worker 子进程
-    执行并受 1s 硬超时；输入截断 ≤10KB；嵌套量词静态拒绝。子进程调度复用
-    ott_dsl._run_regex。
+    ReDoS 防护（安全红线 3）：正则不在宿主进程执行，由 regex_worker 常驻
+    子进程执行并受单条 1s 硬超时；输入截断 ≤10KB；嵌套量词静态拒绝。子进程
+    调度复用 ott_dsl._run_regex_batch。
     """
-    if not pattern or not text:
-        return {}
-    if len(text) > REGEX_MAX_INPUT_CHARS:
-        text = text[:REGEX_MAX_INPUT_CHARS]
-    if _has_nested_quantifier(pattern):
-        return {}
-    result = _run_regex({"pattern": pattern, "text": text})
+    results: list[dict[str, str]] = [{} for _ in jobs]
+    payloads: list[dict] = []
+    slots: list[int] = []
+    for i, (text, pattern) in enumerate(jobs):
+        if not pattern or not text or _has_nested_quantifier(pattern):
+            continue
+        if len(text) > REGEX_MAX_INPUT_CHARS:
+            text = text[:REGEX_MAX_INPUT_CHARS]
+        payloads.append({"pattern": pattern, "text": text})
+        slots.append(i)
+    for i, result in zip(slots, _run_regex_batch(payloads)):
+        results[i] = _regex_groups(result)
+    return results
+
+
+def _regex_groups(result: dict | None) -> dict[str, str]:
     if result is None:
         return {}
     groups = result.get("groups")
@@ -387,6 +457,17 @@ def _extract_regex(text: str, pattern: str) -> dict[str, str]:
     return {}
 
 
+def _regex_pattern(spec: str) -> str | None:
+    """extract_spec 是正则（/.../ 或含命名组）时返回正则本体，否则 None。"""
+    if spec.startswith(("$.", "$[")) or spec == "$":
+        return None
+    if spec.startswith("/") and spec.endswith("/"):
+        return spec[1:-1]
+    if "?P<" in spec:
+        return spec
+    return None
+
+
 def _first_group_value(result: dict[str, str] | None) -> str:
     """从正则提取结果中取第一个非空值。"""
     if not result:
@@ -401,68 +482,153 @@ def _first_group_value(result: dict[str, str] | None) -> str:
     return ""
 
 
-def _extract_css_selector(html: str, selector: str) -> str:
-    """用 CSS 选择器从 HTML 中提取第一个匹配元素的文本。"""
-    if not selector or not html:
-        return ""
+def _html_parser_backend() -> str:
+    """BeautifulSoup 解析后端：装了 lxml 用其 C 解析器，否则标准库 html.parser。"""
+    return "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+
+_HTML_PARSER = _html_parser_backend()
+
+
+def _compile_css_selector(selector: str) -> Any:
+    """预编译 CSS 选择器；bs4 不可用或语法非法返回 None（该字段恒为空）。"""
+    try:
+        import soupsieve
+    except ImportError:
+        return None
+    try:
+        return soupsieve.compile(selector)
+    except soupsieve.SelectorSyntaxError:
+        return None
+
+
+def _parse_html(html: str) -> Any:
     try:
         from bs4 import BeautifulSoup
     except ImportError:
-        return ""
+        return None
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        elem = soup.select_one(selector)
-    except Exception:
-        return ""
-    if elem is None:
-        return ""
-    return elem.get_text(strip=True)
+        return BeautifulSoup(html, _HTML_PARSER)
+    except Exception:  # noqa: BLE001 - 畸形 HTML 按空字段处理
+        return None
 
 
-def extract_field(data: Any, extract_spec: str) -> str:
-    """根据 extract_spec 格式自动分派提取器。
+class _ParsedItem:
+    """单个条目的共享解析结果：字符串化文本与 HTML 树各只计算一次。"""
+
+    __slots__ = ("_soup", "_soup_ready", "_text", "data")
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+        self._text: str | None = None
+        self._soup: Any = None
+        self._soup_ready = False
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            data = self.data
+            self._text = data if isinstance(data, str) else _stringify(data)
+        return self._text
 
-    规则：
-    - 以 "$." 开头 → JSON path
-    - 以 "/" 开头和结尾 → 正则
-    - 含 "(" 且含 "?P<" → 正则（命名组）
+    @property
+    def soup(self) -> Any:
+        if not self._soup_ready:
+            self._soup_ready = True
+            if self.text:
+                self._soup = _parse_html(self.text)
+        return self._soup
+
+
+class CompiledExtract:
+    """规则 extract 规格的编译形态。
+
+    JSON path 预解析、CSS 选择器预编译、正则字段识别均在构造时一次完成；
+    extract_many 对每个条目只字符串化/解析 HTML 一次，全部 CSS 字段共享
+    同一棵树，整页所有正则字段合并为一次 regex worker 往返。
+
+    分派规则同 extract_field：
+    - 以 "$." / "$[" 开头或等于 "$" → JSON path（空规格等价 "$"）
+    - 以 "/" 开头和结尾，或含 "?P<" → 正则
     - 否则 → CSS 选择器
     """
-    if not extract_spec:
-        return _stringify(data)
 
-    spec = extract_spec.strip()
+    def __init__(self, extract_spec: dict[str, Any]) -> None:
+        self._fields: list[tuple[str, str, Any]] = []
+        for key, spec in extract_spec.items():
+            self._fields.append((key, *self._compile(spec)))
 
-    # JSON path（$.xxx 或 $[idx] 或 $[*]）
-    if spec.startswith("$."):
-        return _extract_json_path(data, spec)
-    if spec.startswith("$["):
-        return _extract_json_path(data, spec)
-    if spec == "$":
-        return _stringify(data)
+    @staticmethod
+    def _compile(spec: Any) -> tuple[str, Any]:
+        if not isinstance(spec, str):
+            return ("none", None)
+        spec = spec.strip()
+        if not spec:
+            return ("json", ("root", None))
+        if spec.startswith(("$.", "$[")) or spec == "$":
+            return ("json", _compile_json_path(spec))
+        pattern = _regex_pattern(spec)
+        if pattern is not None:
+            return ("regex", pattern)
+        return ("css", _compile_css_selector(spec))
+
+    def extract(self, data: Any) -> dict[str, str]:
+        return self.extract_many([data])[0]
+
+    def extract_many(self, items: list[Any]) -> list[dict[str, str]]:
+        """按字段顺序提取每个条目，返回与 items 对齐的结果列表。"""
+        results: list[dict[str, str]] = []
+        regex_targets: list[tuple[dict[str, str], str]] = []
+        regex_jobs: list[tuple[str, str]] = []
+        for data in items:
+            parsed = _ParsedItem(data)
+            result: dict[str, str] = {}
+            for key, kind, arg in self._fields:
+                if kind == "json":
+                    result[key] = _eval_json_path(data, arg)
+                elif kind == "regex":
+                    result[key] = ""
+                    regex_targets.append((result, key))
+                    regex_jobs.append((parsed.text, arg))
+                elif kind == "css":
+                    result[key] = self._select_text(parsed, arg)
+                else:
+                    result[key] = ""
+            results.append(result)
+        for (result, key), groups in zip(
+            regex_targets, _extract_regex_batch(regex_jobs)
+        ):
+            result[key] = _first_group_value(groups)
+        return results
 
-    # 正则：显式 /.../ 或命名组
-    if spec.startswith("/") and spec.endswith("/"):
-        pattern = spec[1:-1]
-        text = _stringify(data) if not isinstance(data, str) else data
-        result = _extract_regex(text, pattern)
-        return _first_group_value(result)
+    @staticmethod
+    def _select_text(parsed: _ParsedItem, selector: Any) -> str:
+        if selector is None or not parsed.text:
+            return ""
+        soup = parsed.soup
+        if soup is None:
+            return ""
+        try:
+            elem = selector.select_one(soup)
+        except Exception:
+            return ""
+        if elem is None:
+            return ""
+        return elem.get_text(strip=True)
 
-    if "?P<" in spec:
-        text = _stringify(data) if not isinstance(data, str) else data
-        result = _extract_regex(text, spec)
-        return _first_group_value(result)
 
-    # CSS 选择器
-    html = _stringify(data) if not isinstance(data, str) else data
-    return _extract_css_selector(html, spec)
+def extract_field(data: Any, extract_spec: str) -> str:
+    """根据 extract_spec 格式自动分派提取器（规则同 CompiledExtract）。"""
+    if not extract_spec:
+        return _stringify(data)
+    return CompiledExtract({"": extract_spec}).extract(data)[""]
 
 
 def extract_fields(data: Any, extract_spec: dict[str, str]) -> dict[str, str]:
-    """按 extract_spec 字典逐字段提取。"""
+    """按 extract_spec 字典提取全部字段；多字段共享一次解析。"""
     if not isinstance(extract_spec, dict):
         return {}
-    return {key: extract_field(data, pattern) for key, pattern in extract_spec.items()}
+    return CompiledExtract(extract_spec).extract(data)
 
 
 # ---------------------------------------------------------------------------
@@ -695,50 +861,121 @@ class OttRuleInterpreter:
             # MAX_TOTAL_ENTRIES 截断 → 同 URL 重复请求。归一到 1。
             page_step = 1
 
-        all_entries: list[dict] = []
-        page = page_start
+        prefetch, min_interval_ms = _parse_prefetch(pagination)
+        if prefetch is None or min_interval_ms is None:
+            log_warning(
+                f"[OttRuleInterpreter] 规则 {rule_id} 预取/限速参数非法，整条规则拒绝"
+            )
+            return []
+        placeholder = "{" + page_param + "}"
+        if method != "GET" or placeholder not in url_template:
+            # 预取只用于 URL 可预知的 GET 分页；POST 或无页参数的模板逐页串行
+            prefetch = 0
 
-        while (
-            len(all_entries) < MAX_TOTAL_ENTRIES
-            and page < page_start + effective_max_pages
-        ):
-            url = url_template.replace("{" + page_param + "}", str(page))
-            # 二次校验（分页后 URL 可能变化）
-            if not validate_url(url):
-                if _url_dns_failed(url):
+        all_entries: list[dict] = []
+        extractor = CompiledExtract(extract_spec)
+        pages = range(page_start, page_start + effective_max_pages, page_step)
+        urls = [url_template.replace(placeholder, str(page)) for page in pages]
+        gate = _RateGate(min_interval_ms / 1000.0)
+
+        with closing(
+            self._iter_pages(urls, method, headers, body, prefetch, gate)
+        ) as fetched:
+            for page, url, text in zip(pages, urls, fetched):
+                if text is _INVALID_URL:
+                    # 二次校验（分页后 URL 可能变化）
+                    if _url_dns_failed(url):
+                        return all_entries or None
+                    break
+                if text is None:
+                    # 已抓到部分条目 → 返回部分结果（源可用，只是后续页失败）；
+                    # 一条都没抓到 → None（源不可用，刷新统计计失败）。
                     return all_entries or None
-                break
 
-            text = self._fetch(url, method, headers, body)
-            if text is None:
-                # 已抓到部分条目 → 返回部分结果（源可用，只是后续页失败）；
-                # 一条都没抓到 → None（源不可用，刷新统计计失败）。
-                return all_entries or None
+                # 尝试 JSON 解析；失败则当 HTML/text 处理
+                items = self._parse_response(text)
 
-            # 尝试 JSON 解析；失败则当 HTML/text 处理
-            items = self._parse_response(text)
-
-            if not items:
-                break
+                if not items:
+                    break
 
-            for item in items:
+                # 整页一次提取：每条只解析一次，正则字段合并为一次 worker 往返
+                capacity = MAX_TOTAL_ENTRIES - len(all_entries)
+                for extracted in extractor.extract_many(items[:capacity]):
+                    if not extracted:
+                        continue
+                    entry = self._build_entry(
+                        extracted, rule, rule_id, page, url, authority
+                    )
+                    entry = apply_transforms_to_entry(entry, transforms, replace_map)
+                    all_entries.append(entry)
+                # 在取下一页之前判断，避免串行模式多发一次请求
                 if len(all_entries) >= MAX_TOTAL_ENTRIES:
                     break
-                extracted = extract_fields(item, extract_spec)
-                if not extracted:
-                    continue
-                entry = self._build_entry(
-                    extracted, rule, rule_id, page, url, authority
-                )
-                entry = apply_transforms_to_entry(entry, transforms, replace_map)
-                all_entries.append(entry)
-
-            page += page_step
 
         return all_entries
 
     # ---- 内部 ----
 
+    def _iter_pages(
+        self,
+        urls: list[str],
+        method: str,
+        headers: dict,
+        body: str | bytes | None,
+        prefetch: int,
+        gate: _RateGate,
+    ) -> Iterator[str | object | None]:
+        """按页序逐页产出响应文本：None = 抓取失败，_INVALID_URL = URL 校验失败。
+
+        prefetch > 0 时在消费当前页的同时提前抓取后续 prefetch 页；消费方
+        停止迭代（空页 / 条目上限 / 失败）时关闭生成器，未开始的抓取被取消，
+        已在途的请求结果直接丢弃。请求发起间隔统一经 gate 限速。
+        """
+        if prefetch <= 0:
+            for url in urls:
+                if not validate_url(url):
+                    yield _INVALID_URL
+                    return
+                gate.wait()
+                yield self._fetch(url, method, headers, body)
+            return
+
+        stop = threading.Event()
+
+        def fetch(url: str) -> str | None:
+            gate.wait()
+            if stop.is_set():
+                return None
+            return self._fetch(url, method, headers, body)
+
+        executor = ThreadPoolExecutor(
+            max_workers=prefetch, thread_name_prefix="ott-rule-prefetch"
+        )
+        window: deque[Future | object] = deque()
+        pending = iter(urls)
+        try:
+            while True:
+                # 窗口 = 当前页 + prefetch 页；校验失败的 URL 之后不再提交
+                while len(window) <= prefetch and (
+                    not window or window[-1] is not _INVALID_URL
+                ):
+                    url = next(pending, None)
+                    if url is None:
+                        break
+                    if validate_url(url):
+                        window.append(executor.submit(fetch, url))
+                    else:
+                        window.append(_INVALID_URL)
+                if not window:
+                    return
+                head = window.popleft()
+                yield head if head is _INVALID_URL else head.result()
+                if head is _INVALID_URL:
+                    return
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _pin_url(self, url: str, headers: dict) -> tuple[str | None, dict]:
         """DNS pin：HTTP 请求解析为 IP 直连并携带原 Host 头，防 DNS rebinding。
 
@@ -3,13 +3,14 @@
 脚本必须定义 fetch_entries() -> list[dict]，返回标准化 entry 列表。
 沙箱限制：
 - 仅允许白名单模块（httpx/json/Crypto/bs4 等）
-- 在独立 Python 子进程中执行（subprocess.run + 资源限制）
+- 在独立 Python 子进程中执行（冷启动子进程，或由预热 zygote fork + 资源限制）
 - 子进程资源限制：256MB 内存 / 30s CPU / 禁止 fork / 10MB 文件写入
 - AST 安全检查作为第一道关卡（拦截明显恶意，减少子进程启动开销）
 """
 
 from __future__ import annotations
 
+import atexit
 import hashlib
 import ipaddress
 import json
@@ -18,6 +19,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -34,6 +36,7 @@ from .ott_normalization import (
 )
 from .ott_rule_interpreter import CLIENT_API_LEVEL
 from .ott_script_safety import validate_script_source
+from .ott_script_zygote import ScriptZygotePool, ZygoteUnavailableError
 
 if TYPE_CHECKING:
     from ..ports.token_store import TokenStore
@@ -47,6 +50,7 @@ _CGNAT_NETWORK = ipaddress.ip_network("100.64.0.0/10")
 
 SCRIPT_MAX_BYTES = 256 * 1024  # 256 KB
 SCRIPT_EXEC_TIMEOUT_S = 30.0
+SCRIPT_DOWNLOAD_TIMEOUT_S = 10.0
 MAX_ENTRIES_PER_SCRIPT = 1000
 # 一次性管道（os.pipe）缓冲上限：写入值须一次写完且不被父进程阻塞
 PIPE_SECRET_MAX_BYTES = 64 * 1024
@@ -237,23 +241,22 @@ class ScriptCache:
         常超时，2026-08-13 实测）；脚本超限/非 raw URL 不触发兜底。
         """
         if self._router is not None:
-            last_error: BaseException | None = None
-            for candidate in self._router.ordered_candidates(url):
-                t0 = time.monotonic()
+            errors: list[BaseException] = []
+
+            def attempt(candidate: str, client: httpx.Client | None) -> str | None:
+                # 网络错误 → None（换下一候选）；超限异常原样抛出，中止全部候选
                 try:
-                    source = self._download_once(candidate, max_bytes)
-                    self._router.record(
-                        candidate, ok=True, latency=time.monotonic() - t0
-                    )
-                    return source
-                except _ScriptTooLargeError:
-                    raise
+                    return self._download_once(candidate, max_bytes, client)
                 except (httpx.HTTPError, httpx.InvalidURL, OSError) as e:
-                    last_error = e
-                    self._router.record(
-                        candidate, ok=False, latency=time.monotonic() - t0
-                    )
-            raise last_error or httpx.ConnectError("所有候选路径均失败")
+                    errors.append(e)
+                    return None
+
+            source = self._router.fetch_first(url, attempt)
+            if source is None:
+                raise (
+                    errors[-1] if errors else httpx.ConnectError("所有候选路径均失败")
+                )
+            return source
         try:
             return self._download_once(url, max_bytes)
         except _ScriptTooLargeError:
@@ -268,12 +271,17 @@ class ScriptCache:
                 return self._download_once(fallback, max_bytes)
             raise
 
-    def _download_once(self, url: str, max_bytes: int) -> str:
+    def _download_once(
+        self, url: str, max_bytes: int, client: httpx.Client | None = None
+    ) -> str:
         """单地址流式下载；iter_text() 返回 str，len() 是字符数而非 UTF-8 字节数，
-        非 ASCII 内容可能绕过上限，必须按编码后的字节数累计。"""
+        非 ASCII 内容可能绕过上限，必须按编码后的字节数累计。
+
+        client 为对冲尝试独占的 client，缺省用共享 client。"""
         chunks: list[str] = []
         total = 0
-        with self._client.stream("GET", url, timeout=10.0) as response:
+        http = client if client is not None else self._client
+        with http.stream("GET", url, timeout=SCRIPT_DOWNLOAD_TIMEOUT_S) as response:
             response.raise_for_status()
             for chunk in response.iter_text():
                 total += len(chunk.encode("utf-8"))
@@ -337,6 +345,10 @@ class ScriptSandbox:
     从 token store 取值，经一次性 os.pipe() + pass_fds 传给子进程 ——
     不走环境变量（/proc/<pid>/environ 不可见）、不写入沙箱文件系统
     （Landlock 白名单之外）；子进程读取一次后 fd 即关闭。
+
+    传入 ``zygote_pool`` 时，无凭据的脚本改由预热 zygote fork 子进程执行
+    （限制序列与冷启动相同，省去解释器启动、能力探测与模块预导入）；
+    凭据脚本、平台不支持 fork 或 zygote 启动失败时仍走冷启动。
     """
 
     def __init__(
@@ -344,10 +356,12 @@ class ScriptSandbox:
         allowed_modules: frozenset[str] = ALLOWED_MODULES,
         enabled: bool = True,
         token_store: TokenStore | None = None,
+        zygote_pool: ScriptZygotePool | None = None,
     ) -> None:
         self._allowed = allowed_modules
         self._enabled = enabled
         self._token_store = token_store
+        self._zygote_pool = zygote_pool
 
     def execute(
         self,
@@ -478,6 +492,28 @@ class ScriptSandbox:
         网络白名单：network_allowlist 经同一 stdin JSON 传给 runner，
         runner 在沙箱内 deny-by-default 强制。
         """
+        if not secrets and self._zygote_pool is not None:
+            try:
+                result = self._zygote_pool.run(
+                    script_path,
+                    {"network_allowlist": list(network_allowlist or [])},
+                    SCRIPT_EXEC_TIMEOUT_S,
+                )
+            except ZygoteUnavailableError as e:
+                log_warning(f"[ScriptSandbox] zygote 不可用，回退冷启动: {e}")
+            else:
+                if result is None:
+                    log_warning("[ScriptSandbox] zygote 执行中断")
+                    return None
+                if result.timed_out:
+                    log_warning(
+                        f"[ScriptSandbox] 脚本执行超时 ({SCRIPT_EXEC_TIMEOUT_S}s)"
+                    )
+                    return None
+                return self._parse_output(
+                    result.returncode, result.stdout, result.stderr, authority
+                )
+
         runner_path = Path(__file__).parent / "ott_script_runner.py"
         read_fds: list[int] = []
         created_fds: list[int] = []
@@ -551,8 +587,13 @@ class ScriptSandbox:
         except OSError as e:
             log_warning(f"[ScriptSandbox] 子进程通信失败: {e}")
             return None
+        return self._parse_output(proc.returncode, stdout, stderr, authority)
 
-        if proc.returncode != 0:
+    def _parse_output(
+        self, returncode: int, stdout: str, stderr: str, authority: str
+    ) -> list[dict] | None:
+        """校验子进程退出码与 stdout，解析为标准化 entry 列表。"""
+        if returncode != 0:
             # 只取 stderr 最后一行（异常摘要）打一条单行日志：完整 traceback
             # 属于远端脚本内部错误，整段落盘会放大到 WARNING 里像客户端
             # 崩溃，且 DNS 失败这类高频场景日志滚得极快。截断到 400 字符。
@@ -562,7 +603,7 @@ class ScriptSandbox:
             summary = lines[-1] if lines else f"stderr 空（{len(stderr or '')} 字节）"
             if len(summary) > 400:
                 summary = summary[:400] + "…"
-            log_warning(f"[ScriptSandbox] 脚本退出码 {proc.returncode}: {summary}")
+            log_warning(f"[ScriptSandbox] 脚本退出码 {returncode}: {summary}")
             return None
 
         # stdout 上限（防子进程输出撑爆主进程内存）；text=True 下 len() 是
@@ -632,6 +673,19 @@ class ScriptSandbox:
 
 # ── 便捷函数 ────────────────────────────────────────────────────────────
 
+_ZYGOTE_POOL: ScriptZygotePool | None = None
+_ZYGOTE_POOL_LOCK = threading.Lock()
+
+
+def shared_zygote_pool() -> ScriptZygotePool:
+    """进程级共享的 zygote 池（首次调用时创建，进程退出时关闭）。"""
+    global _ZYGOTE_POOL
+    with _ZYGOTE_POOL_LOCK:
+        if _ZYGOTE_POOL is None:
+            _ZYGOTE_POOL = ScriptZygotePool()
+            atexit.register(_ZYGOTE_POOL.close)
+        return _ZYGOTE_POOL
+
 
 def execute_script(
     source: str,
@@ -9,6 +9,7 @@
 
 用法：
     python ott_script_runner.py <script_path>
+    python ott_script_runner.py --zygote    # 常驻预热父进程，逐个 fork 执行
 
 退出码：
     0 — 成功，stdout 为 fetch_entries() 结果的 JSON
@@ -1070,6 +1071,188 @@ def run_script(
     return result
 
 
+def _prepare_sandbox_host() -> None:
+    """启动序列 1、2 步：能力探测 + 预导入（施加任何限制之前，可被 fork 复用）。"""
+    # 1) 沙箱能力探测：需 fork 子进程（RLIMIT_NPROC=0 前），结果缓存
+    landlock_available()
+    seccomp_available()
+    # 2) 预导入白名单模块：触发 C 扩展 .so 加载（Landlock 前）
+    _preload_allowed_modules()
+
+
+def _run_sandboxed(
+    script_path: str, secrets: dict[str, int], allowlist: list[str]
+) -> None:
+    """启动序列第 3 步：资源限制 → Landlock → seccomp → 执行，结果 JSON 写 stdout。
+
+    失败直接抛出，由调用方打印 traceback 并以退出码上报。
+    """
+    _set_resource_limits()
+    # httpx 及其 zlib/ssl 依赖必须在 Landlock 限制文件系统前加载，
+    # 否则系统 Python 从 /lib 读取 libz.so.1 / libssl 会被拒绝。
+    import httpx  # noqa: F401
+
+    _apply_landlock(os.path.dirname(os.path.abspath(script_path)))
+    _apply_seccomp()
+    entries = run_script(script_path, secrets or None, allowlist)
+    # 序列化结果到 stdout
+    json.dump(entries, sys.stdout, ensure_ascii=False, default=str)
+    sys.stdout.flush()
+
+
+# ── zygote 模式（预热父进程，每个脚本 fork 一个全新子进程）─────────────────
+# 父进程只做启动序列 1、2 步（探测 + 预导入），自身从不施加限制、从不执行
+# 脚本；每个请求 fork 出的子进程再走第 3 步，限制与冷启动完全相同。
+# 凭据脚本不经 zygote（ScriptSandbox 走冷启动 pass_fds），zygote 内存中
+# 从不出现凭据值。
+
+# 子进程输出上限：stdout 与 ott_script_client.STDOUT_MAX_BYTES 同值（多保留
+# 1 字节供父进程判定超限），stderr 只保留末尾（父进程只取最后一行做摘要）
+_ZYGOTE_STDOUT_MAX_BYTES = 10 * 1024 * 1024
+_ZYGOTE_STDERR_MAX_BYTES = 64 * 1024
+_ZYGOTE_DEFAULT_TIMEOUT_S = 30.0
+
+
+def _zygote_child(
+    script_path: str, allowlist: list[str], out_w: int, err_w: int
+) -> None:
+    """fork 出的子进程：接管 stdio 后执行脚本，绝不返回到 zygote 循环。"""
+    code = 1
+    try:
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(out_w, 1)
+        os.dup2(err_w, 2)
+        for fd in (devnull, out_w, err_w):
+            os.close(fd)
+        _run_sandboxed(script_path, {}, allowlist)
+        code = 0
+    except SystemExit as e:
+        # 与冷启动一致：None → 0，整数原样，其它值打印后记为 1
+        if e.code is None or isinstance(e.code, int):
+            code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:  # noqa: BLE001 - fork 子进程绝不能回到 zygote 循环
+        traceback.print_exc()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            with contextlib.suppress(Exception):
+                stream.flush()
+        os._exit(code)
+
+
+def _collect_child_output(
+    pid: int, out_r: int, err_r: int, timeout: float
+) -> tuple[bytes, bytes, bool]:
+    """读取子进程 stdout/stderr 直到 EOF；超时则 SIGKILL 子进程。"""
+    import selectors
+    import signal
+    import time
+
+    out = bytearray()
+    err = bytearray()
+    deadline = time.monotonic() + timeout
+    timed_out = False
+    with selectors.DefaultSelector() as sel:
+        sel.register(out_r, selectors.EVENT_READ, out)
+        sel.register(err_r, selectors.EVENT_READ, err)
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                with contextlib.suppress(OSError):
+                    os.kill(pid, signal.SIGKILL)
+                break
+            for key, _ in sel.select(remaining):
+                data = os.read(key.fd, 65536)
+                if not data:
+                    sel.unregister(key.fd)
+                    continue
+                buf = key.data
+                if buf is out:
+                    # 超限后继续排空管道（防子进程阻塞在写），但不再累积
+                    if len(out) <= _ZYGOTE_STDOUT_MAX_BYTES:
+                        out.extend(data[: _ZYGOTE_STDOUT_MAX_BYTES + 1 - len(out)])
+                else:
+                    err.extend(data)
+                    del err[:-_ZYGOTE_STDERR_MAX_BYTES]
+    return bytes(out), bytes(err), timed_out
+
+
+def _zygote_run(request: Any) -> dict:
+    """处理一条 zygote 请求：fork 子进程执行脚本并收集结果。"""
+    if not isinstance(request, dict):
+        return {"returncode": 1, "stdout": "", "stderr": "非法请求", "timed_out": False}
+    script_path = request.get("script")
+    if not isinstance(script_path, str) or not os.path.isfile(script_path):
+        return {
+            "returncode": 1,
+            "stdout": "",
+            "stderr": f"脚本不存在: {script_path}",
+            "timed_out": False,
+        }
+    timeout = request.get("timeout", _ZYGOTE_DEFAULT_TIMEOUT_S)
+    if not isinstance(timeout, (int, float)) or timeout <= 0:
+        timeout = _ZYGOTE_DEFAULT_TIMEOUT_S
+    # zygote 不接收凭据：secrets 一律忽略，只取网络白名单
+    _, allowlist = _parse_runner_config(json.dumps(request.get("config") or {}))
+
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(out_r)
+        os.close(err_r)
+        _zygote_child(script_path, allowlist, out_w, err_w)
+    os.close(out_w)
+    os.close(err_w)
+    try:
+        out, err, timed_out = _collect_child_output(pid, out_r, err_r, timeout)
+    finally:
+        os.close(out_r)
+        os.close(err_r)
+    _, status = os.waitpid(pid, 0)
+    return {
+        "returncode": os.waitstatus_to_exitcode(status),
+        "stdout": out.decode("utf-8", errors="replace"),
+        "stderr": err.decode("utf-8", errors="replace"),
+        "timed_out": timed_out,
+    }
+
+
+def serve_zygote() -> int:
+    """zygote 主循环：就绪后逐行读取请求 JSON，逐行写回结果 JSON。
+
+    请求：{"script": 路径, "config": {"network_allowlist": [...]}, "timeout": 秒}
+    结果：{"returncode", "stdout", "stderr", "timed_out"}；stdin EOF 即退出。
+    """
+    if not hasattr(os, "fork"):
+        return 1
+    # 探测/预导入失败直接抛出：进程以退出码 1 结束，宿主收不到就绪行即回退冷启动
+    _prepare_sandbox_host()
+    sys.stdout.write(json.dumps({"ready": True}) + "\n")
+    sys.stdout.flush()
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        try:
+            response = _zygote_run(request)
+        except OSError as e:
+            response = {
+                "returncode": 1,
+                "stdout": "",
+                "stderr": f"zygote fork 失败: {e}",
+                "timed_out": False,
+            }
+        sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
 def main(argv: list[str]) -> int:
     # Windows 下子进程 stdout/stderr 默认继承 locale 编码（cp1252），
     # ensure_ascii=False 输出中文 JSON 会 UnicodeEncodeError，强制 UTF-8。
@@ -1083,6 +1266,9 @@ def main(argv: list[str]) -> int:
         print("用法: python ott_script_runner.py <script_path>", file=sys.stderr)
         return 1
 
+    if argv[1] == "--zygote":
+        return serve_zygote()
+
     script_path = argv[1]
     if not os.path.isfile(script_path):
         print(f"脚本不存在: {script_path}", file=sys.stderr)
@@ -1095,23 +1281,8 @@ def main(argv: list[str]) -> int:
         secrets, allowlist = _parse_runner_config(sys.stdin.read())
 
     try:
-        # 1) 沙箱能力探测：需 fork 子进程（RLIMIT_NPROC=0 前），结果缓存
-        landlock_available()
-        seccomp_available()
-        # 2) 预导入白名单模块：触发 C 扩展 .so 加载（Landlock 前）
-        _preload_allowed_modules()
-        # 3) 资源限制 → Landlock → seccomp（顺序固定）
-        _set_resource_limits()
-        # httpx 及其 zlib/ssl 依赖必须在 Landlock 限制文件系统前加载，
-        # 否则系统 Python 从 /lib 读取 libz.so.1 / libssl 会被拒绝。
-        import httpx  # noqa: F401
-
-        _apply_landlock(os.path.dirname(os.path.abspath(script_path)))
-        _apply_seccomp()
-        entries = run_script(script_path, secrets or None, allowlist)
-        # 序列化结果到 stdout
-        json.dump(entries, sys.stdout, ensure_ascii=False, default=str)
-        sys.stdout.flush()
+        _prepare_sandbox_host()
+        _run_sandboxed(script_path, secrets, allowlist)
         return 0
     except Exception:
         traceback.print_exc(file=sys.stderr)
@@ -0,0 +1,208 @@
+"""ott-script 预热执行池（zygote）。
+
+冷启动路径每个脚本都要新起解释器，重复做沙箱能力探测（含探测子进程）与
+白名单模块预导入（httpx/bs4/Crypto…），这部分开销远大于一般脚本本身。
+zygote 是以 ``ott_script_runner.py --zygote`` 常驻的预热父进程：只完成探测
+与预导入、从不施加限制也从不执行脚本；每个脚本由它 fork 出全新子进程，
+在子进程内施加 rlimits → Landlock → seccomp 后执行，隔离强度与冷启动相同。
+
+凭据脚本不走 zygote（需 pass_fds 一次性管道，由 ScriptSandbox 冷启动），
+zygote 进程内存中从不出现凭据值。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# 冷启动（解释器 + 探测 + 预导入）不计入单个脚本的执行超时
+_STARTUP_TIMEOUT_S = 15.0
+# zygote 自身在超时后 SIGKILL 子进程并回报；宿主多等这一段再放弃整个 zygote
+_RESPONSE_GRACE_S = 5.0
+
+RUNNER_PATH = Path(__file__).with_name("ott_script_runner.py")
+
+
+class ZygoteUnavailableError(OSError):
+    """zygote 无法启动（平台不支持 fork 或进程启动失败），调用方回退冷启动。"""
+
+
+@dataclass(frozen=True)
+class ZygoteResult:
+    """一次脚本执行的结果（与冷启动 Popen.communicate 的产出对齐）。"""
+
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+
+
+class _Zygote:
+    """单个常驻 zygote 进程 + 后台读线程。"""
+
+    def __init__(self, argv: list[str], startup_timeout: float) -> None:
+        try:
+            self._proc = subprocess.Popen(
+                argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+                # 独立进程组：fork 出的脚本子进程与 zygote 同组，可整组回收
+                start_new_session=True,
+            )
+        except (OSError, ValueError) as e:
+            raise ZygoteUnavailableError(f"zygote 启动失败: {e}") from e
+        self._lines: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        threading.Thread(
+            target=self._pump, name="ott-script-zygote-reader", daemon=True
+        ).start()
+        ready = self.read_line(startup_timeout)
+        if ready is None or _decode(ready).get("ready") is not True:
+            self.kill()
+            raise ZygoteUnavailableError("zygote 未就绪")
+
+    def _pump(self) -> None:
+        try:
+            for line in self._proc.stdout:
+                self._lines.put(line)
+        except (OSError, ValueError):
+            pass
+        self._lines.put(None)
+
+    def send(self, payload: dict) -> bool:
+        try:
+            self._proc.stdin.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            self._proc.stdin.flush()
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def read_line(self, timeout: float) -> str | None:
+        try:
+            return self._lines.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def kill(self) -> None:
+        """SIGKILL 整个进程组：zygote 与其正在执行的脚本子进程一并结束。"""
+        try:
+            os.killpg(self._proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        try:
+            self._proc.wait(timeout=1.0)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        for stream in (self._proc.stdin, self._proc.stdout):
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+
+
+class ScriptZygotePool:
+    """zygote 常驻进程池。
+
+    每个 zygote 同一时刻只服务一个脚本；并发执行时池中无空闲 zygote 即新起
+    一个，用完归还，空闲 zygote 至多保留 max_idle 个。zygote 崩溃或回报超时
+    之外的异常时整个进程作废，下次重新启动。
+    """
+
+    def __init__(
+        self,
+        runner_path: str | Path = RUNNER_PATH,
+        max_idle: int = 2,
+        startup_timeout: float = _STARTUP_TIMEOUT_S,
+    ) -> None:
+        self._argv = [sys.executable, str(runner_path), "--zygote"]
+        self._max_idle = max_idle
+        self._startup_timeout = startup_timeout
+        self._idle: list[_Zygote] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def supported() -> bool:
+        return hasattr(os, "fork") and sys.platform != "win32"
+
+    def run(
+        self, script_path: str | Path, config: dict[str, Any], timeout: float
+    ) -> ZygoteResult | None:
+        """执行一个脚本；zygote 中途失效返回 None。
+
+        Raises:
+            ZygoteUnavailableError: 无法获得可用 zygote（调用方回退冷启动）。
+        """
+        zygote = self._acquire()
+        request = {"script": str(script_path), "config": config, "timeout": timeout}
+        if not zygote.send(request):
+            zygote.kill()
+            return None
+        line = zygote.read_line(timeout + _RESPONSE_GRACE_S)
+        if line is None:
+            zygote.kill()
+            return ZygoteResult(returncode=-9, stdout="", stderr="", timed_out=True)
+        response = _decode(line)
+        returncode = response.get("returncode")
+        if not isinstance(returncode, int):
+            zygote.kill()
+            return None
+        self._release(zygote)
+        return ZygoteResult(
+            returncode=returncode,
+            stdout=str(response.get("stdout") or ""),
+            stderr=str(response.get("stderr") or ""),
+            timed_out=bool(response.get("timed_out")),
+        )
+
+    def warm(self) -> None:
+        """预先启动一个 zygote 放入空闲池（可在后台线程调用）。"""
+        self._release(self._acquire())
+
+    def close(self) -> None:
+        """杀掉全部空闲 zygote；之后的调用改为每次临时启动、用完即杀。"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for zygote in idle:
+            zygote.kill()
+
+    def _acquire(self) -> _Zygote:
+        if not self.supported():
+            raise ZygoteUnavailableError("当前平台不支持 fork")
+        with self._lock:
+            while self._idle:
+                zygote = self._idle.pop()
+                if zygote.alive():
+                    return zygote
+                zygote.kill()
+        return _Zygote(self._argv, self._startup_timeout)
+
+    def _release(self, zygote: _Zygote) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self._max_idle:
+                self._idle.append(zygote)
+                return
+        zygote.kill()
+
+
+def _decode(line: str) -> dict:
+    try:
+        result: Any = json.loads(line)
+    except (json.JSONDecodeError, ValueError):
+        return {}
+    return result if isinstance(result, dict) else {}
@@ -1,10 +1,45 @@
 from __future__ import annotations
 
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
 from typing import Protocol
 
 from ..utils.logger import log_warning
 from .ott_client import DEFAULT_STATIC_SEGMENT_SIZE
 
+# 分段 LRU 的默认内存上限（按 str 对象实际占用计）
+DEFAULT_CACHE_BYTES = 4 * 1024 * 1024
+_PREFETCH_WORKERS = 2
+
+_prefetch_executor: ThreadPoolExecutor | None = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _shared_prefetch_executor() -> Executor:
+    """进程级共享的预取线程池（懒创建；所有 OTT 分片会话共用）。"""
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=_PREFETCH_WORKERS,
+                thread_name_prefix="ott-segment-prefetch",
+            )
+        return _prefetch_executor
+
+
+def shutdown_prefetch_executor() -> None:
+    """关闭共享预取线程池：未开始的预取直接取消（应用退出时调用）。
+
+    关闭后线程池不再重建，后续预取请求被静默放弃，前台读取照常同步拉取。
+    """
+    with _prefetch_executor_lock:
+        executor = _prefetch_executor
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
 
 class _SegmentSource(Protocol):
     """按 entry/revision 获取服务端分段的只读接口。
@@ -24,7 +59,13 @@ class _SegmentSource(Protocol):
 
 
 class OttSegmentProvider:
-    """TextSegmentProvider backed by OTT Core v1 server-defined segments."""
+    """TextSegmentProvider backed by OTT Core v1 server-defined segments.
+
+    服务端分段缓存在按字节限额的 LRU 中（超出 max_cache_bytes 淘汰最久未用
+    的分段）。每次 get_segment 成功后，在后台预取下一片与上一片同样长度的
+    窗口所覆盖的服务端分段，翻片时直接命中缓存而不阻塞在网络上；前台读到
+    正在预取的分段时等待该次预取，不重复请求。prefetch=False 关闭预取。
+    """
 
     def __init__(
         self,
@@ -33,13 +74,26 @@ class OttSegmentProvider:
         revision_id: str,
         total_chars: int,
         source_segment_size: int = DEFAULT_STATIC_SEGMENT_SIZE,
+        max_cache_bytes: int = DEFAULT_CACHE_BYTES,
+        prefetch: bool = True,
+        prefetch_executor: Executor | None = None,
     ) -> None:
         self._registry_provider = registry_provider
         self._entry_id = entry_id
         self._revision_id = revision_id
         self._total_chars = max(0, total_chars)
         self._source_segment_size = max(1, source_segment_size)
-        self._cache: dict[int, dict] = {}
+        self._max_cache_bytes = max(0, max_cache_bytes)
+        self._prefetch = prefetch
+        self._executor = prefetch_executor
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[int, dict] = OrderedDict()
+        self._cache_sizes: dict[int, int] = {}
+        self._cache_bytes = 0
+        self._inflight: dict[int, Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._prefetches = 0
 
     def get_total_chars(self) -> int:
         return self._total_chars
@@ -56,12 +110,67 @@ class OttSegmentProvider:
         ]
         combined = "".join(parts)
         offset = start - (first - 1) * self._source_segment_size
+        if self._prefetch:
+            # 下一片（顺序打字）优先，其次上一片（回看）
+            self._schedule_prefetch(end, length)
+            self._schedule_prefetch(start - length, length)
         return combined[offset : offset + (end - start)]
 
+    def get_chars(self, indices: Sequence[int]) -> str:
+        """按下标取字符：同一服务端分段只取一次（不触发预取，乱序读取无顺序可言）。"""
+        size = self._source_segment_size
+        contents: dict[int, str] = {}
+        out: list[str] = []
+        for i in indices:
+            if not 0 <= i < self._total_chars:
+                continue
+            index = i // size + 1
+            content = contents.get(index)
+            if content is None:
+                content = str(self._server_segment(index).get("content", ""))
+                contents[index] = content
+            offset = i - (index - 1) * size
+            if offset < len(content):
+                out.append(content[offset])
+        return "".join(out)
+
+    def cache_stats(self) -> dict[str, int]:
+        """缓存计数：hits 含等到进行中预取的读取，misses 为前台同步拉取。"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "prefetches": self._prefetches,
+                "cached_segments": len(self._cache),
+                "cached_bytes": self._cache_bytes,
+            }
+
     def _server_segment(self, index: int) -> dict:
-        cached = self._cache.get(index)
-        if cached is not None:
-            return cached
+        with self._lock:
+            cached = self._cache.get(index)
+            if cached is not None:
+                self._cache.move_to_end(index)
+                self._hits += 1
+                return cached
+            pending = self._inflight.get(index)
+            if pending is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+        segment = None
+        if pending is not None:
+            # 预取失败或被取消（失败已由 _finish_prefetch 记录）：按未命中处理
+            wait((pending,))
+            if not pending.cancelled() and pending.exception() is None:
+                segment = pending.result()
+        if segment is None:
+            # 无预取或预取失败：前台同步拉取
+            segment = self._fetch(index)
+        if segment is None:
+            raise RuntimeError(f"无法获取 OTT 分段: {index}")
+        return segment
+
+    def _fetch(self, index: int) -> dict | None:
         segment = self._registry_provider.fetch_ott_segment(
             self._entry_id,
             self._revision_id,
@@ -69,7 +178,7 @@ class OttSegmentProvider:
             self._source_segment_size,
         )
         if segment is None:
-            raise RuntimeError(f"无法获取 OTT 分段: {index}")
+            return None
         content = str(segment.get("content", "") or "")
         # 服务端分段短于期望大小：提示但按短读继续（不抛错，避免整段不可读）
         if content and len(content) < self._source_segment_size:
@@ -78,5 +187,65 @@ class OttSegmentProvider:
                 f"entry={self._entry_id} index={index} "
                 f"got={len(content)} < {self._source_segment_size}"
             )
-        self._cache[index] = segment
+        self._store(index, segment, sys.getsizeof(content))
         return segment
+
+    def _store(self, index: int, segment: dict, size: int) -> None:
+        with self._lock:
+            if index in self._cache:
+                self._cache_bytes -= self._cache_sizes[index]
+            self._cache[index] = segment
+            self._cache.move_to_end(index)
+            self._cache_sizes[index] = size
+            self._cache_bytes += size
+            # 至少保留刚写入的一段：单段超限时也能完成本次读取
+            while self._cache_bytes > self._max_cache_bytes and len(self._cache) > 1:
+                evicted, _ = self._cache.popitem(last=False)
+                self._cache_bytes -= self._cache_sizes.pop(evicted)
+
+    def _schedule_prefetch(self, start: int, length: int) -> None:
+        end = min(self._total_chars, start + length)
+        start = max(0, start)
+        if start >= end:
+            return
+        first = start // self._source_segment_size + 1
+        last = (end - 1) // self._source_segment_size + 1
+        with self._lock:
+            indices = [
+                index
+                for index in range(first, last + 1)
+                if index not in self._cache and index not in self._inflight
+            ]
+        if not indices:
+            return
+        # 提交在锁外进行：执行器可能同步执行任务（如测试用的内联执行器），
+        # 而任务本身要取 _lock
+        executor = self._executor or _shared_prefetch_executor()
+        submitted: list[tuple[int, Future]] = []
+        for index in indices:
+            try:
+                submitted.append((index, executor.submit(self._fetch, index)))
+            except RuntimeError:
+                # 线程池已关闭（进程退出中）：放弃剩余预取
+                break
+        with self._lock:
+            for index, future in submitted:
+                # 并发调度时另一线程可能已登记同一分段：保留先登记的
+                self._inflight.setdefault(index, future)
+                self._prefetches += 1
+        for index, future in submitted:
+            # 已完成的 future 会立即回调，登记项随之移除
+            future.add_done_callback(lambda f, i=index: self._finish_prefetch(i, f))
+
+    def _finish_prefetch(self, index: int, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(index) is future:
+                del self._inflight[index]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            log_warning(
+                f"[OttSegmentProvider] 预取分段失败: "
+                f"entry={self._entry_id} index={index} — {error}"
+            )
@@ -1,11 +1,13 @@
 """OTT Repo L1 正则子进程执行器。
 
 正则匹配从宿主进程移出，防止恶意规则 (a+)+ 类灾难性回溯拖死主进程。
-调用方负责 1s 硬超时（subprocess.run timeout）；本 worker 只依赖 stdlib，
-保证子进程启动开销最小。
+调用方负责 1s 硬超时（RegexWorkerPool 逐条计时，超时杀进程重启）；本 worker
+只依赖 stdlib，保证子进程启动开销最小。
 
 协议（stdin → stdout，均为 JSON）：
-- 输入: {"pattern": str, "text": str}
+- 单次模式：stdin 读一个请求，stdout 写一个结果后退出
+- 常驻模式（--serve）：每行一个请求、每行一个结果，首行输出 {"ok": true, "ready": true}
+- 输入: {"pattern": str, "text": str, "op": "search"|"replace", "repl": str}
 - 输出: {"ok": true, "groups": {name: value}} 或 {"ok": true, "content": str}
         或 {"ok": false, "error": str}
 """
@@ -147,20 +149,48 @@ def _run(pattern: str, text: str, op: str = "search", repl: str = "") -> dict:
         return {"ok": True, "groups": {}}
 
 
+def _handle(payload: Any) -> dict:
+    """校验单条请求并执行；协议错误统一 bad_input。"""
+    if not isinstance(payload, dict):
+        return {"ok": False, "error": "bad_input"}
+    pattern = payload.get("pattern", "")
+    text = payload.get("text", "")
+    op = payload.get("op", "search")
+    repl = payload.get("repl", "")
+    if not isinstance(pattern, str) or not isinstance(text, str):
+        return {"ok": False, "error": "bad_input"}
+    if op not in ("search", "replace") or not isinstance(repl, str):
+        return {"ok": False, "error": "bad_input"}
+    return _run(pattern, text, op, repl)
+
+
+def serve() -> int:
+    """常驻模式：启动后先输出就绪行，之后每读入一行请求 JSON 输出一行结果。
+
+    由宿主进程的 RegexWorkerPool 持有；请求可流水线批量写入，结果按序逐行
+    返回，宿主据此对每条请求单独计时，超时即杀掉并重启本进程。
+    """
+    # -I 下 PYTHONIOENCODING 不生效，管道编码随系统 locale（Windows 为 cp936 等）：
+    # 显式固定 UTF-8，与宿主的管道编码一致
+    sys.stdin.reconfigure(encoding="utf-8")
+    sys.stdout.reconfigure(encoding="utf-8")
+    print(json.dumps({"ok": True, "ready": True}), flush=True)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            result = _handle(json.loads(line))
+        except (json.JSONDecodeError, ValueError):
+            result = {"ok": False, "error": "bad_input"}
+        print(json.dumps(result), flush=True)
+    return 0
+
+
 def main() -> int:
+    if "--serve" in sys.argv[1:]:
+        return serve()
     try:
-        payload = json.loads(sys.stdin.read() or "{}")
-        pattern = payload.get("pattern", "")
-        text = payload.get("text", "")
-        op = payload.get("op", "search")
-        repl = payload.get("repl", "")
-        if not isinstance(pattern, str) or not isinstance(text, str):
-            print(json.dumps({"ok": False, "error": "bad_input"}))
-            return 0
-        if op not in ("search", "replace") or not isinstance(repl, str):
-            print(json.dumps({"ok": False, "error": "bad_input"}))
-            return 0
-        result = _run(pattern, text, op, repl)
+        result = _handle(json.loads(sys.stdin.read() or "{}"))
     except (json.JSONDecodeError, ValueError, OSError):
         result = {"ok": False, "error": "bad_input"}
     print(json.dumps(result))
@@ -0,0 +1,175 @@
+"""OTT 正则子进程常驻池。
+
+regex_worker 以 --serve 常驻，经管道逐行收发 JSON；宿主对每条请求单独计时，
+超时即杀掉该进程并对剩余请求换新进程继续。ReDoS 防护强度与“一次匹配一个
+子进程”相同（正则始终不在宿主进程执行、单条 1s 硬超时），但省去每次匹配的
+解释器冷启动。
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+# 冷启动（解释器 + re 模块）不计入单条正则的 1s 预算
+_STARTUP_TIMEOUT_S = 5.0
+
+
+class _RegexWorker:
+    """单个常驻 worker 进程 + 后台读线程（管道读取可带超时，跨平台）。"""
+
+    def __init__(self, argv: list[str], startup_timeout: float) -> None:
+        self._proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self._lines: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        threading.Thread(
+            target=self._pump, name="regex-worker-reader", daemon=True
+        ).start()
+        if self.read_line(startup_timeout) is None:
+            self.kill()
+            raise OSError("regex worker failed to start")
+
+    def _pump(self) -> None:
+        try:
+            for line in self._proc.stdout:
+                self._lines.put(line)
+        except (OSError, ValueError):
+            pass
+        self._lines.put(None)
+
+    def send(self, payloads: list[dict]) -> None:
+        """写入请求。多条请求由后台线程写：worker 卡在前一条上时不再读 stdin，
+        同步写满管道缓冲会让宿主阻塞在写上、永远等不到逐条超时。"""
+        # ASCII JSON：不依赖 worker 端管道编码
+        data = "".join(json.dumps(p) + "\n" for p in payloads)
+        if len(payloads) == 1:
+            self._write(data)
+            return
+        threading.Thread(
+            target=self._write, args=(data,), name="regex-worker-writer", daemon=True
+        ).start()
+
+    def _write(self, data: str) -> None:
+        try:
+            self._proc.stdin.write(data)
+            self._proc.stdin.flush()
+        except (OSError, ValueError):
+            # 进程已被杀/退出：读端随之得到 None
+            pass
+
+    def read_line(self, timeout: float) -> str | None:
+        """读一行结果；超时或进程退出返回 None。"""
+        try:
+            return self._lines.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def kill(self) -> None:
+        try:
+            self._proc.kill()
+            self._proc.wait(timeout=1.0)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        for stream in (self._proc.stdin, self._proc.stdout):
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+
+
+class RegexWorkerPool:
+    """regex_worker 常驻进程池。
+
+    run_batch 把一批请求一次写入同一 worker，按序逐条读取结果，每条结果
+    的等待上限为 timeout 秒；某条超时或 worker 崩溃时杀掉该进程，该条记
+    None，其余请求换新 worker 重发。空闲 worker 至多保留 max_idle 个。
+    """
+
+    def __init__(
+        self,
+        worker_path: str | Path,
+        timeout: float,
+        max_idle: int = 2,
+        startup_timeout: float = _STARTUP_TIMEOUT_S,
+    ) -> None:
+        # -I 隔离模式：忽略 PYTHON* 环境变量与用户 site-packages，cwd 不入 sys.path
+        self._argv = [sys.executable, "-I", str(worker_path), "--serve"]
+        self._timeout = timeout
+        self._max_idle = max_idle
+        self._startup_timeout = startup_timeout
+        self._idle: list[_RegexWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def run(self, payload: dict) -> dict | None:
+        return self.run_batch([payload])[0]
+
+    def run_batch(self, payloads: list[dict]) -> list[dict | None]:
+        """执行一批请求，按输入顺序返回结果；失败/超时的条目为 None。"""
+        results: list[dict | None] = [None] * len(payloads)
+        i = 0
+        while i < len(payloads):
+            try:
+                worker = self._acquire()
+            except OSError:
+                return results
+            worker.send(payloads[i:])
+            while i < len(payloads):
+                line = worker.read_line(self._timeout)
+                if line is None:
+                    # 超时或崩溃：该条作废，剩余请求交给新 worker
+                    worker.kill()
+                    i += 1
+                    break
+                results[i] = _decode(line)
+                i += 1
+            else:
+                self._release(worker)
+        return results
+
+    def close(self) -> None:
+        """杀掉全部空闲 worker；之后的调用改为每批临时启动、用完即杀。"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+    def _acquire(self) -> _RegexWorker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+                worker.kill()
+        return _RegexWorker(self._argv, self._startup_timeout)
+
+    def _release(self, worker: _RegexWorker) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self._max_idle:
+                self._idle.append(worker)
+                return
+        worker.kill()
+
+
+def _decode(line: str) -> dict | None:
+    try:
+        result: Any = json.loads(line)
+    except (json.JSONDecodeError, ValueError):
+        return None
+    return result if isinstance(result, dict) else None
@@ -18,19 +18,25 @@ failover——主地址失败才依次尝试 jsDelivr / mirrors，且每个候
   探测共用同一统计表
 - 排序：已知成功按延迟升序 → 未知按派生顺序 → 冷却/失败最后。调用方按序
   尝试、第一个成功即止，排序只优化顺序，不改变容错语义
+- 对冲请求（fetch_first，`ott.route_hedging`）：最优候选超过对冲延迟
+  （EWMA + 2×平均偏差，约为该 host 延迟分布的高分位）仍未返回，即并行
+  启动下一个候选，取最先成功的结果；慢候选不再独占整个超时
 
 线程安全：统计表加锁；探测用独立短生命周期 httpx.Client 并发（共享 client
 跨线程并发不安全，见 AGENTS.md「联邦载文同步镜像本地链路」）；真实请求由
-调用方在自身线程串行执行，路由层只读统计。
+fetch_first 在调用方线程串行执行（fetch 收到 client=None，沿用调用方自己的
+client）。对冲模式下各次尝试在选路器常驻的有界线程池中并发执行，每次尝试
+同样使用独立短生命周期 client；胜出后关闭落选者的 client，使其在下一次
+网络读写时中止（已阻塞的读取至多等到该 client 的超时）。
 """
 
 from __future__ import annotations
 
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, TypeVar
 from urllib.parse import urlparse
 
 import httpx
@@ -47,6 +53,19 @@ _COOLDOWN_BASE_S = 30.0
 _EWMA_ALPHA = 0.3  # 新观测权重（越小越平滑）
 _DEFAULT_PROBE_TIMEOUT_S = 2.0
 _DEFAULT_PROBE_WORKERS = 4
+_DEV_BETA = 0.25  # 延迟平均偏差的新观测权重（同 TCP RTTVAR）
+# 对冲：延迟 = EWMA + K×平均偏差，夹在 [MIN, MAX]；无统计时用 DEFAULT
+_HEDGE_DEV_K = 2.0
+_HEDGE_MIN_DELAY_S = 0.05
+_HEDGE_MAX_DELAY_S = 3.0
+_HEDGE_DEFAULT_DELAY_S = 1.0
+_HEDGE_MAX_INFLIGHT = 3
+# 对冲线程池常驻且有界，供并发的 fetch_first 调用共享
+_HEDGE_POOL_WORKERS = 6
+# 对冲尝试的短生命周期 client 超时（与共享 OTT client 一致）
+_HEDGE_ATTEMPT_TIMEOUT_S = 10.0
+
+_T = TypeVar("_T")
 
 
 def _host_of(url: str) -> str:
@@ -62,6 +81,7 @@ class _HostStat:
     """单个 host 的连通性统计（延迟 EWMA + 失败冷却）。"""
 
     latency_ewma: float | None = None
+    latency_dev: float = 0.0
     consecutive_failures: int = 0
     last_probe: float = 0.0
     cooldown_until: float = 0.0
@@ -69,16 +89,18 @@ class _HostStat:
     last_error: str = field(default="")
 
 
+def _new_attempt_client() -> httpx.Client:
+    return httpx.Client(
+        timeout=_HEDGE_ATTEMPT_TIMEOUT_S, trust_env=False, follow_redirects=False
+    )
+
+
 class SmartRouteSelector:
     """候选路径选路器（integration 层，无 UI/状态依赖）。
 
     用法：
         router = SmartRouteSelector(config)
-        for url in router.ordered_candidates(primary, mirrors=[mirror_url]):
-            data = fetch(url)
-            router.record(url, ok=data is not None, latency=elapsed)
-            if data is not None:
-                break
+        data = router.fetch_first(primary, fetch, mirrors=[mirror_url])
     """
 
     def __init__(
@@ -87,6 +109,7 @@ class SmartRouteSelector:
         probe_timeout: float = _DEFAULT_PROBE_TIMEOUT_S,
         probe_workers: int = _DEFAULT_PROBE_WORKERS,
         clock: Callable[[], float] = time.monotonic,
+        attempt_client_factory: Callable[[], httpx.Client] | None = None,
     ) -> None:
         if config is None:
             from ..config.runtime_config import OttConfig
@@ -98,11 +121,14 @@ class SmartRouteSelector:
             if m and str(m).startswith(("http://", "https://"))
         ]
         self._probe_ttl = max(1.0, float(config.route_probe_ttl_seconds))
+        self._hedging = bool(config.route_hedging)
         self._probe_timeout = max(0.2, float(probe_timeout))
         self._probe_workers = max(1, int(probe_workers))
         self._clock = clock
+        self._attempt_client_factory = attempt_client_factory or _new_attempt_client
         self._lock = threading.Lock()
         self._stats: dict[str, _HostStat] = {}
+        self._hedge_pool: ThreadPoolExecutor | None = None
 
     # ------------------------------------------------------------------
     # 公共接口
@@ -142,11 +168,16 @@ class SmartRouteSelector:
         with self._lock:
             stat = self._stats.setdefault(host, _HostStat())
             if ok:
-                stat.latency_ewma = (
-                    latency
-                    if stat.latency_ewma is None
-                    else (1 - _EWMA_ALPHA) * stat.latency_ewma + _EWMA_ALPHA * latency
-                )
+                if stat.latency_ewma is None:
+                    stat.latency_ewma = latency
+                    stat.latency_dev = latency / 2
+                else:
+                    stat.latency_dev = (1 - _DEV_BETA) * stat.latency_dev + (
+                        _DEV_BETA * abs(latency - stat.latency_ewma)
+                    )
+                    stat.latency_ewma = (
+                        1 - _EWMA_ALPHA
+                    ) * stat.latency_ewma + _EWMA_ALPHA * latency
                 stat.consecutive_failures = 0
                 stat.cooldown_until = 0.0
                 stat.last_success = self._clock()
@@ -156,6 +187,143 @@ class SmartRouteSelector:
                     stat.consecutive_failures
                 )
 
+    def fetch_first(
+        self,
+        url: str,
+        fetch: Callable[[str, httpx.Client | None], _T | None],
+        mirrors: list[str] | None = None,
+    ) -> _T | None:
+        """按选路顺序拉取，返回第一个成功结果；全部失败返回 None。
+
+        fetch(candidate, client)：client 为 None 时用调用方自己的 client，
+        否则必须用传入的这个（对冲尝试各自独占，尝试结束即关闭）。
+        fetch 返回 None 视为该候选失败；fetch 抛出的异常视为不可重试错误
+        （如响应体超限，与线路无关、不回写统计），中止其余候选并原样抛出。
+        其余每次尝试都回写 record。
+        对冲模式下最优候选超过 hedge_delay 未返回即并行启动下一个（至多
+        _HEDGE_MAX_INFLIGHT 个在途），候选失败则立即补位；返回前取消未开始
+        的尝试、关闭在途落选者的 client 使其尽快中止，中断导致的失败不回写。
+        """
+        candidates = self.ordered_candidates(url, mirrors=mirrors)
+        if not self._hedging or len(candidates) <= 1:
+            for candidate in candidates:
+                t0 = time.monotonic()
+                result = fetch(candidate, None)
+                self.record(
+                    candidate, ok=result is not None, latency=time.monotonic() - t0
+                )
+                if result is not None:
+                    return result
+            return None
+        return self._fetch_hedged(candidates, fetch)
+
+    def hedge_delay(self, url: str) -> float:
+        """候选的对冲延迟：超过即并行启动下一候选。"""
+        with self._lock:
+            stat = self._stats.get(_host_of(url))
+            if stat is None or stat.latency_ewma is None:
+                return _HEDGE_DEFAULT_DELAY_S
+            delay = stat.latency_ewma + _HEDGE_DEV_K * stat.latency_dev
+        return min(_HEDGE_MAX_DELAY_S, max(_HEDGE_MIN_DELAY_S, delay))
+
+    # ------------------------------------------------------------------
+    # 对冲请求
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """关闭对冲线程池（未开始的尝试直接取消）；之后的对冲按需重建。"""
+        with self._lock:
+            pool, self._hedge_pool = self._hedge_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_hedged(
+        self,
+        candidates: list[str],
+        fetch: Callable[[str, httpx.Client | None], _T | None],
+    ) -> _T | None:
+        executor = self._ensure_hedge_pool()
+        pending: dict[Future, tuple[str, float, httpx.Client]] = {}
+        next_index = 0
+
+        def launch() -> None:
+            nonlocal next_index
+            candidate = candidates[next_index]
+            next_index += 1
+            client = self._attempt_client_factory()
+            future = executor.submit(self._run_attempt, fetch, candidate, client)
+            pending[future] = (candidate, time.monotonic(), client)
+
+        try:
+            launch()
+            while pending:
+                can_hedge = (
+                    next_index < len(candidates) and len(pending) < _HEDGE_MAX_INFLIGHT
+                )
+                timeout = (
+                    self.hedge_delay(candidates[next_index - 1]) if can_hedge else None
+                )
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    log_info(
+                        f"[SmartRouter] 对冲: {redact_url(candidates[next_index - 1])} "
+                        f"{timeout:.2f}s 未响应，并行尝试 "
+                        f"{redact_url(candidates[next_index])}"
+                    )
+                    launch()
+                    continue
+                for future in done:
+                    candidate, t0, _ = pending.pop(future)
+                    self._record_attempt(candidate, t0, future)
+                    result = future.result()
+                    if result is not None:
+                        return result
+                if next_index < len(candidates) and len(pending) < _HEDGE_MAX_INFLIGHT:
+                    launch()  # 快速失败：立即补位，不等对冲延迟
+            return None
+        finally:
+            # 落选者：未开始的取消；在途的关闭其 client 中断请求，
+            # 中断前已成功的照常回写，中断引起的失败不计入统计
+            for future, (candidate, t0, client) in pending.items():
+                if future.cancel():
+                    client.close()
+                    continue
+                future.add_done_callback(
+                    lambda f, c=candidate, t=t0: self._record_attempt(
+                        c, t, f, success_only=True
+                    )
+                )
+                client.close()
+
+    def _ensure_hedge_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=_HEDGE_POOL_WORKERS,
+                    thread_name_prefix="smart-router-hedge",
+                )
+            return self._hedge_pool
+
+    @staticmethod
+    def _run_attempt(
+        fetch: Callable[[str, httpx.Client | None], _T | None],
+        candidate: str,
+        client: httpx.Client,
+    ) -> _T | None:
+        try:
+            return fetch(candidate, client)
+        finally:
+            client.close()
+
+    def _record_attempt(
+        self, url: str, t0: float, future: Future, success_only: bool = False
+    ) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        ok = future.result() is not None
+        if ok or not success_only:
+            self.record(url, ok=ok, latency=time.monotonic() - t0)
+
     # ------------------------------------------------------------------
     # 候选派生（纯动态，不硬编码）
     # ------------------------------------------------------------------
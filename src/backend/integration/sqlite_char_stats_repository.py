@@ -1,12 +1,41 @@
 import sqlite3
+import threading
 from datetime import datetime
 from pathlib import Path
 
 from ..models.entity.char_stat import CharStat
 
+# 每个连接的语句缓存容量：固定 SQL 文本在 sqlite3 模块内按字符串复用预编译语句
+_STATEMENT_CACHE_SIZE = 64
+# IN (...) 查询单批参数上限，低于旧版 SQLite 的 999 个绑定变量限制
+_BATCH_CHUNK_SIZE = 500
+# 写锁竞争时的等待上限（毫秒），避免后台 flush 与 UI 线程读撞上 SQLITE_BUSY
+_BUSY_TIMEOUT_MS = 5000
+
+_SELECT_COLUMNS = (
+    "SELECT char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen "
+)
+_GET_SQL = _SELECT_COLUMNS + "FROM char_stats WHERE char = ?"
+_GET_ALL_SQL = _SELECT_COLUMNS + "FROM char_stats"
+_GET_ALL_DIRTY_SQL = _SELECT_COLUMNS + "FROM char_stats WHERE is_dirty = 1"
+_UPSERT_SQL = (
+    "INSERT INTO char_stats (char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen, last_synced_at, is_dirty) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, NULL, 1) "
+    "ON CONFLICT(char) DO UPDATE SET "
+    "char_count = ?, error_char_count = ?, total_ms = ?, "
+    "min_ms = ?, max_ms = ?, last_seen = ?, is_dirty = 1"
+)
+
 
 class SqliteCharStatsRepository:
-    """基于 SQLite 的字符统计持久化实现。"""
+    """基于 SQLite 的字符统计持久化实现。
+
+    连接管理：全部线程共享一条长连接，首次使用时打开并设置
+    WAL + synchronous=NORMAL，之后所有调用复用它及其预编译语句缓存。
+    读写都经同一把进程内锁串行化（单次查询/批量 upsert 都很短），
+    AsyncExecutor 线程池的线程回收与重建不会再多开连接；close() 同样
+    持锁，会等正在进行的读取与后台写入结束后再关闭。
+    """
 
     CREATE_TABLE_SQL = """
     CREATE TABLE IF NOT EXISTS char_stats (
@@ -24,32 +53,64 @@ class SqliteCharStatsRepository:
 
     def __init__(self, db_path: str):
         self._db_path = db_path
+        self._conn: sqlite3.Connection | None = None
+        # 可重入：_connection() 在持锁的读写方法内部调用
+        self._lock = threading.RLock()
 
     def init_db(self) -> None:
         Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute(self.CREATE_TABLE_SQL)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(self.CREATE_TABLE_SQL)
+
+    def close(self) -> None:
+        """等进行中的读写结束后关闭共享连接；之后的调用会按需重新建连。"""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is not None:
+                return self._conn
+            # 连接在线程间共享，访问由 _lock 串行化
+            conn = sqlite3.connect(
+                self._db_path,
+                check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+            )
+            conn.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn = conn
+            return conn
 
     def get(self, char: str) -> CharStat | None:
-        with sqlite3.connect(self._db_path) as conn:
-            row = conn.execute(
-                "SELECT char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen "
-                "FROM char_stats WHERE char = ?",
-                (char,),
-            ).fetchone()
+        with self._lock:
+            row = self._connection().execute(_GET_SQL, (char,)).fetchone()
         return self._row_to_stat(row) if row else None
 
     def get_batch(self, chars: list[str]) -> list[CharStat]:
         if not chars:
             return []
-        placeholders = ",".join("?" for _ in chars)
-        with sqlite3.connect(self._db_path) as conn:
-            rows = conn.execute(
-                "SELECT char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen "
-                f"FROM char_stats WHERE char IN ({placeholders})",
-                chars,
-            ).fetchall()
-        return [self._row_to_stat(row) for row in rows]
+        result: list[CharStat] = []
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(chars), _BATCH_CHUNK_SIZE):
+                chunk = chars[start : start + _BATCH_CHUNK_SIZE]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    _SELECT_COLUMNS + f"FROM char_stats WHERE char IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                result.extend(self._row_to_stat(row) for row in rows)
+        return result
 
     def get_chars_by_sort(
         self,
@@ -89,99 +150,72 @@ class SqliteCharStatsRepository:
             params.extend([cutoff, recent_days])
 
         params.append(n)
-        with sqlite3.connect(self._db_path) as conn:
-            rows = conn.execute(
-                f"SELECT char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen "
-                f"FROM char_stats {where} ORDER BY {order_by} LIMIT ?",
-                params,
-            ).fetchall()
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    _SELECT_COLUMNS
+                    + f"FROM char_stats {where} ORDER BY {order_by} LIMIT ?",
+                    params,
+                )
+                .fetchall()
+            )
         return [self._row_to_stat(row) for row in rows]
 
     def get_weakest_chars(self, n: int) -> list[CharStat]:
         return self.get_chars_by_sort("error_rate", None, n)
 
     def save(self, stat: CharStat) -> None:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute(
-                "INSERT INTO char_stats (char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen, last_synced_at, is_dirty) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, NULL, 1) "
-                "ON CONFLICT(char) DO UPDATE SET "
-                "char_count = ?, error_char_count = ?, total_ms = ?, "
-                "min_ms = ?, max_ms = ?, last_seen = ?, is_dirty = 1",
-                (
-                    stat.char,
-                    stat.char_count,
-                    stat.error_char_count,
-                    stat.total_ms,
-                    stat.min_ms,
-                    stat.max_ms,
-                    stat.last_seen or now,
-                    stat.char_count,
-                    stat.error_char_count,
-                    stat.total_ms,
-                    stat.min_ms,
-                    stat.max_ms,
-                    stat.last_seen or now,
-                ),
-            )
+        self.save_batch([stat])
 
     def save_batch(self, stats: list[CharStat]) -> None:
         if not stats:
             return
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with sqlite3.connect(self._db_path) as conn:
-            conn.executemany(
-                "INSERT INTO char_stats (char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen, last_synced_at, is_dirty) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, NULL, 1) "
-                "ON CONFLICT(char) DO UPDATE SET "
-                "char_count = ?, error_char_count = ?, total_ms = ?, "
-                "min_ms = ?, max_ms = ?, last_seen = ?, is_dirty = 1",
-                [
-                    (
-                        s.char,
-                        s.char_count,
-                        s.error_char_count,
-                        s.total_ms,
-                        s.min_ms,
-                        s.max_ms,
-                        s.last_seen or now,
-                        s.char_count,
-                        s.error_char_count,
-                        s.total_ms,
-                        s.min_ms,
-                        s.max_ms,
-                        s.last_seen or now,
-                    )
-                    for s in stats
-                ],
+        params = [
+            (
+                s.char,
+                s.char_count,
+                s.error_char_count,
+                s.total_ms,
+                s.min_ms,
+                s.max_ms,
+                s.last_seen or now,
+                s.char_count,
+                s.error_char_count,
+                s.total_ms,
+                s.min_ms,
+                s.max_ms,
+                s.last_seen or now,
             )
+            for s in stats
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(_UPSERT_SQL, params)
 
     def get_all(self) -> list[CharStat]:
-        with sqlite3.connect(self._db_path) as conn:
-            rows = conn.execute(
-                "SELECT char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen "
-                "FROM char_stats"
-            ).fetchall()
+        with self._lock:
+            rows = self._connection().execute(_GET_ALL_SQL).fetchall()
         return [self._row_to_stat(row) for row in rows]
 
     def get_all_dirty(self) -> list[CharStat]:
-        with sqlite3.connect(self._db_path) as conn:
-            rows = conn.execute(
-                "SELECT char, char_count, error_char_count, total_ms, min_ms, max_ms, last_seen "
-                "FROM char_stats WHERE is_dirty = 1"
-            ).fetchall()
+        with self._lock:
+            rows = self._connection().execute(_GET_ALL_DIRTY_SQL).fetchall()
         return [self._row_to_stat(row) for row in rows]
 
     def mark_synced(self, chars: list[str], synced_at: str) -> None:
         if not chars:
             return
         placeholders = ",".join("?" for _ in chars)
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute(
-                f"UPDATE char_stats SET is_dirty = 0, last_synced_at = ? WHERE char IN ({placeholders})",
-                [synced_at, *chars],
-            )
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    f"UPDATE char_stats SET is_dirty = 0, last_synced_at = ? WHERE char IN ({placeholders})",
+                    [synced_at, *chars],
+                )
 
     @staticmethod
     def _row_to_stat(row: tuple) -> CharStat:
@@ -0,0 +1,334 @@
+"""动态源条目快照 SQLite 存储（单文件索引库，替代一条目一 JSON 文件）。
+
+布局：registry_cache_dir()/snapshots.db，每条快照一行：
+- (authority, entry_id) 为主键，按 authority 列出/清理走主键前缀
+- captured_at / next_refresh_at / refresh_mode / last_checked_at 独立成列，
+  「到期待刷新」是 interval 部分索引上的范围查询，列表排序走索引
+- 完整快照 dict 以紧凑 JSON 存在 payload 列，读出后与文件版形状一致
+
+首次打开新库时把旧版 snapshots/{authority_hash}/{entry_id}.json 目录一次性
+导入（同一事务写入 user_version 标记），成功后删除旧目录。
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from ..utils.logger import log_info, log_warning
+from .entry_snapshot_store import EntrySnapshotStore
+from .refresh_policy import MODE_INTERVAL, RefreshPolicy
+
+# PRAGMA user_version：0 = 新库（需建表并迁移旧目录），1 = 已完成迁移
+_SCHEMA_VERSION = 1
+_BUSY_TIMEOUT_MS = 5000
+# prune_stale 按 id 批量删除时单条 SQL 的参数上限（低于 SQLite 默认 999）
+_DELETE_CHUNK = 500
+
+_CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    authority        TEXT NOT NULL,
+    entry_id         TEXT NOT NULL,
+    captured_at      REAL NOT NULL DEFAULT 0,
+    next_refresh_at  REAL,
+    refresh_mode     TEXT NOT NULL DEFAULT '',
+    last_checked_at  REAL,
+    payload          TEXT NOT NULL,
+    PRIMARY KEY (authority, entry_id)
+);
+"""
+_CREATE_INDEX_SQL = (
+    (
+        "CREATE INDEX IF NOT EXISTS idx_snapshots_authority_captured "
+        "ON snapshots (authority, captured_at DESC, entry_id DESC)"
+    ),
+    (
+        "CREATE INDEX IF NOT EXISTS idx_snapshots_captured "
+        "ON snapshots (captured_at DESC, entry_id DESC)"
+    ),
+    (
+        "CREATE INDEX IF NOT EXISTS idx_snapshots_due ON snapshots (next_refresh_at) "
+        f"WHERE refresh_mode = '{MODE_INTERVAL}'"
+    ),
+)
+# explicit_checked = 1：调用方显式给出检查时间，直接覆盖；
+# 否则保留已有快照的值（旧值缺失回退其 captured_at，均取更新前的旧行）
+_UPSERT_SQL = """
+INSERT INTO snapshots (
+    authority, entry_id, captured_at, next_refresh_at, refresh_mode,
+    last_checked_at, payload
+) VALUES (:authority, :entry_id, :captured_at, :next_refresh_at, :refresh_mode,
+          :last_checked_at, :payload)
+ON CONFLICT (authority, entry_id) DO UPDATE SET
+    captured_at = excluded.captured_at,
+    next_refresh_at = excluded.next_refresh_at,
+    refresh_mode = excluded.refresh_mode,
+    payload = excluded.payload,
+    last_checked_at = CASE
+        WHEN :explicit_checked THEN excluded.last_checked_at
+        ELSE COALESCE(snapshots.last_checked_at, snapshots.captured_at)
+    END
+"""
+_ROW_COLUMNS = "authority, payload, last_checked_at"
+_ORDER = "ORDER BY captured_at DESC, entry_id DESC"
+_GET_SQL = f"SELECT {_ROW_COLUMNS} FROM snapshots WHERE authority = ? AND entry_id = ?"
+_LIST_SQL = f"SELECT {_ROW_COLUMNS} FROM snapshots WHERE authority = ? {_ORDER}"
+_LIST_ALL_SQL = f"SELECT {_ROW_COLUMNS} FROM snapshots {_ORDER}"
+_LIST_IDS_SQL = f"SELECT entry_id FROM snapshots WHERE authority = ? {_ORDER}"
+_PRUNE_SQL = f"""
+DELETE FROM snapshots WHERE authority = ? AND entry_id NOT IN (
+    SELECT entry_id FROM snapshots WHERE authority = ? {_ORDER} LIMIT ?
+)
+"""
+_DUE_SQL = (
+    "SELECT authority, entry_id FROM snapshots "
+    f"WHERE refresh_mode = '{MODE_INTERVAL}' AND next_refresh_at <= ?"
+)
+
+
+class SqliteEntrySnapshotStore(EntrySnapshotStore):
+    """快照 SQLite 存储，接口与 EntrySnapshotStore 一致。
+
+    写入为单行 UPSERT（last_checked_at 的沿用在 SQL 内完成，不再先读旧快照）；
+    列表与到期查询均走索引，不随快照条数线性扫描磁盘。读写失败静默降级，
+    与文件版一致，绝不阻塞刷新主流程。
+    """
+
+    def __init__(self, cache_dir: Path, max_per_source: int = 5) -> None:
+        super().__init__(cache_dir, max_per_source)
+        self._db_path = Path(cache_dir) / "snapshots.db"
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 写
+    # ------------------------------------------------------------------
+
+    def save(
+        self,
+        entry: dict,
+        captured_at: float,
+        policy: RefreshPolicy,
+        fingerprint: str | None = None,
+        last_checked_at: float | None = None,
+    ) -> None:
+        """写快照；语义同 EntrySnapshotStore.save。"""
+        if not isinstance(entry, dict):
+            return
+        entry_id = entry.get("entry_id")
+        authority = entry.get("_authority", "")
+        if not entry_id or not authority:
+            return
+        payload: dict[str, Any] = {
+            **entry,
+            "captured_at": captured_at,
+            "refresh_policy": policy.to_dict(),
+            "next_refresh_at": policy.next_refresh_at(captured_at),
+        }
+        if fingerprint is not None:
+            payload["snap_fingerprint"] = fingerprint
+        checked_at = last_checked_at
+        if checked_at is None:
+            checked_at = payload.get("last_checked_at")
+        explicit = isinstance(checked_at, (int, float))
+        # last_checked_at 以列为准，读出时回填到 dict
+        payload.pop("last_checked_at", None)
+        params = self._row_params(
+            str(authority),
+            str(entry_id),
+            payload,
+            float(checked_at) if explicit else float(captured_at),
+        )
+        params["explicit_checked"] = 1 if explicit else 0
+        self._execute_write(lambda conn: conn.execute(_UPSERT_SQL, params))
+
+    # ------------------------------------------------------------------
+    # 读
+    # ------------------------------------------------------------------
+
+    def get(self, authority: str, entry_id: str) -> dict | None:
+        rows = self._query(_GET_SQL, (authority, entry_id))
+        items = self._decode_rows(rows)
+        return items[0] if items else None
+
+    def list(self, authority: str) -> list[dict]:
+        return self._decode_rows(self._query(_LIST_SQL, (authority,)))
+
+    def list_all(self) -> list[dict]:
+        """全部快照（按 captured_at 倒序）；单次索引扫描，零网络。"""
+        return self._decode_rows(self._query(_LIST_ALL_SQL, ()))
+
+    # ------------------------------------------------------------------
+    # prune / 调度
+    # ------------------------------------------------------------------
+
+    def prune(self, authority: str, max_per_source: int | None = None) -> None:
+        limit = max(1, max_per_source or self._max_per_source)
+        self._execute_write(
+            lambda conn: conn.execute(_PRUNE_SQL, (authority, authority, limit))
+        )
+
+    def prune_stale(
+        self, authority: str, live_ids: set[str], max_per_source: int | None = None
+    ) -> None:
+        """只清理不再活跃的旧快照（保留最近 N 条；live_ids 中的条目永不删除）。"""
+        limit = max(1, max_per_source or self._max_per_source)
+        ids = [row[0] for row in self._query(_LIST_IDS_SQL, (authority,))]
+        stale = [entry_id for entry_id in ids if entry_id not in live_ids][limit:]
+        if not stale:
+            return
+
+        def delete(conn: sqlite3.Connection) -> None:
+            for i in range(0, len(stale), _DELETE_CHUNK):
+                chunk = stale[i : i + _DELETE_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(
+                    "DELETE FROM snapshots WHERE authority = ? "
+                    f"AND entry_id IN ({placeholders})",
+                    (authority, *chunk),
+                )
+
+        self._execute_write(delete)
+
+    def due_for_refresh(self, now: float) -> list[tuple[str, str]]:
+        """返回 (authority, entry_id) 中 interval 模式已到期的快照（索引范围查询）。"""
+        return [(str(a), str(e)) for a, e in self._query(_DUE_SQL, (now,))]
+
+    def clear_cache(self) -> None:
+        self._execute_write(lambda conn: conn.execute("DELETE FROM snapshots"))
+
+    def clear_authority(self, authority: str) -> None:
+        """删除某 authority 的全部快照（删除订阅时清理残留）。"""
+        self._execute_write(
+            lambda conn: conn.execute(
+                "DELETE FROM snapshots WHERE authority = ?", (authority,)
+            )
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # 内部
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        try:
+            with self._lock:
+                return self._connection().execute(sql, params).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            log_warning(f"[SnapshotStore] 读取快照失败: {e}")
+            return []
+
+    def _execute_write(self, action) -> None:
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    action(conn)
+        except (OSError, sqlite3.Error) as e:
+            log_warning(f"[SnapshotStore] 写入快照失败: {e}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """返回长连接，首次调用时建表并迁移旧快照目录（调用方持有 _lock）。"""
+        if self._conn is not None:
+            return self._conn
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # UI 线程与后台刷新线程共用，统一经 _lock 串行化
+        conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(_CREATE_TABLE_SQL)
+            for sql in _CREATE_INDEX_SQL:
+                conn.execute(sql)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                self._migrate_legacy_dirs(conn)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+    def _migrate_legacy_dirs(self, conn: sqlite3.Connection) -> None:
+        rows = [
+            self._row_params(authority, entry_id, payload, checked_at)
+            for authority, entry_id, payload, checked_at in self._legacy_snapshots()
+        ]
+        with conn:
+            conn.executemany(
+                _UPSERT_SQL, [{**row, "explicit_checked": 1} for row in rows]
+            )
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        if self._root.exists():
+            shutil.rmtree(self._root, ignore_errors=True)
+        if rows:
+            log_info(f"[SnapshotStore] 已从 {self._root} 迁移 {len(rows)} 条快照")
+
+    def _legacy_snapshots(self):
+        """逐个读取旧版快照文件（损坏/缺字段的文件跳过）。"""
+        if not self._root.exists():
+            return
+        for path in self._root.glob("*/*.json"):
+            try:
+                with path.open(encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError, ValueError, TypeError):
+                continue
+            if not isinstance(data, dict):
+                continue
+            authority = str(data.get("_authority", ""))
+            entry_id = str(data.get("entry_id", ""))
+            if not authority or not entry_id:
+                continue
+            checked_at = data.pop("last_checked_at", None)
+            if not isinstance(checked_at, (int, float)):
+                checked_at = data.get("captured_at", 0.0)
+            yield authority, entry_id, data, float(checked_at or 0.0)
+
+    @staticmethod
+    def _row_params(
+        authority: str, entry_id: str, payload: dict, checked_at: float
+    ) -> dict[str, Any]:
+        captured_at = payload.get("captured_at")
+        next_refresh_at = payload.get("next_refresh_at")
+        return {
+            "authority": authority,
+            "entry_id": entry_id,
+            "captured_at": float(captured_at)
+            if isinstance(captured_at, (int, float))
+            else 0.0,
+            "next_refresh_at": float(next_refresh_at)
+            if isinstance(next_refresh_at, (int, float))
+            else None,
+            "refresh_mode": RefreshPolicy.from_dict(payload.get("refresh_policy")).mode,
+            "last_checked_at": checked_at,
+            "payload": json.dumps(payload, ensure_ascii=False, default=str),
+        }
+
+    @staticmethod
+    def _decode_rows(rows: list[tuple]) -> list[dict]:
+        items: list[dict] = []
+        for authority, payload, checked_at in rows:
+            try:
+                data = json.loads(payload)
+            except (TypeError, ValueError):
+                continue
+            if not isinstance(data, dict):
+                continue
+            if checked_at is not None:
+                data["last_checked_at"] = float(checked_at)
+            data.setdefault("_authority", authority)
+            items.append(data)
+        return items
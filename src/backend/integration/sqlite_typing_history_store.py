@@ -0,0 +1,178 @@
+"""SQLite 实现的打字历史记录存储。"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from ..ports.typing_history_store import TypingHistoryStore
+from ..utils.logger import log_info, log_warning
+from .json_typing_history_store import JsonTypingHistoryStore
+
+# PRAGMA user_version：0 = 新库（需建表并迁移旧 JSON），1 = 已完成迁移
+_SCHEMA_VERSION = 1
+_BUSY_TIMEOUT_MS = 5000
+
+_CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS typing_history (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    date     TEXT NOT NULL DEFAULT '',
+    payload  TEXT NOT NULL
+);
+"""
+_CREATE_DATE_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_typing_history_date ON typing_history (date)"
+)
+_INSERT_SQL = "INSERT INTO typing_history (date, payload) VALUES (?, ?)"
+_RECENT_SQL = "SELECT payload FROM typing_history ORDER BY id DESC LIMIT ?"
+_ALL_SQL = "SELECT payload FROM typing_history ORDER BY id DESC"
+_COUNT_SQL = "SELECT COUNT(*) FROM typing_history"
+_SINCE_SQL = "SELECT payload FROM typing_history WHERE date >= ? ORDER BY id DESC"
+# 第 max_records+1 新的记录 id；它及更旧的记录都超出保留上限
+_CUTOFF_SQL = "SELECT id FROM typing_history ORDER BY id DESC LIMIT 1 OFFSET ?"
+_EVICTED_SQL = "SELECT payload FROM typing_history WHERE id <= ? ORDER BY id DESC"
+_DELETE_UPTO_SQL = "DELETE FROM typing_history WHERE id <= ?"
+
+
+class SqliteTypingHistoryStore(TypingHistoryStore):
+    """历史记录 SQLite 存储。
+
+    每条记录一行：完整记录以 JSON 存在 payload 列，date 列单独存放并建索引，
+    records_since 按起始日期走索引范围扫描。追加为单行 INSERT，超出保留上限的最旧
+    记录按主键范围删除，代价与历史总量无关。
+
+    首次打开新库时把旧版 typing_history.json 中的记录一次性导入（同一事务内
+    写入 user_version 标记），旧文件原样保留作为备份，不再读写。
+    """
+
+    def __init__(
+        self, db_path: str | Path, legacy_json_path: str | Path | None = None
+    ) -> None:
+        self._db_path = Path(db_path)
+        self._legacy_json_path = Path(legacy_json_path) if legacy_json_path else None
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[str, Any]:
+        with self._lock:
+            rows = self._connection().execute(_ALL_SQL).fetchall()
+        return {
+            "version": JsonTypingHistoryStore.CURRENT_VERSION,
+            "records": self._decode_rows(rows),
+        }
+
+    def save(self, data: dict[str, Any]) -> None:
+        records = [r for r in data.get("records", []) if isinstance(r, dict)]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM typing_history")
+                self._insert_newest_first(conn, records)
+
+    def append(self, record: dict[str, Any], max_records: int) -> list[dict[str, Any]]:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(_INSERT_SQL, self._row_params(record))
+                return self._delete_beyond(conn, max_records)
+
+    def recent(self, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._connection().execute(_RECENT_SQL, (limit,)).fetchall()
+        return self._decode_rows(rows)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection().execute(_COUNT_SQL).fetchone()[0]
+
+    def truncate(self, max_records: int) -> list[dict[str, Any]]:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                return self._delete_beyond(conn, max_records)
+
+    def records_since(self, date_key: str) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._connection().execute(_SINCE_SQL, (date_key,)).fetchall()
+        return self._decode_rows(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """返回长连接，首次调用时建表并执行旧 JSON 迁移（调用方持有 _lock）。"""
+        if self._conn is not None:
+            return self._conn
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # UI 线程与后台线程都可能访问历史记录，统一经 _lock 串行化
+        conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(_CREATE_TABLE_SQL)
+        conn.execute(_CREATE_DATE_INDEX_SQL)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            self._migrate_legacy_json(conn)
+        self._conn = conn
+        return conn
+
+    def _migrate_legacy_json(self, conn: sqlite3.Connection) -> None:
+        records: list[dict[str, Any]] = []
+        if self._legacy_json_path and self._legacy_json_path.exists():
+            data = JsonTypingHistoryStore(self._legacy_json_path).load()
+            records = [r for r in data["records"] if isinstance(r, dict)]
+        with conn:
+            self._insert_newest_first(conn, records)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        if records:
+            log_info(
+                "[TypingHistory] 已从 %s 迁移 %d 条历史记录",
+                self._legacy_json_path,
+                len(records),
+            )
+
+    def _insert_newest_first(
+        self, conn: sqlite3.Connection, records: list[dict[str, Any]]
+    ) -> None:
+        # 主键自增即时间顺序：倒序插入，使列表首条（最新）获得最大 id
+        conn.executemany(_INSERT_SQL, [self._row_params(r) for r in reversed(records)])
+
+    def _delete_beyond(
+        self, conn: sqlite3.Connection, max_records: int
+    ) -> list[dict[str, Any]]:
+        row = conn.execute(_CUTOFF_SQL, (max(max_records, 0),)).fetchone()
+        if row is None:
+            return []
+        evicted = self._decode_rows(conn.execute(_EVICTED_SQL, row).fetchall())
+        conn.execute(_DELETE_UPTO_SQL, row)
+        return evicted
+
+    @staticmethod
+    def _row_params(record: dict[str, Any]) -> tuple[str, str]:
+        date_text = record.get("date")
+        return (
+            date_text if isinstance(date_text, str) else "",
+            json.dumps(record, ensure_ascii=False),
+        )
+
+    @staticmethod
+    def _decode_rows(rows: list[tuple]) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        for (payload,) in rows:
+            try:
+                record = json.loads(payload)
+            except (TypeError, ValueError):
+                log_warning("[TypingHistory] 跳过无法解析的历史记录")
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records
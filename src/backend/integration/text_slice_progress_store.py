@@ -1,63 +1,161 @@
-"""JSON 文件实现的文本分片进度存储。
+"""追加日志实现的文本分片进度存储。
 
 以文本内容 SHA-256 hash 为 key，持久化每篇文本的分片进度，
 包括：总分段数、当前分段、达标次数、成绩快照、指标设置等。
+
+布局：构造参数 path 旁的同名 ``.jsonl`` 追加日志，每行一条记录：
+写入/覆盖为 ``{"k": hash, "t": title, "a": last_accessed}<TAB>entry``，
+删除为 ``{"k": hash, "d": 1}``。条目 JSON 不含制表符与换行（json 转义），
+回放只解析短小的头部，条目原文直接进缓存，含长 slice_stats 的进度也无需
+逐条解析。以换行结尾的才是完整记录，崩溃时写了半行的尾部被丢弃。
+- 全部条目首次访问时回放日志载入内存（条目以紧凑 JSON 串缓存，读出即
+  得独立副本），按 key 查询与每片保存都是 O(1)，不再整文件读写
+- text_title 维护有序索引，旧格式 key 的标题前缀回退查找走二分
+- 写入只改内存并进入待写队列，由后台定时器合并追加（write-behind）；
+  close()/flush() 立即落盘，解释器退出时（atexit）也会同步落盘
+- 日志行数超过存活条目数 2 倍时整体重写为每 key 一行（compaction）
+
+path 本身是旧版整文件 JSON：首次打开且日志尚不存在时一次性导入，
+写出日志后把旧文件重命名为 ``*.migrated`` 保留备份。
 """
 
+from __future__ import annotations
+
+import atexit
 import hashlib
 import json
+import threading
+import weakref
+from bisect import bisect_left, insort
 from pathlib import Path
 from typing import Any
 
+from ..utils.logger import log_warning
+
+# 写入后延迟多久合并落盘（秒）；0 = 每次写入同步落盘
+DEFAULT_FLUSH_DELAY_S = 1.0
+# 旧版整文件 JSON 导入后的备份后缀
+LEGACY_BACKUP_SUFFIX = ".migrated"
+# 日志行数低于该值不做 compaction，避免小文件频繁重写
+_COMPACT_MIN_RECORDS = 256
+_COMPACT_RATIO = 2
+
 
 def _text_hash(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _record_line(key: str, raw: str, title: str, accessed: str) -> str:
+    head = _dumps({"k": key, "t": title, "a": accessed})
+    return f"{head}\t{raw}\n"
+
+
+# 尚未 close 的存储：解释器退出时统一同步落盘（弱引用，不延长其生命周期）
+_OPEN_STORES: weakref.WeakSet[TextSliceProgressStore] = weakref.WeakSet()
+
+
+def _flush_open_stores() -> None:
+    for store in list(_OPEN_STORES):
+        store.flush()
+
+
+atexit.register(_flush_open_stores)
+
+
 class TextSliceProgressStore:
-    """以文本 hash 为 key 持久化分片进度。"""
+    """以文本 hash 为 key 持久化分片进度（内存索引 + 追加日志）。
 
-    def __init__(self, path: str | Path) -> None:
-        self._path = Path(path)
+    线程安全：状态由 _lock 保护；落盘由 _io_lock 串行化，compaction
+    写文件期间不持有 _lock，UI 线程的查询与保存不会被整体重写阻塞。
+    """
 
-    def load(self) -> dict[str, Any]:
-        if not self._path.exists():
-            return {}
-        try:
-            with self._path.open(encoding="utf-8") as f:
-                data = json.load(f)
-        except (OSError, json.JSONDecodeError):
-            return {}
-        return data if isinstance(data, dict) else {}
+    def __init__(
+        self, path: str | Path, flush_delay: float = DEFAULT_FLUSH_DELAY_S
+    ) -> None:
+        self._legacy_path = Path(path)
+        self._log_path = self._legacy_path.with_suffix(".jsonl")
+        self._flush_delay = max(0.0, flush_delay)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._loaded = False
+        # hash → 条目紧凑 JSON；hash → (text_title, last_accessed)
+        self._records: dict[str, str] = {}
+        self._meta: dict[str, tuple[str, str]] = {}
+        # 标题索引：title → hash 集合，以及有序的不重复标题列表
+        self._title_keys: dict[str, set[str]] = {}
+        self._titles: list[str] = []
+        # 待追加的日志行；_rewrite = 下次落盘整体重写
+        self._pending: list[str] = []
+        self._rewrite = False
+        self._log_records = 0
+        self._timer: threading.Timer | None = None
+        # 定时器是守护线程：退出时同步落盘，避免丢失最后一次进度
+        _OPEN_STORES.add(self)
 
-    def save(self, data: dict[str, Any]) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self._path.with_suffix(f"{self._path.suffix}.tmp")
-        with tmp_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        tmp_path.replace(self._path)
+    # ------------------------------------------------------------------
+    # 查询
+
+    def load(self) -> dict[str, Any]:
+        """返回全部条目（hash → entry）的副本。O(n)，仅供整体导出/调试使用。"""
+        with self._lock:
+            self._ensure_loaded()
+            return {key: json.loads(raw) for key, raw in self._records.items()}
 
     def get_progress(self, text: str) -> dict[str, Any] | None:
-        entry = self.load().get(_text_hash(text))
-        return entry if isinstance(entry, dict) else None
+        return self.get_by_hash_key(_text_hash(text))
 
-    def delete_progress(self, text: str) -> None:
-        data = self.load()
-        key = _text_hash(text)
-        if key in data:
-            del data[key]
-            self.save(data)
+    def get_by_hash_key(self, hash_key: str) -> dict[str, Any] | None:
+        """直接按 hash key 查询（不经二次 hash）。"""
+        with self._lock:
+            self._ensure_loaded()
+            raw = self._records.get(hash_key)
+        return json.loads(raw) if raw is not None else None
 
-    def delete_by_hash_key(self, hash_key: str) -> None:
-        """直接按 JSON 中的 hash key 删除（不经二次 hash）。"""
-        data = self.load()
-        if hash_key in data:
-            del data[hash_key]
-            self.save(data)
+    def find_latest_by_title_prefix(
+        self, prefix: str
+    ) -> tuple[str, dict[str, Any]] | None:
+        """按标题前缀查找 last_accessed 最新的条目，返回 (hash_key, entry)。"""
+        if not prefix:
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            best_key = ""
+            best_accessed = ""
+            pos = bisect_left(self._titles, prefix)
+            while pos < len(self._titles) and self._titles[pos].startswith(prefix):
+                for key in self._title_keys[self._titles[pos]]:
+                    accessed = self._meta[key][1]
+                    if not best_key or accessed > best_accessed:
+                        best_key = key
+                        best_accessed = accessed
+                pos += 1
+            raw = self._records.get(best_key) if best_key else None
+        if raw is None:
+            return None
+        return best_key, json.loads(raw)
+
+    # ------------------------------------------------------------------
+    # 写入
+
+    def save(self, data: dict[str, Any]) -> None:
+        """整体替换全部条目（下次落盘时重写日志）。"""
+        with self._lock:
+            self._ensure_loaded()
+            for key in list(self._records):
+                self._drop(key)
+            for key, entry in data.items():
+                if isinstance(entry, dict):
+                    self._put(key, entry)
+            self._pending.clear()
+            self._rewrite = True
+        self._schedule_flush()
 
     def save_progress(self, text: str, title: str, progress: dict[str, Any]) -> None:
-        data = self.load()
-        data[_text_hash(text)] = {
+        entry = {
             "text_title": title,
             "text_preview": text[:80],
             "last_accessed": progress.get("last_accessed", ""),
@@ -70,5 +168,200 @@ class TextSliceProgressStore:
             "slice_metrics": progress.get("slice_metrics", []),
             "advance_mode": progress.get("advance_mode", "sequential"),
             "shuffle_seed": progress.get("shuffle_seed"),
+            "shuffle_version": progress.get("shuffle_version"),
         }
-        self.save(data)
+        key = _text_hash(text)
+        with self._lock:
+            self._ensure_loaded()
+            self._pending.append(self._put(key, entry))
+        self._schedule_flush()
+
+    def delete_progress(self, text: str) -> None:
+        self.delete_by_hash_key(_text_hash(text))
+
+    def delete_by_hash_key(self, hash_key: str) -> None:
+        """直接按 hash key 删除（不经二次 hash）。"""
+        with self._lock:
+            self._ensure_loaded()
+            if hash_key not in self._records:
+                return
+            self._drop(hash_key)
+            self._pending.append(_dumps({"k": hash_key, "d": 1}) + "\n")
+        self._schedule_flush()
+
+    # ------------------------------------------------------------------
+    # 落盘
+
+    def flush(self) -> None:
+        """把待写记录落盘；日志膨胀到阈值时改为整体重写。"""
+        with self._io_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                lines = self._pending
+                self._pending = []
+                live = len(self._records)
+                rewrite = self._rewrite or (
+                    self._log_records + len(lines)
+                    > max(_COMPACT_MIN_RECORDS, live * _COMPACT_RATIO)
+                )
+                self._rewrite = False
+                # 快照与待写队列在同一把锁下取出：快照已包含这些记录的效果
+                snapshot = (dict(self._records), dict(self._meta)) if rewrite else None
+            if snapshot is None and not lines:
+                return
+            try:
+                if snapshot is not None:
+                    records, meta = snapshot
+                    self._write_compacted(
+                        [
+                            _record_line(key, raw, *meta[key])
+                            for key, raw in records.items()
+                        ]
+                    )
+                    written = len(records)
+                else:
+                    with self._log_path.open("a", encoding="utf-8") as f:
+                        f.writelines(lines)
+                    written = self._log_records + len(lines)
+            except OSError as e:
+                log_warning(f"[TextSliceProgressStore] 写入进度失败: {e}")
+                with self._lock:
+                    self._pending[:0] = lines
+                    self._rewrite = self._rewrite or snapshot is not None
+                return
+            with self._lock:
+                self._log_records = written
+
+    def close(self) -> None:
+        self.flush()
+        _OPEN_STORES.discard(self)
+
+    def _schedule_flush(self) -> None:
+        if self._flush_delay <= 0:
+            self.flush()
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            timer = threading.Timer(self._flush_delay, self.flush)
+            timer.daemon = True
+            self._timer = timer
+        timer.start()
+
+    def _write_compacted(self, lines: list[str]) -> None:
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._log_path.with_suffix(".jsonl.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.writelines(lines)
+        tmp_path.replace(self._log_path)
+
+    # ------------------------------------------------------------------
+    # 载入与索引（调用方持有 _lock）
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self._log_path.exists():
+            self._replay_log()
+        elif self._legacy_path.exists():
+            self._import_legacy()
+
+    def _replay_log(self) -> None:
+        records = 0
+        damaged = False
+        try:
+            with self._log_path.open(encoding="utf-8") as f:
+                for line in f:
+                    records += 1
+                    head, sep, raw = line.partition("\t")
+                    try:
+                        if not line.endswith("\n"):
+                            raise ValueError("truncated record")
+                        record = json.loads(head)
+                        key = record["k"]
+                    except (ValueError, KeyError, TypeError):
+                        # 崩溃时写了半行：丢弃该行，下次落盘整体重写修复文件尾
+                        damaged = True
+                        continue
+                    if record.get("d"):
+                        if key in self._records:
+                            self._drop(key)
+                    elif sep:
+                        self._index(key, raw[:-1], record.get("t"), record.get("a"))
+        except (OSError, UnicodeDecodeError) as e:
+            log_warning(f"[TextSliceProgressStore] 读取进度日志失败: {e}")
+            damaged = True
+        self._log_records = records
+        self._rewrite = damaged
+
+    def _import_legacy(self) -> None:
+        try:
+            with self._legacy_path.open(encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(data, dict):
+            return
+        for key, entry in data.items():
+            if isinstance(entry, dict):
+                self._put(key, entry)
+        try:
+            self._write_compacted(
+                [
+                    _record_line(key, raw, *self._meta[key])
+                    for key, raw in self._records.items()
+                ]
+            )
+        except OSError as e:
+            log_warning(f"[TextSliceProgressStore] 迁移旧进度文件失败: {e}")
+            self._rewrite = True
+            return
+        self._log_records = len(self._records)
+        backup = self._legacy_path.with_name(
+            self._legacy_path.name + LEGACY_BACKUP_SUFFIX
+        )
+        try:
+            self._legacy_path.replace(backup)
+        except OSError as e:
+            # 日志已存在，下次打开不会重复导入；旧文件留在原处也无妨
+            log_warning(f"[TextSliceProgressStore] 备份旧进度文件失败: {e}")
+
+    def _put(self, key: str, entry: dict[str, Any]) -> str:
+        """写入内存并更新索引，返回对应的日志行。"""
+        raw = _dumps(entry)
+        self._index(key, raw, entry.get("text_title"), entry.get("last_accessed"))
+        return _record_line(key, raw, *self._meta[key])
+
+    def _index(self, key: str, raw: str, title: Any, accessed: Any) -> None:
+        title = str(title or "")
+        accessed = str(accessed or "")
+        old = self._meta.get(key)
+        if old is not None and old[0] != title:
+            self._unindex_title(key, old[0])
+        if old is None or old[0] != title:
+            keys = self._title_keys.get(title)
+            if keys is None:
+                keys = self._title_keys[title] = set()
+                insort(self._titles, title)
+            keys.add(key)
+        self._records[key] = raw
+        self._meta[key] = (title, accessed)
+
+    def _drop(self, key: str) -> None:
+        del self._records[key]
+        title, _ = self._meta.pop(key)
+        self._unindex_title(key, title)
+
+    def _unindex_title(self, key: str, title: str) -> None:
+        keys = self._title_keys.get(title)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self._title_keys[title]
+            pos = bisect_left(self._titles, title)
+            if pos < len(self._titles) and self._titles[pos] == title:
+                del self._titles[pos]
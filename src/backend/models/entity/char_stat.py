@@ -1,14 +1,19 @@
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterator
 from dataclasses import dataclass
-from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class CharStat:
     """单字打字统计实体。
 
     记录每个字符的输入历史，用于跨会话累积统计。
     聚合数据天然无冲突 —— 每个字只有一个维度的值，
     不存在"本地说 100 次、远端说 200 次"的矛盾。
+
+    last_seen 不在每次累积时刷新，由落盘方（CharStatsService.flush）
+    按批次统一盖时间戳。
     """
 
     char: str
@@ -51,8 +56,6 @@ class CharStat:
         if keystroke_ms > self.max_ms:
             self.max_ms = keystroke_ms
 
-        self.last_seen = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
     @property
     def avg_ms(self) -> float:
         if self.char_count == 0:
@@ -94,3 +97,125 @@ class CharStat:
             "maxMs": round(self.max_ms, 1),
             "lastSeen": self.last_seen,
         }
+
+
+class CharStatTable:
+    """字符统计的列式内存存储。
+
+    每个字符驻留时分配一个槽位（interned index），各统计量存放在按槽位
+    对齐的平行数组中，避免每个字一个对象、每个数值一个 float 对象的开销。
+    移除的槽位进入空闲链表复用，数组不会随淘汰/装入反复增长。
+    字符 → 槽位索引同时按最近使用排序（迭代顺序即 LRU 顺序，队首最久
+    未用），供上层缓存淘汰，无需另建一份字符表。
+
+    累积语义与 CharStat.accumulate 保持一致；需要实体时用 get() 物化。
+    """
+
+    __slots__ = (
+        "_chars",
+        "_free",
+        "_index",
+        "char_count",
+        "error_char_count",
+        "last_seen",
+        "max_ms",
+        "min_ms",
+        "total_ms",
+    )
+
+    def __init__(self) -> None:
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._chars: list[str] = []
+        self._free: list[int] = []
+        self.char_count = array("q")
+        self.error_char_count = array("q")
+        self.total_ms = array("d")
+        self.min_ms = array("d")
+        self.max_ms = array("d")
+        self.last_seen: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, char: object) -> bool:
+        return char in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        """按最近使用顺序（最久未用在前）迭代驻留的字符。"""
+        return iter(self._index)
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        return iter(self._index.items())
+
+    def slot_of(self, char: str) -> int | None:
+        return self._index.get(char)
+
+    def touch(self, char: str) -> None:
+        """标记为最近使用（移到 LRU 队尾）。"""
+        self._index.move_to_end(char)
+
+    def put(self, stat: CharStat) -> int:
+        """写入（或覆盖）一个字符的统计，返回其槽位；新字符排在 LRU 队尾。"""
+        slot = self._index.get(stat.char)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self._chars[slot] = stat.char
+            else:
+                slot = len(self._chars)
+                self._chars.append(stat.char)
+                self.char_count.append(0)
+                self.error_char_count.append(0)
+                self.total_ms.append(0.0)
+                self.min_ms.append(0.0)
+                self.max_ms.append(0.0)
+                self.last_seen.append("")
+            self._index[stat.char] = slot
+        self.char_count[slot] = stat.char_count
+        self.error_char_count[slot] = stat.error_char_count
+        self.total_ms[slot] = stat.total_ms
+        self.min_ms[slot] = stat.min_ms
+        self.max_ms[slot] = stat.max_ms
+        self.last_seen[slot] = stat.last_seen
+        return slot
+
+    def get(self, char: str) -> CharStat | None:
+        slot = self._index.get(char)
+        if slot is None:
+            return None
+        return self.materialize(slot)
+
+    def materialize(self, slot: int) -> CharStat:
+        return CharStat(
+            char=self._chars[slot],
+            char_count=self.char_count[slot],
+            error_char_count=self.error_char_count[slot],
+            total_ms=self.total_ms[slot],
+            min_ms=self.min_ms[slot],
+            max_ms=self.max_ms[slot],
+            last_seen=self.last_seen[slot],
+        )
+
+    def remove(self, char: str) -> None:
+        slot = self._index.pop(char, None)
+        if slot is None:
+            return
+        self._chars[slot] = ""
+        self.last_seen[slot] = ""
+        self._free.append(slot)
+
+    def accumulate(self, slot: int, keystroke_ms: float, is_error: bool) -> None:
+        """按槽位累积一次上屏结果（同 CharStat.accumulate）。"""
+        self.char_count[slot] += 1
+        total = self.total_ms[slot] + keystroke_ms
+        if is_error:
+            self.error_char_count[slot] += 1
+            total += 500  # 与 CharStat.accumulate 一致的错字罚时
+        self.total_ms[slot] = total
+
+        if not is_error:
+            min_ms = self.min_ms[slot]
+            if min_ms == 0.0 or keystroke_ms < min_ms:
+                self.min_ms[slot] = keystroke_ms
+
+        self.max_ms[slot] = max(self.max_ms[slot], keystroke_ms)
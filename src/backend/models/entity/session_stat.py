@@ -9,7 +9,7 @@ from datetime import datetime
 from uuid import uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionStat:
     """会话统计数据结构体"""
 
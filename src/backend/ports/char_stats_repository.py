@@ -61,3 +61,7 @@ class CharStatsRepository(Protocol):
     def mark_synced(self, chars: list[str], synced_at: str) -> None:
         """标记字符为已同步。"""
         ...
+
+    def close(self) -> None:
+        """释放持有的连接等资源（应用退出时调用）。"""
+        ...
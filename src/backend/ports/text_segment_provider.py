@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Protocol
 
 
@@ -8,4 +9,8 @@ class TextSegmentProvider(Protocol):
 
     def get_segment(self, start: int, length: int) -> str: ...
 
+    def get_chars(self, indices: Sequence[int]) -> str:
+        """按字符下标批量取字符（scatter/gather），按 indices 顺序拼接；越界下标忽略。"""
+        ...
+
     def get_total_chars(self) -> int: ...
@@ -7,7 +7,13 @@ from typing import Any
 
 
 class TypingHistoryStore(ABC):
-    """历史记录存储抽象。"""
+    """历史记录存储抽象。
+
+    load/save 为整体读写的最小契约；append/recent/count/truncate/records_since
+    提供基于整体读写的默认实现，支持增量写入与索引查询的后端（如 SQLite）
+    应覆盖它们，使单次会话保存与历史页查询不随记录总数线性增长。
+    记录顺序约定：最新记录在前。
+    """
 
     @abstractmethod
     def load(self) -> dict[str, Any]:
@@ -16,3 +22,45 @@ class TypingHistoryStore(ABC):
     @abstractmethod
     def save(self, data: dict[str, Any]) -> None:
         """保存全部历史记录数据。"""
+
+    def append(self, record: dict[str, Any], max_records: int) -> list[dict[str, Any]]:
+        """追加一条记录并按上限删除最旧记录，返回被删除的记录。"""
+        records = self._records()
+        records.insert(0, record)
+        evicted = records[max_records:]
+        del records[max_records:]
+        self.save({"records": records})
+        return evicted
+
+    def recent(self, limit: int) -> list[dict[str, Any]]:
+        """返回最近 limit 条记录。"""
+        return self._records()[:limit]
+
+    def count(self) -> int:
+        return len(self._records())
+
+    def truncate(self, max_records: int) -> list[dict[str, Any]]:
+        """只保留最近 max_records 条记录，返回被删除的记录。"""
+        records = self._records()
+        if len(records) <= max_records:
+            return []
+        evicted = records[max_records:]
+        self.save({"records": records[:max_records]})
+        return evicted
+
+    def records_since(self, date_key: str) -> list[dict[str, Any]]:
+        """返回 date 字段不早于 date_key（按字符串比较）的记录。"""
+        return [
+            r
+            for r in self._records()
+            if isinstance(r.get("date"), str) and r["date"] >= date_key
+        ]
+
+    def close(self) -> None:
+        """释放底层资源；整体读写的文件实现无需处理。"""
+
+    def _records(self) -> list[dict[str, Any]]:
+        records = self.load().get("records")
+        if not isinstance(records, list):
+            return []
+        return [r for r in records if isinstance(r, dict)]
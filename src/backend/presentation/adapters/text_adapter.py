@@ -250,11 +250,9 @@ class TextAdapter(QObject):
             from ...integration.file_segment_provider import FileSegmentProvider
 
             provider_cls = FileSegmentProvider
+        # 大文件的二进制稀疏索引由 provider 在首次取总字数时自动加载或重建
         provider = provider_cls(file_path, small_file_threshold=small_threshold)
-        provider.load_index_cache()
         total_chars = provider.get_total_chars()
-        if provider._index and not provider._text:
-            provider.save_index_cache()
 
         handle = TextHandle(
             kind=kind,
@@ -84,11 +84,14 @@ class TypingAdapter(QObject):
         self._correct_fmt.setBackground(QColor("gray"))
         self._error_fmt.setBackground(QColor("red"))
 
-    def _color_text(self, begin_pos: int, n: int, fmt: QTextCharFormat) -> None:
+    def _color_updates(self, char_updates: list[tuple[int, str, bool]]) -> None:
+        """按格式合并连续位置后逐段着色（每段一次 setPosition/setCharFormat）。
+
+        char 为空表示该位置被删除，清除着色；否则按对错着色。文档长度每次
+        提交只查询一次。
+        """
         if not self._cursor or not self._rich_doc:
             return
-        if begin_pos < 0:
-            return
         # 从 cursor 自身的 document 获取长度，避免 _rich_doc 被 QML 替换后长度不同步
         try:
             cursor_doc = self._cursor.document()
@@ -97,9 +100,35 @@ class TypingAdapter(QObject):
             doc_len = cursor_doc.characterCount()
         except RuntimeError:
             return
+
+        run_begin = -1
+        run_len = 0
+        run_fmt: QTextCharFormat | None = None
+        for pos, char, is_error in char_updates:
+            if not char:
+                fmt = self._no_fmt
+            elif is_error:
+                fmt = self._error_fmt
+            else:
+                fmt = self._correct_fmt
+            if fmt is run_fmt and pos == run_begin + run_len:
+                run_len += 1
+                continue
+            if run_fmt is not None:
+                self._color_range(run_begin, run_len, run_fmt, doc_len)
+            run_begin, run_len, run_fmt = pos, 1, fmt
+        if run_fmt is not None:
+            self._color_range(run_begin, run_len, run_fmt, doc_len)
+
+    def _color_range(
+        self, begin_pos: int, n: int, fmt: QTextCharFormat, doc_len: int
+    ) -> None:
+        if begin_pos < 0:
+            return
         # characterCount 包含末尾隐含段落分隔符（+1），setPosition 允许 [0, characterCount]
-        # 还需确保 begin_pos + n 不超出文档范围，避免 movePosition 越界
-        if begin_pos + n > doc_len or begin_pos >= doc_len:
+        # 截断到文档范围内，避免 movePosition 越界（与逐字着色时跳过越界字符等价）
+        n = min(n, doc_len - begin_pos)
+        if n <= 0:
             return
         self._cursor.setPosition(begin_pos)
         self._cursor.movePosition(
@@ -107,6 +136,22 @@ class TypingAdapter(QObject):
         )
         self._cursor.setCharFormat(fmt)
 
+    def _clear_coloring(self) -> None:
+        """整篇恢复为未着色格式（与逐字删除时的 _no_fmt 一致）。
+
+        与 _color_updates 相同，取 cursor 自身的 document，避免 _rich_doc
+        被 QML 替换后清错文档。
+        """
+        try:
+            doc = self._cursor.document()
+        except RuntimeError:
+            return
+        if doc is None:
+            return
+        cursor = QTextCursor(doc)
+        cursor.select(QTextCursor.SelectionType.Document)
+        cursor.setCharFormat(self._no_fmt)
+
     def _clear_formatting(self) -> None:
         """清除 QTextDocument 上的所有字符格式（着色），不改文本内容。"""
         if not self._rich_doc:
@@ -307,30 +352,15 @@ class TypingAdapter(QObject):
         )
 
         if self._cursor and char_updates:
-            self._cursor.beginEditBlock()
-            try:
-                if grow_length > 0:
-                    # 新增字符：着色
-                    for pos, char, is_error in char_updates:
-                        if char:
-                            self._color_text(
-                                pos,
-                                1,
-                                self._correct_fmt if not is_error else self._error_fmt,
-                            )
-                else:
-                    # 删除/替换：着色
-                    for pos, char, is_error in char_updates:
-                        if char:
-                            self._color_text(
-                                pos,
-                                1,
-                                self._correct_fmt if not is_error else self._error_fmt,
-                            )
-                        else:
-                            self._color_text(pos, 1, self._no_fmt)
-            finally:
-                self._cursor.endEditBlock()
+            if grow_length < 0 and self._typing_service.score_data.char_count == 0:
+                # 输入区被整段清空：一次性清除整个文档的着色
+                self._clear_coloring()
+            else:
+                self._cursor.beginEditBlock()
+                try:
+                    self._color_updates(char_updates)
+                finally:
+                    self._cursor.endEditBlock()
 
         self._emit_typing_signals()
 
@@ -353,6 +383,8 @@ class TypingAdapter(QObject):
         # 避免 set_plain_doc 触发 onTextChanged 时 char_count 仍为旧值导致负位置
         self._typing_service.set_total_chars(len(plain_doc))
         self._typing_service.set_plain_doc(plain_doc)
+        # 所有载文/分片路径最终都汇聚到这里：在用户开始打字前批量预取字符统计
+        self._typing_service.prefetch_char_stats()
         self._typing_service.clear()
         self._reset_signal_cache()
         self._typing_service.state.is_started = False
@@ -249,6 +249,7 @@ class Bridge(QObject):
         self._pending_restored_progress: dict | None = None
         self._pending_restore_key: str = ""
         self._current_shuffle_seed: int | None = None
+        self._current_shuffle_version: int | None = None  # 全文虚拟乱序的排列版本
         self._progress_key_text: str = ""  # 全文乱序前的原文，用于进度存储 key
         self._progress_key_override: str = ""  # 显式覆盖进度 key（如本地文库全文乱序）
         self._cached_devices: list[dict] | None = None
@@ -1423,16 +1424,26 @@ class Bridge(QObject):
                 saved_seed = None
                 if saved_progress:
                     saved_seed = saved_progress.get("shuffle_seed")
+                self._current_shuffle_version = None
+                usecase = self._text_adapter.text_session_usecase
                 if saved_seed is None:
                     saved_seed = random.randint(0, 2**31 - 1)
-                usecase = self._text_adapter.text_session_usecase
+                    if usecase:
+                        # 新 seed 使用当前排列版本
+                        usecase = usecase.shuffle_all_virtual(saved_seed)
+                elif usecase:
+                    # 恢复进度：按保存的版本复现同一排列（旧进度无版本字段）
+                    usecase = usecase.shuffle_all_virtual(
+                        saved_seed, saved_progress.get("shuffle_version")
+                    )
                 if usecase:
-                    shuffled_usecase = usecase.shuffle_all_virtual(saved_seed)
-                    self._text_adapter._text_session_usecase = shuffled_usecase
-                    result = shuffled_usecase.get_segment(segmentIndex, segmentSize)
+                    self._text_adapter._text_session_usecase = usecase
+                    result = usecase.get_segment(segmentIndex, segmentSize)
+                    self._current_shuffle_version = usecase.shuffle_version
                 self._current_shuffle_seed = saved_seed
                 if saved_progress:
                     saved_progress["shuffle_seed"] = saved_seed
+                    saved_progress["shuffle_version"] = self._current_shuffle_version
                 self._progress_key_override = _compute_progress_key(
                     "local_article", articleId
                 )
@@ -1535,6 +1546,8 @@ class Bridge(QObject):
             else:
                 seed = random.randint(0, 2**31 - 1)
             self._current_shuffle_seed = seed
+            # 练单器乱序不走 Feistel，无排列版本
+            self._current_shuffle_version = None
 
         self._trainer_adapter.loadTrainerSegment(
             trainerId,
@@ -1748,6 +1761,7 @@ class Bridge(QObject):
             rng.shuffle(chars)
             text = "".join(chars)
             self._current_shuffle_seed = seed
+            self._current_shuffle_version = None
             if progress_dict is not None:
                 progress_dict["shuffle_seed"] = seed
 
@@ -1914,6 +1928,7 @@ class Bridge(QObject):
                     ),
                     "slice_metrics": snapshot["slice_metrics"],
                     "shuffle_seed": self._current_shuffle_seed,
+                    "shuffle_version": self._current_shuffle_version,
                 }
                 log_info(
                     f"[collectSliceResult] saving key={text[:40]}... title={title}"
@@ -2034,31 +2049,21 @@ class Bridge(QObject):
         if not self._text_slice_progress_store:
             return None, ""
         store = self._text_slice_progress_store
-        data = store.load()
         hash_key = hashlib.sha256(progressKey.encode("utf-8")).hexdigest()
-        entry = data.get(hash_key)
-        if isinstance(entry, dict):
+        entry = store.get_by_hash_key(hash_key)
+        if entry is not None:
             log_info(
                 f"[_find_progress] hash HIT: key={progressKey[:40]} "
                 f"title={entry.get('text_title')} seed={entry.get('shuffle_seed')}"
             )
             return entry, hash_key
-        # 回退：按标题前缀扫描（兼容旧格式 key），取最新条目
+        # 回退：按标题前缀查找（兼容旧格式 key），取最新条目
         if title:
-            best: dict | None = None
-            best_key = ""
-            for key, item in data.items():
-                if isinstance(item, dict) and item.get("text_title", "").startswith(
-                    title
-                ):
-                    if best is None or item.get("last_accessed", "") > best.get(
-                        "last_accessed", ""
-                    ):
-                        best = item
-                        best_key = key
-            if best is not None:
+            found = store.find_latest_by_title_prefix(title)
+            if found is not None:
+                best_key, best = found
                 log_info(
-                    f"[_find_progress] title SCAN: key={progressKey[:40]} "
+                    f"[_find_progress] title PREFIX: key={progressKey[:40]} "
                     f"found={best.get('text_title')} seed={best.get('shuffle_seed')} "
                     f"last_accessed={best.get('last_accessed')}"
                 )
@@ -2259,6 +2264,7 @@ class Bridge(QObject):
         self._progress_key_text = ""
         self._progress_key_override = ""
         self._current_shuffle_seed = None
+        self._current_shuffle_version = None
         self._coordinator.exit_slice_mode(self)
 
     @Slot(float, int, int, int, str, str, bool, bool, float, int, int)
@@ -2878,18 +2884,11 @@ class Bridge(QObject):
         if not (self._text_adapter and self._text_adapter.runtime_config):
             return
         self._text_adapter.runtime_config.update_typing_history_max_records(max_records)
-        # 如果当前记录数超过新上限，截断
+        # 如果当前记录数超过新上限，立即删除超限记录
         if self._typing_history_gateway:
-            self._typing_history_gateway._max_records = (
+            self._typing_history_gateway.set_max_records(
                 self._text_adapter.runtime_config.typing_history_max_records
             )
-            # 立即截断超限记录
-            data = self._typing_history_gateway._load_normalized()
-            if len(data["records"]) > self._typing_history_gateway._max_records:
-                data["records"] = data["records"][
-                    : self._typing_history_gateway._max_records
-                ]
-                self._typing_history_gateway._store.save(data)
         self.typingHistoryChanged.emit()
 
     def _load_reader_font_path(self) -> str:
@@ -6,10 +6,12 @@ Supports:
 - Simultaneous output to console and rotating log file
 - Automatic log rotation (10MB per file, keep 5 backups)
 - Backward compatible with existing log_* API
+- Lazy formatting for hot paths: %-style args plus lazy() for expensive values
 """
 
 import logging
 import os
+from collections.abc import Callable
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Any
@@ -146,21 +148,45 @@ _setup_logging()
 _logger = logging.getLogger(__name__)
 
 
-# Backward compatible API - preserve all existing function signatures
-def log_debug(message: str) -> None:
-    _logger.debug(message)
+# Backward compatible API - preserve all existing function signatures.
+# 追加的 *args 走 logging 的延迟 %-格式化：级别未启用时不拼接字符串。
+def log_debug(message: str, *args: Any) -> None:
+    _logger.debug(message, *args)
 
 
-def log_info(message: str) -> None:
-    _logger.info(message)
+def log_info(message: str, *args: Any) -> None:
+    _logger.info(message, *args)
 
 
-def log_warning(message: str) -> None:
-    _logger.warning(message)
+def log_warning(message: str, *args: Any) -> None:
+    _logger.warning(message, *args)
 
 
-def log_error(message: str) -> None:
-    _logger.error(message)
+def log_error(message: str, *args: Any) -> None:
+    _logger.error(message, *args)
+
+
+class _Lazy:
+    """延迟求值的日志参数：只有记录真正被格式化时才调用 func。"""
+
+    __slots__ = ("_args", "_func")
+
+    def __init__(self, func: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        self._func = func
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._func(*self._args))
+
+    __repr__ = __str__
+
+
+def lazy(func: Callable[..., Any], *args: Any) -> _Lazy:
+    """包装昂贵的日志参数，例如 log_debug("pos=%s", lazy(sorted, positions))。
+
+    与 %-style 参数配合使用：DEBUG 未启用时 func 不会被调用。
+    """
+    return _Lazy(func, args)
 
 
 def get_log_level() -> str:
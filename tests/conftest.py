@@ -27,3 +27,12 @@ def _isolate_user_config(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
         "src.backend.config.runtime_config.user_config_dir",
         lambda: config_dir,
     )
+
+
+@pytest.fixture(autouse=True)
+def _isolate_article_meta_dir(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """本地文库元数据缓存默认写到用户 indexes 目录：同样重定向到临时目录。"""
+    monkeypatch.setattr(
+        "src.backend.integration.file_local_article_repository.user_indexes_dir",
+        lambda: tmp_path / "typetype-indexes",
+    )
@@ -1460,6 +1460,7 @@ def test_progress_key_consistency_between_save_and_lookup():
             "metrics": {},
             "slice_metrics": [],
             "shuffle_seed": 12345,
+            "shuffle_version": 2,
         }
         store.save_progress(key_from_qml, "前五百", progress_data)
 
@@ -1472,6 +1473,7 @@ def test_progress_key_consistency_between_save_and_lookup():
         assert entry["text_title"] == "前五百"
         assert entry["current_slice"] == 3
         assert entry["shuffle_seed"] == 12345
+        assert entry["shuffle_version"] == 2
 
         # 4. 验证 delete_by_hash_key 能正确删除
         store.delete_by_hash_key(hash_key)
@@ -0,0 +1,48 @@
+"""Tests for CharStat and the columnar CharStatTable."""
+
+import pytest
+
+from src.backend.models.entity.char_stat import CharStat, CharStatTable
+from src.backend.models.entity.session_stat import SessionStat
+
+
+def test_entities_are_slotted():
+    assert not hasattr(CharStat("字"), "__dict__")
+    assert not hasattr(SessionStat(), "__dict__")
+    with pytest.raises(AttributeError):
+        CharStat("字").unknown = 1
+
+
+def test_accumulate_does_not_touch_last_seen():
+    stat = CharStat("字", last_seen="2026-01-01 00:00:00")
+    stat.accumulate(120.0, False)
+    assert stat.last_seen == "2026-01-01 00:00:00"
+
+
+def test_table_accumulate_matches_entity():
+    samples = [(120.0, False), (80.0, False), (300.0, True), (60.0, False)]
+    entity = CharStat("字", char_count=2, total_ms=400.0, min_ms=150.0, max_ms=250.0)
+    table = CharStatTable()
+    slot = table.put(
+        CharStat("字", char_count=2, total_ms=400.0, min_ms=150.0, max_ms=250.0)
+    )
+
+    for ms, is_error in samples:
+        entity.accumulate(ms, is_error)
+        table.accumulate(slot, ms, is_error)
+
+    assert table.materialize(slot) == entity
+
+
+def test_table_reuses_removed_slots():
+    table = CharStatTable()
+    first = table.put(CharStat("甲", char_count=3))
+    table.put(CharStat("乙"))
+    table.remove("甲")
+
+    reused = table.put(CharStat("丙", char_count=1))
+
+    assert reused == first
+    assert "甲" not in table
+    assert table.get("丙").char_count == 1
+    assert len(table) == 2
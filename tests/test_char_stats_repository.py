@@ -1,7 +1,10 @@
 import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 
+import pytest
+
 from src.backend.integration.sqlite_char_stats_repository import (
     SqliteCharStatsRepository,
 )
@@ -91,6 +94,61 @@ class TestSqliteCharStatsRepository:
         repo, path = self._create_repo()
         assert repo.get("Z") is None
 
+    def test_connection_uses_wal_and_normal_sync(self):
+        repo, _ = self._create_repo()
+        conn = repo._connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # synchronous: 0=OFF 1=NORMAL 2=FULL
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_connection_reused_within_thread(self):
+        repo, _ = self._create_repo()
+        first = repo._connection()
+        repo.save(CharStat(char="A", char_count=1))
+        repo.get("A")
+        repo.get_batch(["A", "B"])
+        assert repo._connection() is first
+
+    def test_worker_threads_share_one_connection(self):
+        repo, _ = self._create_repo()
+        main_conn = repo._connection()
+        seen: list = []
+
+        def worker(char: str):
+            repo.save_batch([CharStat(char=char, char_count=4)])
+            seen.append(repo._connection())
+
+        # 线程池线程空闲回收后重建：每个新线程都不应再多开连接
+        for char in "WXYZ":
+            t = threading.Thread(target=worker, args=(char,))
+            t.start()
+            t.join()
+        assert all(conn is main_conn for conn in seen)
+        assert [repo.get(c).char_count for c in "WXYZ"] == [4, 4, 4, 4]
+
+    def test_close_waits_for_in_flight_read(self):
+        repo, _ = self._create_repo()
+        repo.save(CharStat(char="A", char_count=2))
+        closed = threading.Event()
+        with repo._lock:
+            t = threading.Thread(target=lambda: (repo.close(), closed.set()))
+            t.start()
+            # 读取持锁期间 close() 必须等待
+            assert not closed.wait(0.1)
+            assert repo.get("A").char_count == 2
+        t.join(5)
+        assert closed.is_set()
+
+    def test_close_closes_shared_connection_and_reopens_lazily(self):
+        repo, _ = self._create_repo()
+        repo.save(CharStat(char="A", char_count=2))
+        conn = repo._connection()
+        repo.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        assert repo.get("A").char_count == 2
+        repo.close()
+
 
 class TestNoopCharStatsRepository:
     def test_all_noop(self):
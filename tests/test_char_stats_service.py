@@ -0,0 +1,210 @@
+"""Tests for CharStatsService cache prefetch and hit accounting."""
+
+import tempfile
+
+from src.backend.domain.services.char_stats_service import CharStatsService
+from src.backend.domain.services.typing_service import TypingService
+from src.backend.integration.sqlite_char_stats_repository import (
+    SqliteCharStatsRepository,
+)
+from src.backend.models.entity.char_stat import CharStat
+
+
+class CountingRepository(SqliteCharStatsRepository):
+    """SQLite 仓储 + 读取调用计数。"""
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        self.get_calls = 0
+        self.get_batch_calls = 0
+
+    def get(self, char: str) -> CharStat | None:
+        self.get_calls += 1
+        return super().get(char)
+
+    def get_batch(self, chars: list[str]) -> list[CharStat]:
+        self.get_batch_calls += 1
+        return super().get_batch(chars)
+
+
+class DeferredExecutor:
+    """收集任务，由测试显式执行（模拟工作线程）。"""
+
+    def __init__(self):
+        self.tasks = []
+
+    def submit(self, task) -> None:
+        self.tasks.append(task)
+
+    def run_all(self) -> None:
+        while self.tasks:
+            self.tasks.pop(0)()
+
+
+def _repo() -> CountingRepository:
+    return CountingRepository(tempfile.mktemp(suffix=".db"))
+
+
+def test_prefetch_loads_distinct_chars_in_one_batch():
+    repo = _repo()
+    repo.init_db()
+    repo.save(CharStat(char="中", char_count=7, error_char_count=2))
+    service = CharStatsService(repository=repo)
+
+    service.prefetch("中国中国人")
+
+    assert repo.get_batch_calls == 1
+    assert service.get_all()["中"].char_count == 7
+    assert service.get_all()["人"].char_count == 0
+
+
+def test_accumulate_after_prefetch_never_hits_disk():
+    repo = _repo()
+    service = CharStatsService(repository=repo)
+    service.prefetch("打字练习")
+
+    for ch in "打字练习":
+        service.accumulate(ch, 100.0, False)
+
+    assert repo.get_calls == 0
+    assert service.cache_stats()["hits"] == 4
+    assert service.cache_stats()["cold_misses"] == 0
+
+
+def test_accumulate_without_prefetch_counts_cold_miss():
+    repo = _repo()
+    service = CharStatsService(repository=repo)
+
+    service.accumulate("冷", 100.0, False)
+    service.accumulate("冷", 100.0, False)
+
+    assert repo.get_calls == 1
+    assert service.cache_stats()["cold_misses"] == 1
+    assert service.cache_stats()["hits"] == 1
+
+
+def test_async_prefetch_does_not_overwrite_accumulated_stats():
+    repo = _repo()
+    repo.init_db()
+    repo.save(CharStat(char="快", char_count=3))
+    executor = DeferredExecutor()
+    service = CharStatsService(repository=repo, async_executor=executor)
+
+    service.prefetch("快慢")
+    # 预取任务尚未在工作线程执行时用户已经开始打字
+    service.accumulate("快", 100.0, False)
+    executor.run_all()
+
+    assert service.get_all()["快"].char_count == 4
+    assert "慢" in service.get_all()
+
+
+def test_typing_service_prefetches_plain_doc():
+    repo = _repo()
+    service = CharStatsService(repository=repo)
+    typing = TypingService(char_stats_service=service)
+    typing.set_plain_doc("载文预取")
+
+    typing.prefetch_char_stats()
+
+    assert set("载文预取") <= set(service.get_all())
+
+
+def test_repository_get_batch_splits_large_in_queries():
+    repo = _repo()
+    repo.init_db()
+    chars = [chr(0x4E00 + i) for i in range(1200)]
+    repo.save_batch([CharStat(char=c, char_count=1) for c in chars])
+
+    loaded = repo.get_batch(chars)
+
+    assert len(loaded) == 1200
+
+
+def _cjk(n: int) -> list[str]:
+    return [chr(0x4E00 + i) for i in range(n)]
+
+
+def test_cache_is_bounded_after_flush():
+    repo = _repo()
+    service = CharStatsService(repository=repo, cache_capacity=500)
+
+    for ch in _cjk(800):
+        service.accumulate(ch, 100.0, False)
+    # 全部为脏数据：落盘前不允许淘汰
+    assert service.cache_stats()["size"] == 800
+    assert service.cache_stats()["evictions"] == 0
+
+    service.flush()
+
+    stats = service.cache_stats()
+    assert stats["size"] == 500
+    assert stats["evictions"] == 300
+    assert stats["capacity"] == 500
+
+
+def test_evicts_least_recently_used_first():
+    repo = _repo()
+    service = CharStatsService(repository=repo, cache_capacity=500)
+    chars = _cjk(500)
+    service.warm_chars(chars)
+    # 触碰第一个字，使其成为最近使用
+    service.accumulate(chars[0], 100.0, False)
+    service.flush()
+
+    service.warm_chars(["新"])
+
+    cached = service.get_all()
+    assert chars[0] in cached
+    assert chars[1] not in cached
+    assert "新" in cached
+
+
+def test_pending_async_writes_are_not_evicted():
+    repo = _repo()
+    executor = DeferredExecutor()
+    service = CharStatsService(
+        repository=repo, async_executor=executor, cache_capacity=500
+    )
+    for ch in _cjk(600):
+        service.accumulate(ch, 100.0, False)
+    service.flush_async()
+
+    # 写入还在队列里：即使超出容量也不能淘汰
+    service.warm_chars(["新"])
+    assert service.cache_stats()["size"] == 601
+
+    executor.run_all()
+    assert service.cache_stats()["size"] == 500
+
+
+def test_evicted_stats_reload_with_flushed_values():
+    repo = _repo()
+    service = CharStatsService(repository=repo, cache_capacity=500)
+    chars = _cjk(700)
+    service.accumulate(chars[0], 100.0, True)
+    for ch in chars[1:]:
+        service.accumulate(ch, 100.0, False)
+    service.flush()
+    assert chars[0] not in service.get_all()
+
+    service.accumulate(chars[0], 100.0, False)
+
+    reloaded = service.get_all()[chars[0]]
+    assert reloaded.char_count == 2
+    assert reloaded.error_char_count == 1
+
+
+def test_flush_stamps_last_seen_once_per_batch():
+    repo = _repo()
+    service = CharStatsService(repository=repo)
+    for ch in "打字":
+        service.accumulate(ch, 100.0, False)
+    assert service.get_all()["打"].last_seen == ""
+
+    service.flush()
+
+    stamped = {s.char: s.last_seen for s in repo.get_all()}
+    assert stamped["打"] != ""
+    assert stamped["打"] == stamped["字"]
+    assert service.get_all()["打"].last_seen == stamped["打"]
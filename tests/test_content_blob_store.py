@@ -0,0 +1,93 @@
+"""ContentBlobStore：内容寻址 + 压缩 + 去重 + LRU 回收。"""
+
+import os
+import threading
+import time
+import zlib
+
+from src.backend.integration import content_blob_store as cbs
+from src.backend.integration.content_blob_store import ContentBlobStore
+
+
+def _age(path, seconds_old: float) -> None:
+    old = time.time() - seconds_old
+    os.utime(path, (old, old))
+
+
+def test_put_get_roundtrip_is_compressed(tmp_path):
+    store = ContentBlobStore(tmp_path / "blobs")
+    data = ("春眠不觉晓，处处闻啼鸟。" * 500).encode("utf-8")
+
+    digest = store.put(data)
+
+    assert digest == ContentBlobStore.digest(data)
+    path = store.path_for(digest)
+    assert path.parent.name == digest[:2]
+    assert path.stat().st_size < len(data) // 10
+    assert zlib.decompress(path.read_bytes()) == data
+    assert store.get(digest) == data
+
+
+def test_identical_content_stored_once(tmp_path):
+    store = ContentBlobStore(tmp_path / "blobs")
+    data = b'{"content":"same"}'
+
+    first = store.put(data)
+    total = store.total_bytes()
+    second = store.put(data)
+
+    assert first == second
+    assert store.total_bytes() == total
+    assert len(list((tmp_path / "blobs").rglob("*.z"))) == 1
+
+
+def test_concurrent_puts_of_new_content_count_once(tmp_path, monkeypatch):
+    store = ContentBlobStore(tmp_path / "blobs")
+    assert store.total_bytes() == 0
+    data = b'{"content":"race"}'
+    barrier = threading.Barrier(2, timeout=5)
+    compress = zlib.compress
+
+    def racing_compress(raw, level):
+        # 两个线程都越过去重检查后才继续落盘
+        barrier.wait()
+        return compress(raw, level)
+
+    monkeypatch.setattr(cbs.zlib, "compress", racing_compress)
+    threads = [threading.Thread(target=store.put, args=(data,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    path = store.path_for(ContentBlobStore.digest(data))
+    assert store.total_bytes() == path.stat().st_size
+    assert list((tmp_path / "blobs").rglob("*.tmp")) == []
+
+
+def test_missing_and_corrupt_blobs_read_as_none(tmp_path):
+    store = ContentBlobStore(tmp_path / "blobs")
+    digest = store.put(b"payload")
+    assert store.get("0" * 64) is None
+
+    store.path_for(digest).write_bytes(b"not zlib")
+
+    assert store.get(digest) is None
+    assert not store.path_for(digest).exists()
+
+
+def test_gc_evicts_least_recently_used_first(tmp_path):
+    store = ContentBlobStore(tmp_path / "blobs", max_bytes=10_000, compress_level=0)
+    digests = [store.put(os.urandom(3_000)) for _ in range(3)]
+    _age(store.path_for(digests[0]), 300)
+    _age(store.path_for(digests[1]), 600)
+    _age(store.path_for(digests[2]), 900)
+    # 读取刷新 LRU 时间戳：最旧的 digests[2] 变为最近使用
+    assert store.get(digests[2]) is not None
+
+    newest = store.put(os.urandom(3_000))
+
+    assert store.total_bytes() <= 10_000
+    assert store.get(digests[1]) is None
+    assert store.get(digests[2]) is not None
+    assert store.get(newest) is not None
@@ -0,0 +1,167 @@
+"""Tests for FileSegmentProvider's exact binary sparse index."""
+
+import os
+import random
+
+import pytest
+
+from src.backend.integration import file_segment_provider as fsp
+from src.backend.integration.file_segment_provider import FileSegmentProvider
+
+
+def _mixed_text(n: int) -> str:
+    rng = random.Random(7)
+    alphabet = "ab1 ,。中文打字練習😀\n"
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def _provider(path, index_dir, threshold=1000):
+    return FileSegmentProvider(
+        path, small_file_threshold=threshold, index_dir=index_dir
+    )
+
+
+@pytest.fixture
+def big_file(tmp_path):
+    text = _mixed_text(200_000)
+    path = tmp_path / "novel.txt"
+    path.write_text(text, encoding="utf-8")
+    return path, text
+
+
+def test_random_segments_match_exact_slices(big_file, tmp_path):
+    path, text = big_file
+    provider = _provider(path, tmp_path / "idx")
+
+    assert provider.get_total_chars() == len(text)
+    rng = random.Random(1)
+    for _ in range(200):
+        start = rng.randrange(0, len(text))
+        length = rng.randrange(1, 3000)
+        assert provider.get_segment(start, length) == text[start : start + length]
+    assert provider.get_segment(len(text) - 5, 100) == text[-5:]
+    assert provider.get_segment(len(text), 10) == ""
+
+
+def test_get_chars_gathers_random_indices_in_request_order(big_file, tmp_path):
+    path, text = big_file
+    provider = _provider(path, tmp_path / "idx")
+    rng = random.Random(3)
+    indices = [rng.randrange(0, len(text)) for _ in range(500)]
+    indices += [indices[0], len(text) - 1, 0, -1, len(text)]
+
+    expected = "".join(text[i] for i in indices if 0 <= i < len(text))
+    assert provider.get_chars(indices) == expected
+    assert provider.get_chars([]) == ""
+
+
+def test_get_chars_reuses_one_handle(big_file, tmp_path, monkeypatch):
+    path, text = big_file
+    provider = _provider(path, tmp_path / "idx")
+    provider.get_total_chars()
+    opens = []
+    original_open = type(path).open
+
+    def counting_open(self, *args, **kwargs):
+        opens.append(self)
+        return original_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(path), "open", counting_open)
+    indices = list(range(0, len(text), 997))
+
+    assert provider.get_chars(indices) == "".join(text[i] for i in indices)
+    assert len(opens) == 1
+
+
+def test_index_is_loaded_from_binary_cache_on_open(big_file, tmp_path, monkeypatch):
+    path, text = big_file
+    index_dir = tmp_path / "idx"
+    _provider(path, index_dir).get_total_chars()
+    assert [p.suffix for p in index_dir.iterdir()] == [".idx"]
+
+    def _no_scan(self):
+        raise AssertionError("index should come from cache")
+
+    monkeypatch.setattr(FileSegmentProvider, "_build_index", _no_scan)
+    reopened = _provider(path, index_dir)
+
+    assert reopened.get_total_chars() == len(text)
+    assert reopened.get_segment(123_456, 50) == text[123_456:123_506]
+
+
+def test_cache_is_invalidated_when_file_changes(big_file, tmp_path):
+    path, text = big_file
+    index_dir = tmp_path / "idx"
+    _provider(path, index_dir).get_total_chars()
+
+    changed = "新" + text
+    path.write_text(changed, encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    reopened = _provider(path, index_dir)
+
+    assert reopened.get_total_chars() == len(changed)
+    assert reopened.get_segment(0, 3) == changed[:3]
+
+
+def test_segment_read_is_one_bounded_read(big_file, tmp_path, monkeypatch):
+    path, text = big_file
+    provider = _provider(path, tmp_path / "idx")
+    provider.get_total_chars()
+    reads = []
+    real_open = type(path).open
+
+    def _tracking_open(self, *args, **kwargs):
+        handle = real_open(self, *args, **kwargs)
+        real_read = handle.read
+
+        def _read(size=-1):
+            data = real_read(size)
+            reads.append(len(data))
+            return data
+
+        handle.read = _read
+        return handle
+
+    monkeypatch.setattr(type(path), "open", _tracking_open)
+    segment = provider.get_segment(150_000, 500)
+
+    assert segment == text[150_000:150_500]
+    assert len(reads) == 1
+    assert reads[0] <= 500 * 4 + 2 * fsp._CHUNK_BYTES
+
+
+def test_utf16_with_bom_decodes_from_mid_file(tmp_path):
+    text = _mixed_text(60_000)
+    path = tmp_path / "utf16.txt"
+    path.write_bytes(text.encode("utf-16"))
+    provider = _provider(path, tmp_path / "idx")
+    provider._encoding = "utf-16"
+
+    assert provider.get_total_chars() == len(text)
+    assert provider.get_segment(40_000, 20) == text[40_000:40_020]
+
+
+def test_small_file_is_loaded_into_memory_without_index(tmp_path):
+    path = tmp_path / "short.txt"
+    path.write_text("你好世界", encoding="utf-8")
+    index_dir = tmp_path / "idx"
+    provider = _provider(path, index_dir)
+
+    assert provider.get_segment(1, 2) == "好世"
+    assert not index_dir.exists()
+
+
+@pytest.mark.parametrize("threshold", [1000, 10**9], ids=["indexed", "in_memory"])
+def test_utf8_bom_is_not_counted_as_a_character(tmp_path, threshold):
+    text = _mixed_text(60_000)
+    path = tmp_path / "bom.txt"
+    path.write_bytes(b"\xef\xbb\xbf" + text.encode("utf-8"))
+    provider = _provider(path, tmp_path / "idx", threshold=threshold)
+
+    assert provider.get_total_chars() == len(text)
+    assert provider.get_segment(0, 5) == text[:5]
+    assert provider.get_segment(40_000, 20) == text[40_000:40_020]
+    assert provider.get_chars([0, 59_999, 12_345]) == (
+        text[0] + text[59_999] + text[12_345]
+    )
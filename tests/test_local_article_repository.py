@@ -1,8 +1,11 @@
 import json
+import os
+import threading
 from pathlib import Path
 
 import pytest
 
+from src.backend.integration import file_local_article_repository as flar
 from src.backend.integration.file_local_article_repository import (
     FileLocalArticleRepository,
 )
@@ -134,6 +137,127 @@ def test_load_article_segment_supports_gb18030(tmp_path: Path):
     assert repository.load_article_segment(article_id, 1, 2) == "乙丙"
 
 
+def test_load_article_segment_seeks_from_sparse_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(flar, "_SCAN_CHUNK_BYTES", 5)
+    article_dir = tmp_path / "articles"
+    article_dir.mkdir()
+    text = "甲乙\r\n丙丁\r戊己\n" * 40
+    (article_dir / "crlf.txt").write_bytes(text.encode("gb18030"))
+    repository = FileLocalArticleRepository(article_dir)
+    article_id = repository.make_article_id("crlf.txt")
+    expected = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    assert repository.count_article_chars(article_id) == len(expected)
+    for start in range(0, len(expected) + 3, 7):
+        assert (
+            repository.load_article_segment(article_id, start, 11)
+            == (expected[start : start + 11])
+        )
+
+
+def test_article_metadata_is_cached_until_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    article_dir = tmp_path / "articles"
+    article_dir.mkdir()
+    article_file = article_dir / "cached.txt"
+    article_file.write_text("甲乙丙", encoding="utf-8")
+    scans: list[str] = []
+    original_index = FileLocalArticleRepository._index_article
+
+    def counting_index(self, path: Path, *args):
+        scans.append(path.name)
+        return original_index(self, path, *args)
+
+    monkeypatch.setattr(FileLocalArticleRepository, "_index_article", counting_index)
+
+    assert FileLocalArticleRepository(article_dir).list_articles()[0].char_count == 3
+    # 新实例从元数据文件读出字数，不再解码
+    repository = FileLocalArticleRepository(article_dir)
+    assert repository.list_articles()[0].char_count == 3
+    assert scans == ["cached.txt"]
+
+    article_file.write_text("甲乙丙丁戊", encoding="utf-8")
+
+    assert repository.list_articles()[0].char_count == 5
+    assert scans == ["cached.txt", "cached.txt"]
+    meta = json.loads(repository._meta_path().read_text("utf-8"))
+    assert meta["cached.txt"]["char_count"] == 5
+    assert meta["cached.txt"]["encoding"] == "utf-8"
+    assert sorted(p.name for p in article_dir.iterdir()) == ["cached.txt"]
+
+
+def test_legacy_metadata_in_article_dir_is_migrated(tmp_path: Path) -> None:
+    article_dir = tmp_path / "articles"
+    article_dir.mkdir()
+    article_file = article_dir / "old.txt"
+    article_file.write_text("甲乙", encoding="utf-8")
+    stat = article_file.stat()
+    legacy = article_dir / FileLocalArticleRepository.LEGACY_META_FILENAME
+    legacy.write_text(
+        json.dumps(
+            {
+                "old.txt": {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "encoding": "utf-8",
+                    "char_count": 99,
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    repository = FileLocalArticleRepository(article_dir, index_dir=tmp_path / "idx")
+
+    # 沿用旧缓存（故意写错的字数证明没有重新解码），随后旧文件被移走
+    assert repository.list_articles()[0].char_count == 99
+    assert not legacy.exists()
+    assert (
+        json.loads(repository._meta_path().read_text("utf-8"))["old.txt"]["char_count"]
+        == 99
+    )
+
+
+def test_decoding_one_article_does_not_block_other_lookups(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    article_dir = tmp_path / "articles"
+    article_dir.mkdir()
+    (article_dir / "big.txt").write_text("大" * 10, encoding="utf-8")
+    (article_dir / "small.txt").write_text("小", encoding="utf-8")
+    repository = FileLocalArticleRepository(article_dir)
+    small_id = repository.make_article_id("small.txt")
+    repository.count_article_chars(small_id)
+    entered = threading.Event()
+    release = threading.Event()
+    original_index = FileLocalArticleRepository._index_article
+
+    def slow_index(self, path: Path, *args):
+        if path.name == "big.txt":
+            entered.set()
+            release.wait(5)
+        return original_index(self, path, *args)
+
+    monkeypatch.setattr(FileLocalArticleRepository, "_index_article", slow_index)
+    lister = threading.Thread(target=repository.list_articles)
+    lister.start()
+    try:
+        assert entered.wait(5)
+        # big.txt 正在解码：其他文章的元数据查找照常返回
+        looked_up = threading.Thread(
+            target=repository.count_article_chars, args=(small_id,)
+        )
+        looked_up.start()
+        looked_up.join(1)
+        assert not looked_up.is_alive()
+    finally:
+        release.set()
+        lister.join(5)
+    assert [item.char_count for item in repository.list_articles()] == [10, 1]
+
+
 def test_get_article_metadata_does_not_decode_other_articles(tmp_path: Path):
     article_dir = tmp_path / "articles"
     article_dir.mkdir()
@@ -172,3 +296,92 @@ def test_corrupt_progress_file_is_ignored(tmp_path: Path):
     repository = FileLocalArticleRepository(article_dir)
 
     assert repository.load_current_segment("article-1") is None
+
+
+def test_article_id_index_rescans_only_changed_directories(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(flar, "_RACY_MTIME_S", 0)
+    article_dir = tmp_path / "articles"
+    (article_dir / "a").mkdir(parents=True)
+    (article_dir / "b").mkdir()
+    (article_dir / "a" / "one.txt").write_text("一", encoding="utf-8")
+    (article_dir / "b" / "two.txt").write_text("二二", encoding="utf-8")
+    repository = FileLocalArticleRepository(article_dir)
+    rescanned: list[str] = []
+    original_rescan = FileLocalArticleRepository._rescan_dir
+
+    def recording_rescan(self, rel_dir, entry, mtime_ns):
+        rescanned.append(rel_dir)
+        return original_rescan(self, rel_dir, entry, mtime_ns)
+
+    monkeypatch.setattr(FileLocalArticleRepository, "_rescan_dir", recording_rescan)
+    one_id = repository.make_article_id("a/one.txt")
+
+    assert repository.count_article_chars(one_id) == 1
+    assert sorted(rescanned) == ["", "a", "b"]
+    rescanned.clear()
+    # 命中：不再遍历目录
+    assert repository.count_article_chars(one_id) == 1
+    assert rescanned == []
+
+    (article_dir / "b" / "three.txt").write_text("三三三", encoding="utf-8")
+    os.utime(article_dir / "b", ns=(0, 0))
+    three_id = repository.make_article_id("b/three.txt")
+
+    assert repository.count_article_chars(three_id) == 3
+    # 元数据写在文库目录之外：根目录 mtime 不变，只重扫有变化的 b
+    assert rescanned == ["b"]
+
+    (article_dir / "a" / "one.txt").unlink()
+    with pytest.raises(FileNotFoundError, match="unknown article_id"):
+        repository.count_article_chars(one_id)
+
+
+def test_renamed_article_resolves_under_new_id(tmp_path: Path):
+    article_dir = tmp_path / "articles"
+    article_dir.mkdir()
+    (article_dir / "old.txt").write_text("正文", encoding="utf-8")
+    repository = FileLocalArticleRepository(article_dir)
+    old_id = repository.make_article_id("old.txt")
+    assert repository.resolve_article_path(old_id) is not None
+
+    assert repository.rename_article(old_id, "new")
+
+    assert repository.resolve_article_path(old_id) is None
+    new_id = repository.make_article_id("new.txt")
+    assert repository.load_article_content(new_id) == "正文"
+    assert [item.title for item in repository.list_articles()] == ["new"]
+
+
+def test_unknown_article_id_does_not_rescan_every_lookup(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(flar, "_RACY_MTIME_S", 0)
+    article_dir = tmp_path / "articles"
+    (article_dir / "a").mkdir(parents=True)
+    (article_dir / "a" / "one.txt").write_text("一", encoding="utf-8")
+    repository = FileLocalArticleRepository(article_dir)
+    repository.list_articles()
+    rescanned: list[str] = []
+    original_rescan = FileLocalArticleRepository._rescan_dir
+
+    def recording_rescan(self, rel_dir, entry, mtime_ns):
+        rescanned.append(rel_dir)
+        return original_rescan(self, rel_dir, entry, mtime_ns)
+
+    monkeypatch.setattr(FileLocalArticleRepository, "_rescan_dir", recording_rescan)
+
+    assert repository.resolve_article_path("missing-000000000000") is None
+    assert rescanned.count("a") == 1  # 首次未命中：全量重扫一次
+    rescanned.clear()
+    for _ in range(3):
+        assert repository.resolve_article_path("missing-000000000000") is None
+    assert rescanned == []
+
+    # 目录变化后未命中缓存失效，新文件按 id 可查到
+    (article_dir / "a" / "two.txt").write_text("二", encoding="utf-8")
+    os.utime(article_dir / "a", ns=(0, 0))
+    two_id = repository.make_article_id("a/two.txt")
+    assert repository.resolve_article_path(two_id) is not None
+    assert "a" in rescanned
@@ -84,3 +84,42 @@ def test_qt_message_handler_suppresses_macos_keymapper_mismatch_noise(
     )
 
     assert messages == []
+
+
+def test_lazy_argument_not_evaluated_when_debug_disabled(monkeypatch) -> None:
+    calls: list[int] = []
+
+    def expensive(value: set[int]) -> list[int]:
+        calls.append(1)
+        return sorted(value)
+
+    monkeypatch.setattr(logger_module._logger, "level", logging.WARNING)
+    logger_module._logger.manager._clear_cache()
+    try:
+        logger_module.log_debug(
+            "positions=%s", logger_module.lazy(expensive, {3, 1, 2})
+        )
+    finally:
+        logger_module._logger.manager._clear_cache()
+
+    assert calls == []
+
+
+def test_lazy_argument_formats_when_debug_enabled(monkeypatch) -> None:
+    records: list[str] = []
+
+    class Capture(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            records.append(record.getMessage())
+
+    handler = Capture(level=logging.DEBUG)
+    logger_module._logger.addHandler(handler)
+    monkeypatch.setattr(logger_module._logger, "level", logging.DEBUG)
+    logger_module._logger.manager._clear_cache()
+    try:
+        logger_module.log_debug("positions=%s", logger_module.lazy(sorted, {3, 1, 2}))
+    finally:
+        logger_module._logger.removeHandler(handler)
+        logger_module._logger.manager._clear_cache()
+
+    assert records == ["positions=[1, 2, 3]"]
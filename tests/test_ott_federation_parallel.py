@@ -0,0 +1,197 @@
+"""Tests for bounded-parallel federation materialization."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from src.backend.config.runtime_config import (
+    OttConfig,
+    RuntimeConfig,
+    SourceReposConfig,
+)
+from src.backend.integration.ott_federation_provider import OttFederationProvider
+
+
+class _SlowClient:
+    """按固定延迟返回条目的假 client，记录同主机并发峰值。"""
+
+    def __init__(self, authority, host, delay, entries=None, tracker=None):
+        self.authority = authority
+        self.host_key = host
+        self._delay = delay
+        self._entries = entries
+        self._tracker = tracker
+
+    def list_entries(self, force=False):
+        if self._tracker is not None:
+            self._tracker.enter(self.host_key)
+        try:
+            time.sleep(self._delay)
+        finally:
+            if self._tracker is not None:
+                self._tracker.leave(self.host_key)
+        if self._entries is None:
+            return None
+        return [dict(e) for e in self._entries]
+
+
+class _HostTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+
+    def enter(self, host):
+        with self._lock:
+            self.current[host] = self.current.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.current[host])
+
+    def leave(self, host):
+        with self._lock:
+            self.current[host] -= 1
+
+
+def _provider(clients, **ott_overrides):
+    config = MagicMock(spec=RuntimeConfig)
+    config.ott = OttConfig(**ott_overrides)
+    config.source_repos = SourceReposConfig(repos=[])
+    provider = OttFederationProvider(
+        runtime_config=config,
+        manifest_cache=MagicMock(),
+    )
+    provider._build_clients = lambda: clients
+    return provider
+
+
+def _entry(entry_id):
+    return {"entry_id": entry_id}
+
+
+def test_parallel_refresh_takes_about_the_slowest_source():
+    clients = {
+        f"a{i}": _SlowClient(f"a{i}", f"h{i}.example.org", 0.3, [_entry(f"e{i}")])
+        for i in range(5)
+    }
+    provider = _provider(clients)
+
+    start = time.monotonic()
+    entries = provider.list_all_entries()
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.0
+    # 合并顺序与 clients 声明顺序一致，而非完成顺序
+    assert [e["entry_id"] for e in entries] == [f"e{i}" for i in range(5)]
+    assert provider._last_list_ok == list(clients)
+    assert provider._last_list_failed == []
+
+
+def test_deterministic_order_despite_completion_order():
+    clients = {
+        "slow": _SlowClient("slow", "a.example.org", 0.3, [_entry("s")]),
+        "fast": _SlowClient("fast", "b.example.org", 0.0, [_entry("f")]),
+    }
+    provider = _provider(clients)
+
+    entries = provider.list_all_entries()
+
+    assert [e["entry_id"] for e in entries] == ["s", "f"]
+    assert provider._last_list_ok == ["slow", "fast"]
+
+
+def test_source_over_deadline_counts_as_failed():
+    clients = {
+        "stuck": _SlowClient("stuck", "a.example.org", 3.0, [_entry("x")]),
+        "down": _SlowClient("down", "b.example.org", 0.0, None),
+        "ok": _SlowClient("ok", "c.example.org", 0.0, [_entry("y")]),
+    }
+    provider = _provider(clients, list_source_deadline_seconds=1)
+
+    start = time.monotonic()
+    entries = provider.list_all_entries()
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 2.0
+    assert [e["entry_id"] for e in entries] == ["y"]
+    assert provider._last_list_ok == ["ok"]
+    assert provider._last_list_failed == ["stuck", "down"]
+
+
+def test_per_host_concurrency_is_capped():
+    tracker = _HostTracker()
+    clients = {
+        f"s{i}": _SlowClient(f"s{i}", "same.example.org", 0.1, [], tracker)
+        for i in range(6)
+    }
+    clients["other"] = _SlowClient("other", "other.example.org", 0.1, [], tracker)
+    provider = _provider(clients, list_per_host_concurrency=2)
+
+    provider.list_all_entries()
+
+    assert tracker.peak["same.example.org"] == 2
+    assert provider._last_list_ok == list(clients)
+
+
+def test_concurrency_one_keeps_sequential_path():
+    tracker = _HostTracker()
+    clients = {
+        f"s{i}": _SlowClient(f"s{i}", f"h{i}.example.org", 0.05, [], tracker)
+        for i in range(3)
+    }
+    provider = _provider(clients, list_concurrency=1)
+
+    provider.list_all_entries()
+
+    assert all(peak == 1 for peak in tracker.peak.values())
+    assert sum(tracker.current.values()) == 0
+
+
+def test_overdue_source_keeps_host_slot_until_it_finishes():
+    tracker = _HostTracker()
+    clients = {
+        "slow": _SlowClient("slow", "same.example.org", 0.3, [], tracker),
+        "stuck": _SlowClient("stuck", "same.example.org", 1.6, [], tracker),
+        "other": _SlowClient("other", "other.example.org", 0.0, [], tracker),
+        "next": _SlowClient("next", "same.example.org", 0.0, [_entry("n")], tracker),
+    }
+    provider = _provider(
+        clients, list_per_host_concurrency=2, list_source_deadline_seconds=1
+    )
+
+    provider.list_all_entries()
+
+    # stuck 判超时后线程仍在跑、仍占名额：next 只用 slow 归还的名额，
+    # 同主机并发从未超过上限
+    assert tracker.peak["same.example.org"] == 2
+    assert provider._last_list_ok == ["slow", "other", "next"]
+    assert provider._last_list_failed == ["stuck"]
+
+
+def test_source_queued_behind_hung_same_host_source_times_out():
+    clients = {
+        "hung": _SlowClient("hung", "same.example.org", 5.0, [_entry("h")]),
+        "queued": _SlowClient("queued", "same.example.org", 0.0, [_entry("q")]),
+        "ok": _SlowClient("ok", "other.example.org", 0.0, [_entry("y")]),
+    }
+    provider = _provider(
+        clients, list_per_host_concurrency=1, list_source_deadline_seconds=1
+    )
+
+    start = time.monotonic()
+    entries = provider.list_all_entries()
+    elapsed = time.monotonic() - start
+
+    # 排队源从刷新开始计时：不会跟着卡死源无限等下去
+    assert elapsed < 2.0
+    assert [e["entry_id"] for e in entries] == ["y"]
+    assert provider._last_list_ok == ["ok"]
+    assert provider._last_list_failed == ["hung", "queued"]
+
+
+def test_default_deadline_covers_script_download_and_exec():
+    from src.backend.integration.ott_script_client import (
+        SCRIPT_DOWNLOAD_TIMEOUT_S,
+        SCRIPT_EXEC_TIMEOUT_S,
+    )
+
+    deadline = OttConfig().list_source_deadline_seconds
+    assert deadline > SCRIPT_DOWNLOAD_TIMEOUT_S + SCRIPT_EXEC_TIMEOUT_S
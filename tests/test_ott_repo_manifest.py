@@ -1,6 +1,7 @@
 """OTT Repo manifest 校验与缓存测试。"""
 
 import json
+import os
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -415,6 +416,66 @@ def test_etag_conditional_request_and_304(tmp_path):
     assert second_headers.get("If-None-Match") == '"abc123"'
 
 
+def test_background_refresh_304_skips_reverification(tmp_path):
+    """TTL 过期后台刷新：带 ETag + Last-Modified 条件请求，304 只续期缓存。"""
+    manifest = _valid_manifest()
+    client = MagicMock(spec=httpx.Client)
+    ok_resp = _mock_response(json_data=manifest, status_code=200)
+    ok_resp.headers = {
+        "etag": '"abc123"',
+        "last-modified": "Wed, 01 Jul 2026 00:00:00 GMT",
+    }
+    not_modified = _mock_response(json_data=None, status_code=304)
+    client.get.side_effect = [ok_resp, not_modified]
+    executor = MagicMock()
+    executor.submit.side_effect = lambda fn: fn()
+    cache = RepoManifestCache(
+        cache_dir=tmp_path / "cache",
+        http_client=client,
+        async_executor=executor,
+    )
+    repo = SourceRepoEntry(
+        url="https://texts.example.org/ott-repo.json",
+        refresh_ttl_seconds=60,
+    )
+    assert cache.get_manifest(repo) is not None
+    cache_key = repo_cache_key(repo.url)
+    cache_file = cache.cache_path(cache_key)
+    old = cache_file.stat().st_mtime - 120
+    os.utime(cache_file, (old, old))
+    cache._verify_trust = MagicMock(side_effect=AssertionError("304 不应重新验签"))
+
+    served = cache.get_manifest(repo)
+
+    assert served is not None
+    assert served["repo_id"] == "texts.example.org"
+    headers = client.get.call_args_list[1].kwargs["headers"]
+    assert headers == {
+        "If-None-Match": '"abc123"',
+        "If-Modified-Since": "Wed, 01 Jul 2026 00:00:00 GMT",
+    }
+    assert not cache._is_expired(cache_key, repo.refresh_ttl_seconds)
+
+
+def test_conditional_request_skipped_without_cache(tmp_path):
+    """缓存已清除时即使订阅留有 etag 也发无条件请求（304 无内容可服务）。"""
+    client = MagicMock(spec=httpx.Client)
+    client.get.return_value = _mock_response(
+        json_data=_valid_manifest(), status_code=200
+    )
+    cache = RepoManifestCache(
+        cache_dir=tmp_path / "cache",
+        http_client=client,
+        async_executor=None,
+    )
+    repo = SourceRepoEntry(
+        url="https://texts.example.org/ott-repo.json", etag='"stale"'
+    )
+
+    assert cache.refresh_manifest(repo) is not None
+    assert client.get.call_args.kwargs["headers"] == {}
+
+
 def test_mirror_failover_after_primary_failure(tmp_path):
     manifest = _valid_manifest()
     manifest["mirrors"] = [
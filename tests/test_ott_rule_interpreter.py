@@ -14,6 +14,7 @@ import pytest
 from src.backend.integration.ott_rule_interpreter import (
     MAX_JSON_DEPTH,
     MAX_TOTAL_ENTRIES,
+    CompiledExtract,
     OttRuleInterpreter,
     _json_depth_exceeds,
     apply_transform,
@@ -234,6 +235,54 @@ class TestExtractFields:
     def test_invalid_spec_returns_empty(self) -> None:
         assert extract_fields({"a": 1}, "not a dict") == {}  # type: ignore[arg-type]
 
+    def test_css_fields_share_one_parse(self, monkeypatch) -> None:
+        from src.backend.integration import ott_rule_interpreter as interp_mod
+
+        calls = []
+        real_parse = interp_mod._parse_html
+
+        def _counting_parse(html):
+            calls.append(html)
+            return real_parse(html)
+
+        monkeypatch.setattr(interp_mod, "_parse_html", _counting_parse)
+        html = '<h1 class="t">Title</h1><div class="c">Body</div><i>x</i>'
+        spec = {"title": "h1.t", "content": "div.c", "extra": "i"}
+
+        assert extract_fields(html, spec) == {
+            "title": "Title",
+            "content": "Body",
+            "extra": "x",
+        }
+        assert len(calls) == 1
+
+    def test_regex_fields_of_whole_page_use_one_round_trip(self, monkeypatch) -> None:
+        from src.backend.integration import ott_rule_interpreter as interp_mod
+
+        batches = []
+        real_batch = interp_mod._run_regex_batch
+
+        def _counting_batch(payloads):
+            batches.append(len(payloads))
+            return real_batch(payloads)
+
+        monkeypatch.setattr(interp_mod, "_run_regex_batch", _counting_batch)
+        extractor = CompiledExtract(
+            {"title": "/<b>(.*?)</b>/", "content": "(?P<c>\\d+)$", "raw": "$"}
+        )
+        items = [f"<b>T{i}</b> {i * 11}" for i in range(20)]
+
+        results = extractor.extract_many(items)
+
+        assert batches == [40]
+        assert results[3] == {"title": "T3", "content": "33", "raw": items[3]}
+
+    def test_invalid_css_selector_yields_empty(self) -> None:
+        assert extract_fields("<p>x</p>", {"bad": "p[", "ok": "p"}) == {
+            "bad": "",
+            "ok": "x",
+        }
+
 
 # ---------------------------------------------------------------------------
 # 变换
@@ -563,6 +612,96 @@ class TestOttRuleInterpreter:
         assert entries == []
 
 
+class _PagedClient:
+    """按 URL 中的 page 返回数据的假 httpx.Client，每次请求耗时 delay 秒。"""
+
+    def __init__(self, pages: int, delay: float = 0.0, per_page: int = 1):
+        self._pages = pages
+        self._delay = delay
+        self._per_page = per_page
+        self.requested: list[int] = []
+        self.started_at: list[float] = []
+
+    def get(self, url, headers=None, timeout=None):
+        page = int(url.rsplit("=", 1)[1])
+        self.requested.append(page)
+        self.started_at.append(time.monotonic())
+        time.sleep(self._delay)
+        if page > self._pages:
+            return _MockResponse("[]")
+        data = [
+            {"title": f"P{page}-{i}", "content": f"page {page} item {i}"}
+            for i in range(self._per_page)
+        ]
+        return _MockResponse(json.dumps(data))
+
+
+class TestPaginationPrefetch:
+    def _rule(self, **pagination):
+        return {
+            "request": {"url": "https://example.com/api?page={page}"},
+            "extract": {"title": "$.title", "content": "$.content"},
+            "pagination": {"max_pages": 8, **pagination},
+        }
+
+    def test_prefetch_keeps_page_order(self) -> None:
+        client = _PagedClient(pages=5, delay=0.02)
+        interp = OttRuleInterpreter(client)
+        entries = interp.list_entries(self._rule(prefetch=3), "r1", max_pages=8)
+        assert [e["title"] for e in entries] == [f"P{p}-0" for p in range(1, 6)]
+        assert [e["_page"] for e in entries] == [1, 2, 3, 4, 5]
+
+    def test_prefetch_overlaps_page_fetches(self) -> None:
+        client = _PagedClient(pages=6, delay=0.15)
+        interp = OttRuleInterpreter(client)
+        start = time.monotonic()
+        entries = interp.list_entries(self._rule(prefetch=3), "r1", max_pages=8)
+        elapsed = time.monotonic() - start
+        assert len(entries) == 6
+        # 串行需 7 × 0.15s ≈ 1.05s
+        assert elapsed < 0.7
+
+    def test_empty_page_stops_within_window(self) -> None:
+        client = _PagedClient(pages=1, delay=0.05)
+        interp = OttRuleInterpreter(client)
+        entries = interp.list_entries(self._rule(prefetch=2), "r1", max_pages=8)
+        time.sleep(0.2)
+        assert len(entries) == 1
+        # 第 2 页为空即停止：窗口外的页从未提交
+        assert max(client.requested) <= 2 + 2
+
+    def test_max_total_entries_stops_prefetch(self) -> None:
+        client = _PagedClient(pages=8, per_page=400)
+        interp = OttRuleInterpreter(client)
+        entries = interp.list_entries(self._rule(prefetch=1), "r1", max_pages=8)
+        time.sleep(0.1)
+        assert len(entries) == 1000
+        assert max(client.requested) <= 3 + 1
+
+    def test_min_interval_spaces_requests(self) -> None:
+        client = _PagedClient(pages=3)
+        interp = OttRuleInterpreter(client)
+        interp.list_entries(
+            self._rule(prefetch=3, min_interval_ms=100), "r1", max_pages=8
+        )
+        gaps = [b - a for a, b in zip(client.started_at, client.started_at[1:])]
+        assert len(gaps) >= 3
+        assert min(gaps) >= 0.09
+
+    def test_without_prefetch_fetches_one_page_at_a_time(self) -> None:
+        client = _PagedClient(pages=2)
+        interp = OttRuleInterpreter(client)
+        entries = interp.list_entries(self._rule(), "r1", max_pages=8)
+        assert len(entries) == 2
+        assert client.requested == [1, 2, 3]
+
+    def test_invalid_prefetch_rejects_rule(self) -> None:
+        client = _PagedClient(pages=2)
+        interp = OttRuleInterpreter(client)
+        assert interp.list_entries(self._rule(prefetch="x"), "r1") == []
+        assert client.requested == []
+
+
 # ---------------------------------------------------------------------------
 # DNS pin（0.A3）
 # ---------------------------------------------------------------------------
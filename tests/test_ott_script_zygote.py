@@ -0,0 +1,241 @@
+"""ott-script zygote 预热执行池测试。"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.backend.integration import ott_script_runner as runner
+from src.backend.integration.ott_script_client import ScriptSandbox
+from src.backend.integration.ott_script_zygote import (
+    ScriptZygotePool,
+    ZygoteResult,
+    ZygoteUnavailableError,
+)
+
+_SANDBOX_AVAILABLE = runner.landlock_available() or runner.seccomp_available()
+
+pytestmark = pytest.mark.skipif(
+    not (_SANDBOX_AVAILABLE and ScriptZygotePool.supported()),
+    reason="需要 fork 与 Landlock 或 seccomp 沙箱",
+)
+
+
+class FakeTokenStore:
+    def __init__(self, tokens: dict[str, str]) -> None:
+        self._tokens = dict(tokens)
+
+    def get_token(self, key: str) -> str | None:
+        return self._tokens.get(key)
+
+
+@pytest.fixture
+def pool():
+    pool = ScriptZygotePool()
+    yield pool
+    pool.close()
+
+
+def _script(tmp_path: Path, body: str) -> Path:
+    path = tmp_path / "s.py"
+    path.write_text(body, encoding="utf-8")
+    return path
+
+
+def test_warm_path_matches_cold_path(pool) -> None:
+    source = 'def fetch_entries():\n    return [{"title": "T", "content": "中文"}]\n'
+    cold = ScriptSandbox().execute_strict(source, "test://script")
+    warm = ScriptSandbox(zygote_pool=pool).execute_strict(source, "test://script")
+    for entry in cold + warm:
+        entry.pop("fetched_at", None)
+    assert warm == cold
+
+
+def test_zygote_is_reused_across_scripts(pool, tmp_path) -> None:
+    script = _script(tmp_path, "def fetch_entries():\n    return [1]\n")
+    pool.run(script, {}, 10)
+    zygote = pool._idle[0]
+
+    result = pool.run(script, {}, 10)
+
+    assert result.returncode == 0
+    assert pool._idle == [zygote]
+
+
+def test_script_state_does_not_leak_between_children(pool, tmp_path) -> None:
+    first = _script(
+        tmp_path,
+        "def fetch_entries():\n    json.leaked = 1\n    return []\n",
+    )
+    second = tmp_path / "t.py"
+    second.write_text(
+        "def fetch_entries():\n"
+        "    try:\n"
+        "        return [json.leaked]\n"
+        "    except Exception:\n"
+        "        return ['CLEAN']\n",
+        encoding="utf-8",
+    )
+
+    assert pool.run(first, {}, 10).returncode == 0
+    result = pool.run(second, {}, 10)
+
+    assert result.stdout == '["CLEAN"]'
+
+
+def test_fork_limit_matches_cold_path(pool) -> None:
+    # RLIMIT_NPROC=0 在 fork 出的子进程内施加（zygote 自身不受限）；
+    # 结果须与冷启动一致（root 不受 RLIMIT_NPROC 约束，两条路径同样放行）
+    source = (
+        "def fetch_entries():\n"
+        "    for c in ().__class__.__bases__[0].__subclasses__():\n"
+        "        try:\n"
+        "            g = c.__init__.__globals__\n"
+        "        except AttributeError:\n"
+        "            continue\n"
+        "        if 'fork' in g:\n"
+        "            try:\n"
+        "                pid = g['fork']()\n"
+        "            except OSError:\n"
+        "                return ['FORK_BLOCKED']\n"
+        "            if pid == 0:\n"
+        "                g['_exit'](0)\n"
+        "            return ['FORK_OK']\n"
+        "    return ['NO_FORK']\n"
+    )
+
+    cold = ScriptSandbox().execute(source, "test://script")
+    warm = ScriptSandbox(zygote_pool=pool).execute(source, "test://script")
+
+    assert [e["content"] for e in warm] == [e["content"] for e in cold]
+    if os.geteuid() != 0:
+        assert warm[0]["content"] == "FORK_BLOCKED"
+
+
+@pytest.mark.skipif(
+    not runner.landlock_available(), reason="需要 Linux 内核 5.13+ Landlock"
+)
+def test_landlock_applies_in_forked_child(pool) -> None:
+    secret = Path.home() / ".cache" / f"typetype-zygote-{os.getpid()}.tmp"
+    secret.parent.mkdir(parents=True, exist_ok=True)
+    secret.write_text("SECRET")
+    try:
+        source = (
+            "def fetch_entries():\n"
+            "    for c in ().__class__.__bases__[0].__subclasses__():\n"
+            "        try:\n"
+            "            g = c.__init__.__globals__\n"
+            "        except AttributeError:\n"
+            "            continue\n"
+            "        if 'open' in g:\n"
+            "            try:\n"
+            "                g['open'](" + repr(str(secret)) + ").read()\n"
+            "                return [{'content': 'READ_OK'}]\n"
+            "            except OSError:\n"
+            "                return [{'content': 'READ_BLOCKED'}]\n"
+            "    return [{'content': 'NO_CLASS'}]\n"
+        )
+        entries = ScriptSandbox(zygote_pool=pool).execute(source, "test://script")
+        assert entries[0]["content"] == "READ_BLOCKED"
+    finally:
+        secret.unlink(missing_ok=True)
+
+
+def test_timeout_kills_child_and_keeps_zygote(pool, tmp_path) -> None:
+    script = _script(tmp_path, "def fetch_entries():\n    while True:\n        pass\n")
+    start = time.monotonic()
+
+    result = pool.run(script, {}, 1)
+
+    assert result.timed_out
+    assert time.monotonic() - start < 3
+    ok = _script(tmp_path, "def fetch_entries():\n    return []\n")
+    assert pool.run(ok, {}, 10).returncode == 0
+
+
+def _group_members(pgid: int) -> list[int]:
+    members = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # 第 5 个字段是 pgrp；comm 可能含空格，从最后一个 ')' 之后切分
+        fields = stat.rsplit(")", 1)[1].split()
+        if fields[0] != "Z" and int(fields[2]) == pgid:
+            members.append(int(entry.name))
+    return members
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="需要 /proc")
+def test_killing_zygote_also_kills_running_script(pool, tmp_path) -> None:
+    script = _script(tmp_path, "def fetch_entries():\n    while True:\n        pass\n")
+    zygote = pool._acquire()
+    pgid = zygote._proc.pid
+    assert zygote.send({"script": str(script), "config": {}, "timeout": 60})
+    deadline = time.monotonic() + 5
+    while len(_group_members(pgid)) < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(_group_members(pgid)) >= 2
+
+    zygote.kill()
+
+    deadline = time.monotonic() + 3
+    while _group_members(pgid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _group_members(pgid) == []
+
+
+def test_script_exit_code_is_propagated(pool, tmp_path) -> None:
+    script = _script(tmp_path, "def fetch_entries():\n    raise SystemExit(3)\n")
+
+    assert pool.run(script, {}, 10).returncode == 3
+
+
+def test_network_allowlist_is_forwarded(pool, tmp_path) -> None:
+    script = _script(
+        tmp_path,
+        "def fetch_entries():\n"
+        "    httpx.get('https://denied.example.org/')\n"
+        "    return ['ALLOWED']\n",
+    )
+
+    result = pool.run(script, {"network_allowlist": []}, 10)
+
+    assert result.returncode == 1
+    assert "不在网络白名单内" in result.stderr
+
+
+def test_secret_scripts_use_cold_path() -> None:
+    zygotes = MagicMock(spec=ScriptZygotePool)
+    sandbox = ScriptSandbox(token_store=FakeTokenStore({"k": "v"}), zygote_pool=zygotes)
+    source = 'def fetch_entries():\n    return [{"content": sandbox.get_secret("k")}]\n'
+
+    entries = sandbox.execute(source, "test://script", secret_names=["k"])
+
+    assert entries[0]["content"] == "v"
+    zygotes.run.assert_not_called()
+
+
+def test_falls_back_to_cold_path_when_zygote_unavailable() -> None:
+    zygotes = MagicMock(spec=ScriptZygotePool)
+    zygotes.run.side_effect = ZygoteUnavailableError("boom")
+    source = 'def fetch_entries():\n    return [{"content": "cold"}]\n'
+
+    entries = ScriptSandbox(zygote_pool=zygotes).execute(source, "test://script")
+
+    assert entries[0]["content"] == "cold"
+
+
+def test_zygote_failure_counts_as_execution_failure() -> None:
+    zygotes = MagicMock(spec=ScriptZygotePool)
+    zygotes.run.return_value = ZygoteResult(returncode=-9, stdout="", stderr="")
+    source = "def fetch_entries():\n    return []\n"
+
+    assert ScriptSandbox(zygote_pool=zygotes).execute_strict(source, "t://s") is None
@@ -13,6 +13,7 @@ from unittest.mock import MagicMock
 import httpx
 
 from src.backend.config.runtime_config import OttConfig
+from src.backend.integration.content_blob_store import ContentBlobStore
 from src.backend.integration.ott_cached_fetcher import OttCachedFetcher
 
 
@@ -147,6 +148,150 @@ def test_cache_expired_refetches_network(tmp_path):
     assert cached["content"] == "新内容"
 
 
+def test_expired_refresh_revalidates_and_304_bumps_freshness(tmp_path):
+    """TTL 过期后台刷新携带 ETag/Last-Modified；304 只续期，不改写正文。"""
+    client = MagicMock(spec=httpx.Client)
+    first = mock_response({"content": "缓存测试"})
+    first.headers = {
+        "etag": '"v1"',
+        "last-modified": "Wed, 01 Jul 2026 00:00:00 GMT",
+    }
+    not_modified = mock_response(None, status_code=304)
+    client.get.side_effect = [first, not_modified]
+    fetcher = make_fetcher(
+        tmp_path,
+        config=OttConfig(cache_ttl_seconds=60),
+        client=client,
+        async_executor=_SyncExecutor(),
+    )
+    url = "https://cdn.example.com/content/article1.json"
+
+    fetcher.fetch_json_with_cache("content/article1", url)
+    assert client.get.call_args_list[0].kwargs.get("headers") is None
+    assert fetcher.read_validators("content/article1") == {
+        "url": url,
+        "etag": '"v1"',
+        "last_modified": "Wed, 01 Jul 2026 00:00:00 GMT",
+    }
+    cache_file = tmp_path / "registry_cache" / "content/article1.json"
+    before = cache_file.read_bytes()
+    _age_cache_file(tmp_path / "registry_cache", "content/article1", seconds_old=120)
+    assert fetcher.is_cache_expired("content/article1")
+
+    second = fetcher.fetch_json_with_cache("content/article1", url)
+
+    assert second == {"content": "缓存测试"}
+    assert client.get.call_args_list[1].kwargs["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Jul 2026 00:00:00 GMT",
+    }
+    assert not fetcher.is_cache_expired("content/article1")
+    assert cache_file.read_bytes() == before
+
+
+def test_text_refresh_200_replaces_content_and_validators(tmp_path):
+    client = MagicMock(spec=httpx.Client)
+    first = mock_text_response("旧正文")
+    first.headers = {"etag": '"v1"'}
+    changed = mock_text_response("新正文")
+    changed.headers = {"etag": '"v2"'}
+    client.get.side_effect = [first, changed]
+    fetcher = make_fetcher(
+        tmp_path,
+        config=OttConfig(cache_ttl_seconds=60),
+        client=client,
+        async_executor=_SyncExecutor(),
+    )
+    url = "https://cdn.example.com/text/a.txt"
+
+    fetcher.fetch_text_with_cache("text/a", url)
+    _age_cache_file(tmp_path / "registry_cache", "text/a", seconds_old=120)
+    stale = fetcher.fetch_text_with_cache("text/a", url)
+
+    assert stale == "旧正文"
+    assert client.get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert fetcher.read_cache("text/a") == {"content": "新正文"}
+    assert fetcher.read_validators("text/a")["etag"] == '"v2"'
+
+
+def test_validators_only_sent_to_issuing_url(tmp_path):
+    """ETag 由签发地址决定：降级到 jsDelivr 时不带主地址的校验器。"""
+    client = MagicMock(spec=httpx.Client)
+    requests: list[tuple[str, dict | None]] = []
+
+    def _get(url, headers=None):
+        requests.append((url, headers))
+        if url.startswith("https://raw.githubusercontent.com/") and len(requests) > 1:
+            raise httpx.ReadTimeout("read timed out", request=None)
+        response = mock_response({"content": url})
+        response.headers = {"etag": '"raw"'}
+        return response
+
+    client.get.side_effect = _get
+    fetcher = make_fetcher(
+        tmp_path,
+        config=OttConfig(cache_ttl_seconds=60),
+        client=client,
+        async_executor=_SyncExecutor(),
+    )
+    url = "https://raw.githubusercontent.com/o/r/main/data.json"
+
+    fetcher.fetch_json_with_cache("k", url)
+    _age_cache_file(tmp_path / "registry_cache", "k", seconds_old=120)
+    fetcher.fetch_json_with_cache("k", url)
+
+    assert requests[1] == (url, {"If-None-Match": '"raw"'})
+    assert requests[2][0].startswith("https://cdn.jsdelivr.net/")
+    assert requests[2][1] is None
+    assert fetcher.read_cache("k")["content"] == requests[2][0]
+
+
+def test_blob_store_dedups_payloads_across_fetchers(tmp_path):
+    """注入 blob 层：缓存文件只存引用，不同 authority 的相同正文共用一个 blob。"""
+    blobs = ContentBlobStore(tmp_path / "blobs")
+    text = "共享正文" * 1000
+    fetchers = []
+    for name in ("a.example.org", "b.example.org"):
+        client = MagicMock(spec=httpx.Client)
+        client.get.return_value = mock_text_response(text)
+        fetchers.append(
+            OttCachedFetcher(
+                OttConfig(), tmp_path / name, client, None, blob_store=blobs
+            )
+        )
+
+    for fetcher in fetchers:
+        assert fetcher.fetch_text_with_cache("seg/1", "https://x.org/1.txt") == text
+
+    assert len(list((tmp_path / "blobs").rglob("*.z"))) == 1
+    ref = json.loads((tmp_path / "a.example.org" / "seg/1.json").read_text())
+    assert set(ref) == {"$blob"}
+    assert fetchers[1].read_cache("seg/1") == {"content": text}
+
+
+def test_evicted_blob_is_a_cache_miss(tmp_path):
+    blobs = ContentBlobStore(tmp_path / "blobs")
+    client = MagicMock(spec=httpx.Client)
+    client.get.side_effect = [
+        mock_response({"content": "v1"}),
+        mock_response({"content": "v2"}),
+    ]
+    fetcher = OttCachedFetcher(
+        OttConfig(), tmp_path / "cache", client, None, blob_store=blobs
+    )
+
+    assert fetcher.fetch_json_with_cache("k", "https://x.org/k.json") == {
+        "content": "v1"
+    }
+    for blob in (tmp_path / "blobs").rglob("*.z"):
+        blob.unlink()
+
+    assert fetcher.fetch_json_with_cache("k", "https://x.org/k.json") == {
+        "content": "v2"
+    }
+    assert client.get.call_count == 2
+
+
 def test_offline_returns_stale_cache(tmp_path):
     client = MagicMock(spec=httpx.Client)
     client.get.side_effect = [
@@ -5,11 +5,15 @@ Profile）与 OttSegmentProvider（消费 fetch_ott_segment 接口的分片提
 """
 
 import json
+import sys
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from unittest.mock import MagicMock
 
 import httpx
 
 from src.backend.config.runtime_config import OttConfig
+from src.backend.integration import ott_segment_provider as osp
 from src.backend.integration.ott_client import OttClient
 from src.backend.integration.ott_segment_provider import OttSegmentProvider
 
@@ -180,3 +184,190 @@ def test_ott_segment_provider_raises_on_missing_segment():
         raise AssertionError("expected RuntimeError")
     except RuntimeError as exc:
         assert "无法获取 OTT 分段" in str(exc)
+
+
+class _CountingSegmentSource(_FakeSegmentSource):
+    """记录每个分段的拉取次数；gated 中的分段在 gate 放行前阻塞（模拟慢网络）。"""
+
+    def __init__(
+        self,
+        segments: dict,
+        gate: threading.Event | None = None,
+        gated: set[int] | None = None,
+    ) -> None:
+        super().__init__(segments)
+        self.calls: dict[int, int] = {}
+        self._gate = gate
+        self._gated = gated or set()
+
+    def fetch_ott_segment(
+        self, entry_id, revision_id, segment_index, source_segment_size=1000
+    ):
+        self.calls[segment_index] = self.calls.get(segment_index, 0) + 1
+        if self._gate is not None and segment_index in self._gated:
+            self._gate.wait(5)
+        return super().fetch_ott_segment(
+            entry_id, revision_id, segment_index, source_segment_size
+        )
+
+
+def _segments(count: int, size: int = 4) -> dict:
+    return {
+        i: {"content": chr(ord("A") + i - 1) * size, "index": i}
+        for i in range(1, count + 1)
+    }
+
+
+def test_ott_segment_provider_get_chars_fetches_each_segment_once():
+    source = _CountingSegmentSource(_segments(6))
+    provider = OttSegmentProvider(
+        source,
+        "ent_1",
+        "rev_1",
+        total_chars=24,
+        source_segment_size=4,
+        prefetch=False,
+    )
+
+    assert provider.get_chars([20, 1, 3, 21, 9, 30, -1]) == "FAAFC"
+    assert source.calls == {1: 1, 3: 1, 6: 1}
+
+
+def test_ott_segment_provider_prefetches_next_and_previous_slices():
+    source = _CountingSegmentSource(_segments(6))
+    executor = ThreadPoolExecutor(max_workers=2)
+    provider = OttSegmentProvider(
+        source,
+        "ent_1",
+        "rev_1",
+        total_chars=24,
+        source_segment_size=4,
+        prefetch_executor=executor,
+    )
+
+    assert provider.get_segment(8, 8) == "CCCCDDDD"
+    executor.shutdown(wait=True)
+
+    # 当前片 3-4，预取下一片 5-6 与上一片 1-2
+    assert source.calls == {1: 1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 1}
+    assert provider.get_segment(16, 8) == "EEEEFFFF"
+    assert provider.get_segment(0, 8) == "AAAABBBB"
+    stats = provider.cache_stats()
+    assert stats["misses"] == 2
+    assert stats["prefetches"] == 4
+    assert stats["hits"] == 4
+    assert max(source.calls.values()) == 1
+
+
+def test_ott_segment_provider_waits_for_inflight_prefetch():
+    gate = threading.Event()
+    source = _CountingSegmentSource(_segments(2), gate=gate, gated={2})
+    executor = ThreadPoolExecutor(max_workers=1)
+    provider = OttSegmentProvider(
+        source,
+        "ent_1",
+        "rev_1",
+        total_chars=8,
+        source_segment_size=4,
+        prefetch_executor=executor,
+    )
+    assert provider.get_segment(0, 4) == "AAAA"
+    # 分段 2 的预取仍在进行：前台等待同一次拉取，不重复请求
+    timer = threading.Timer(0.1, gate.set)
+    timer.start()
+    assert provider.get_segment(4, 4) == "BBBB"
+    executor.shutdown(wait=True)
+
+    assert source.calls[2] == 1
+    assert provider.cache_stats()["misses"] == 1
+
+
+def test_ott_segment_provider_lru_is_byte_bounded():
+    source = _CountingSegmentSource(_segments(4, size=1000))
+    one_segment = sys.getsizeof("A" * 1000)
+    provider = OttSegmentProvider(
+        source,
+        "ent_1",
+        "rev_1",
+        total_chars=4000,
+        source_segment_size=1000,
+        max_cache_bytes=2 * one_segment,
+        prefetch=False,
+    )
+
+    for start in (0, 1000, 2000):
+        provider.get_segment(start, 1000)
+    assert provider.cache_stats()["cached_segments"] == 2
+    assert provider.cache_stats()["cached_bytes"] <= 2 * one_segment
+
+    # 分段 1 已被淘汰：再次读取重新拉取；分段 3 仍命中
+    provider.get_segment(2000, 1000)
+    provider.get_segment(0, 1000)
+    assert source.calls == {1: 2, 2: 1, 3: 1}
+
+
+def test_ott_segment_provider_failed_prefetch_retries_in_foreground():
+    class _FlakySource(_CountingSegmentSource):
+        def fetch_ott_segment(self, entry_id, revision_id, segment_index, size=1000):
+            result = super().fetch_ott_segment(
+                entry_id, revision_id, segment_index, size
+            )
+            if segment_index == 2 and self.calls[2] == 1:
+                raise httpx.ConnectError("offline")
+            return result
+
+    source = _FlakySource(_segments(2))
+    executor = ThreadPoolExecutor(max_workers=1)
+    provider = OttSegmentProvider(
+        source,
+        "ent_1",
+        "rev_1",
+        total_chars=8,
+        source_segment_size=4,
+        prefetch_executor=executor,
+    )
+
+    provider.get_segment(0, 4)
+    executor.shutdown(wait=True)
+    assert provider.get_segment(4, 4) == "BBBB"
+    assert source.calls[2] == 2
+
+
+def test_ott_segment_provider_prefetch_with_inline_executor():
+    class _InlineExecutor(Executor):
+        def submit(self, fn, /, *args, **kwargs):
+            future = Future()
+            future.set_result(fn(*args, **kwargs))
+            return future
+
+    source = _CountingSegmentSource(_segments(3))
+    provider = OttSegmentProvider(
+        source,
+        "ent_1",
+        "rev_1",
+        total_chars=12,
+        source_segment_size=4,
+        prefetch_executor=_InlineExecutor(),
+    )
+
+    # 提交在锁外：同步执行的预取不会与调度方争锁死锁，登记项随完成移除
+    assert provider.get_segment(4, 4) == "BBBB"
+    assert provider._inflight == {}
+    assert provider.get_segment(8, 4) == "CCCC"
+    assert source.calls == {1: 1, 2: 1, 3: 1}
+
+
+def test_ott_segment_provider_skips_prefetch_after_shutdown(monkeypatch):
+    monkeypatch.setattr(osp, "_prefetch_executor", None)
+    executor = osp._shared_prefetch_executor()
+    osp.shutdown_prefetch_executor()
+    source = _CountingSegmentSource(_segments(2))
+    provider = OttSegmentProvider(
+        source, "ent_1", "rev_1", total_chars=8, source_segment_size=4
+    )
+
+    # 线程池已关闭：预取被放弃，前台读取照常同步拉取
+    assert provider.get_segment(0, 4) == "AAAA"
+    assert provider.get_segment(4, 4) == "BBBB"
+    assert osp._shared_prefetch_executor() is executor
+    assert provider.cache_stats()["prefetches"] == 0
@@ -0,0 +1,120 @@
+"""Tests for the persistent regex worker pool."""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from src.backend.integration.ott_dsl import REGEX_WORKER_PATH
+from src.backend.integration.regex_worker_pool import RegexWorkerPool
+
+
+def _pool(path=REGEX_WORKER_PATH, timeout=1.0) -> RegexWorkerPool:
+    return RegexWorkerPool(path, timeout=timeout)
+
+
+def test_batch_results_follow_input_order():
+    pool = _pool()
+    try:
+        results = pool.run_batch(
+            [
+                {"pattern": "<h1>(?P<title>.*?)</h1>", "text": "<h1>Hi</h1>"},
+                {"pattern": r"(\d+)", "text": "abc 42"},
+                {"op": "replace", "pattern": r"\d", "text": "a1b2", "repl": "x"},
+                {"pattern": "(a+)+", "text": "aaa"},
+            ]
+        )
+    finally:
+        pool.close()
+
+    assert results[0] == {"ok": True, "groups": {"title": "Hi"}}
+    assert results[1] == {"ok": True, "content": "42"}
+    assert results[2] == {"ok": True, "content": "axbx"}
+    assert results[3] == {"ok": False, "error": "nested_quantifier"}
+
+
+def test_non_ascii_pattern_and_text_round_trip():
+    pool = _pool()
+    try:
+        result = pool.run({"pattern": "《(?P<title>.+?)》", "text": "书名：《静夜思》"})
+    finally:
+        pool.close()
+
+    assert result == {"ok": True, "groups": {"title": "静夜思"}}
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="POSIX 下用 C locale 模拟非 UTF-8 管道"
+)
+def test_worker_reads_utf8_regardless_of_locale():
+    env = {**os.environ, "LC_ALL": "C"}
+    request = {"pattern": "(?P<word>静.)", "text": "静夜思"}
+    proc = subprocess.run(
+        [sys.executable, "-I", "-X", "utf8=0", str(REGEX_WORKER_PATH), "--serve"],
+        input=(json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"),
+        capture_output=True,
+        env=env,
+        timeout=10,
+        check=True,
+    )
+
+    lines = proc.stdout.decode("utf-8").splitlines()
+    assert json.loads(lines[1]) == {"ok": True, "groups": {"word": "静夜"}}
+
+
+def test_worker_process_is_reused_across_calls():
+    pool = _pool()
+    try:
+        pool.run({"pattern": "(a)", "text": "a"})
+        worker = pool._idle[0]
+        pool.run({"pattern": "(b)", "text": "b"})
+        assert pool._idle == [worker]
+    finally:
+        pool.close()
+    assert pool._idle == []
+
+
+def test_hung_request_is_killed_and_rest_of_batch_rerun(tmp_path):
+    # 模拟无法被 SIGALRM 打断的卡死：遇到 pattern "hang" 即无限睡眠
+    script = tmp_path / "hang_worker.py"
+    script.write_text(
+        textwrap.dedent(
+            """
+            import json, sys, time
+            print(json.dumps({"ok": True, "ready": True}), flush=True)
+            for line in sys.stdin:
+                payload = json.loads(line)
+                if payload["pattern"] == "hang":
+                    time.sleep(60)
+                print(json.dumps({"ok": True, "content": payload["text"]}), flush=True)
+            """
+        ),
+        encoding="utf-8",
+    )
+    pool = _pool(script, timeout=0.3)
+    try:
+        start = time.monotonic()
+        results = pool.run_batch(
+            [
+                {"pattern": "x", "text": "1"},
+                {"pattern": "hang", "text": "2"},
+                {"pattern": "x", "text": "3" * 200_000},
+            ]
+        )
+        elapsed = time.monotonic() - start
+    finally:
+        pool.close()
+
+    assert results[0] == {"ok": True, "content": "1"}
+    assert results[1] is None
+    assert results[2] == {"ok": True, "content": "3" * 200_000}
+    assert elapsed < 5
+
+
+def test_missing_worker_script_yields_none(tmp_path):
+    pool = _pool(tmp_path / "missing.py")
+    assert pool.run_batch([{"pattern": "(a)", "text": "a"}]) == [None]
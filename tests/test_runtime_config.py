@@ -773,6 +773,15 @@ def test_source_repos_default_empty():
     assert config.source_repos.enabled_repos == []
 
 
+def test_char_stats_cache_capacity_parsing():
+    assert RuntimeConfig().char_stats_cache_capacity == 8000
+    config = RuntimeConfig._from_dict({"char_stats_cache_capacity": 3000})
+    assert config.char_stats_cache_capacity == 3000
+    assert config._to_dict()["char_stats_cache_capacity"] == 3000
+    bad = RuntimeConfig._from_dict({"char_stats_cache_capacity": "many"})
+    assert bad.char_stats_cache_capacity == 8000
+
+
 def test_blocked_content_hashes_roundtrip(tmp_path):
     path = tmp_path / "config.json"
     config = RuntimeConfig.load_from_file(str(path))
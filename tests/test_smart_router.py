@@ -12,6 +12,8 @@
 from __future__ import annotations
 
 import json
+import threading
+import time as _time
 from unittest.mock import MagicMock
 
 import httpx
@@ -195,6 +197,125 @@ def test_probe_network_error_is_tolerated(monkeypatch):
     assert cands == [RAW_URL, JSDELIVR_URL]
 
 
+# ----------------------------------------------------------------------
+# 对冲请求（fetch_first）
+# ----------------------------------------------------------------------
+
+SLOW = "https://slow.example.com/x.json"
+FAST = "https://fast.example.com/x.json"
+
+
+def _timed_fetch(delays: dict[str, float], results: dict[str, object]):
+    started: list[str] = []
+
+    def fetch(url: str, client):
+        started.append(url)
+        _time.sleep(delays.get(url, 0.0))
+        return results.get(url)
+
+    return fetch, started
+
+
+def test_hedged_fetch_starts_next_candidate_when_best_is_slow():
+    router = _scripted_router([SLOW, FAST])
+    router.record(SLOW, ok=True, latency=0.02)  # 对冲延迟 ≈ 0.05s
+    fetch, started = _timed_fetch({SLOW: 1.0}, {SLOW: "slow", FAST: "fast"})
+
+    t0 = _time.monotonic()
+    assert router.fetch_first(SLOW, fetch) == "fast"
+
+    assert _time.monotonic() - t0 < 0.5
+    assert started == [SLOW, FAST]
+    # 落选的慢候选（不理会 client 关闭）结束后成功结果照常回写
+    deadline = _time.monotonic() + 3
+    while router.record.call_count < 3 and _time.monotonic() < deadline:
+        _time.sleep(0.02)
+    recorded = [c.args[0] for c in router.record.call_args_list[1:]]
+    assert recorded == [FAST, SLOW]
+
+
+def test_hedged_fetch_fails_over_immediately_on_fast_failure():
+    router = _scripted_router([SLOW, FAST])  # 无统计：对冲延迟为默认 1s
+    fetch, started = _timed_fetch({}, {FAST: "fast"})
+
+    t0 = _time.monotonic()
+    assert router.fetch_first(SLOW, fetch) == "fast"
+
+    assert _time.monotonic() - t0 < 0.5
+    assert started == [SLOW, FAST]
+    assert router._stats["slow.example.com"].consecutive_failures == 1
+
+
+def test_hedged_losers_are_interrupted_and_not_penalized():
+    router = _scripted_router([SLOW, FAST])
+    router.record(SLOW, ok=True, latency=0.02)
+    clients: dict[str, httpx.Client] = {}
+    released = threading.Event()
+
+    def fetch(url: str, client):
+        clients[url] = client
+        if url == SLOW:
+            released.wait(3)  # 模拟在途请求：client 被关闭后以失败告终
+            return None
+        return "fast"
+
+    assert router.fetch_first(SLOW, fetch) == "fast"
+
+    assert clients[SLOW] is not clients[FAST]
+    assert clients[SLOW].is_closed
+    released.set()
+    router.close()
+    _time.sleep(0.1)
+    # 中断引起的失败不计入冷却
+    assert router._stats["slow.example.com"].consecutive_failures == 0
+
+
+def test_hedge_pool_is_shared_across_fetches_and_closed():
+    router = _scripted_router([SLOW, FAST])
+    fetch, _ = _timed_fetch({}, {FAST: "fast"})
+
+    router.fetch_first(SLOW, fetch)
+    pool = router._hedge_pool
+    router.fetch_first(SLOW, fetch)
+
+    assert pool is not None and router._hedge_pool is pool
+    router.close()
+    assert router._hedge_pool is None
+
+
+def test_fetch_first_propagates_non_retriable_error():
+    router = _scripted_router([SLOW, FAST])
+
+    def fetch(url: str, client):
+        raise ValueError("too large")
+
+    with pytest.raises(ValueError):
+        router.fetch_first(SLOW, fetch)
+    assert router.record.call_count == 0
+
+
+def test_fetch_first_serial_when_hedging_disabled():
+    router = SmartRouteSelector(OttConfig(route_hedging=False))
+    router.ordered_candidates = MagicMock(return_value=[SLOW, FAST])
+    router.record(SLOW, ok=True, latency=0.02)
+    fetch, started = _timed_fetch({SLOW: 0.2}, {SLOW: "slow", FAST: "fast"})
+
+    assert router.fetch_first(SLOW, fetch) == "slow"
+    assert started == [SLOW]
+
+
+def test_hedge_delay_tracks_latency_spread():
+    router = _make_router()
+    assert router.hedge_delay(SLOW) == 1.0  # 无统计：默认值
+    router.record(SLOW, ok=True, latency=0.4)
+    router.record(SLOW, ok=True, latency=0.4)
+    stat = router._stats["slow.example.com"]
+    expected = stat.latency_ewma + 2.0 * stat.latency_dev
+    assert router.hedge_delay(SLOW) == pytest.approx(expected)
+    router.record(SLOW, ok=True, latency=60.0)
+    assert router.hedge_delay(SLOW) == 3.0  # 封顶
+
+
 # ----------------------------------------------------------------------
 # OttConfig 字段归一化 + 序列化往返
 # ----------------------------------------------------------------------
@@ -220,6 +341,15 @@ def test_runtime_config_roundtrip_route_fields(tmp_path):
     assert loaded.ott.route_probe_ttl_seconds == 60
 
 
+def test_runtime_config_roundtrip_route_hedging(tmp_path):
+    path = str(tmp_path / "config.json")
+    config = RuntimeConfig.load_from_file(path)
+    assert config.ott.route_hedging is True
+    config.ott.route_hedging = False
+    config._save_to_file()
+    assert RuntimeConfig.load_from_file(path).ott.route_hedging is False
+
+
 # ----------------------------------------------------------------------
 # 接入点：OttCachedFetcher / RepoManifestCache / ScriptCache（router 分支）
 # ----------------------------------------------------------------------
@@ -244,18 +374,35 @@ def _mock_http_response(data=None, text="", status_code=200):
     return response
 
 
+def _scripted_router(
+    candidates: list[str], client: httpx.Client | None = None
+) -> SmartRouteSelector:
+    """真实选路器，候选顺序固定、record 可断言（不碰网络）。
+
+    client：对冲尝试使用的 client（替代每次新建的短生命周期 client）。
+    """
+    router = SmartRouteSelector(
+        OttConfig(), attempt_client_factory=(lambda: client) if client else None
+    )
+    router.ordered_candidates = MagicMock(return_value=candidates)
+    router.record = MagicMock(wraps=router.record)
+    return router
+
+
 def test_cached_fetcher_routed_tries_candidates_in_order(tmp_path):
-    router = MagicMock()
-    router.ordered_candidates.return_value = [
-        "https://a.example.com/x.json",
-        "https://b.example.com/x.json",
-    ]
     payload = {"entry_id": "e1"}
     client = MagicMock(spec=httpx.Client)
     client.get.side_effect = [
         _mock_http_response(status_code=500),
         _mock_http_response(data=payload),
     ]
+    router = _scripted_router(
+        [
+            "https://a.example.com/x.json",
+            "https://b.example.com/x.json",
+        ],
+        client,
+    )
     fetcher = OttCachedFetcher(
         OttConfig(), tmp_path / "cache", client, None, router=router
     )
@@ -267,8 +414,6 @@ def test_cached_fetcher_routed_tries_candidates_in_order(tmp_path):
 
 
 def test_manifest_cache_routed_uses_router_order(tmp_path):
-    router = MagicMock()
-    router.ordered_candidates.return_value = [RAW_URL, JSDELIVR_URL]
     manifest = {
         "protocol": "ott-repo",
         "version": "1.0",
@@ -295,6 +440,7 @@ def test_manifest_cache_routed_uses_router_order(tmp_path):
         _mock_http_response(status_code=500),
         _mock_http_response(data=manifest),
     ]
+    router = _scripted_router([RAW_URL, JSDELIVR_URL], client)
     cache = RepoManifestCache(tmp_path / "cache", client, None, router=router)
     from src.backend.config.runtime_config import SourceRepoEntry
 
@@ -321,16 +467,18 @@ def _mock_stream_context(text: str, status_code: int = 200):
 
 
 def test_script_cache_routed_tries_candidates_in_order(tmp_path):
-    router = MagicMock()
-    router.ordered_candidates.return_value = [
-        "https://a.example.com/script.py",
-        "https://b.example.com/script.py",
-    ]
     client = MagicMock(spec=httpx.Client)
     client.stream.side_effect = [
         _mock_stream_context("", status_code=500),
         _mock_stream_context("def fetch_entries(): return []"),
     ]
+    router = _scripted_router(
+        [
+            "https://a.example.com/script.py",
+            "https://b.example.com/script.py",
+        ],
+        client,
+    )
     cache = ScriptCache(tmp_path / "cache", client, enabled=True, router=router)
     assert cache.get_script("https://a.example.com/script.py") == (
         "def fetch_entries(): return []"
@@ -0,0 +1,151 @@
+"""SqliteEntrySnapshotStore：与文件版同语义 + 旧目录迁移 + 索引查询。"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from src.backend.integration.entry_snapshot_store import EntrySnapshotStore
+from src.backend.integration.refresh_policy import (
+    MODE_INTERVAL,
+    MODE_STATIC,
+    RefreshPolicy,
+)
+from src.backend.integration.sqlite_entry_snapshot_store import (
+    SqliteEntrySnapshotStore,
+)
+
+
+def _entry(authority: str, entry_id: str, content: str = "text") -> dict:
+    return {"_authority": authority, "entry_id": entry_id, "content": content}
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SqliteEntrySnapshotStore(tmp_path)
+    yield s
+    s.close()
+
+
+def test_matches_file_store_shape(tmp_path, store) -> None:
+    legacy = EntrySnapshotStore(tmp_path / "legacy")
+    for s in (legacy, store):
+        s.save(
+            _entry("auth", "e1", "中文"),
+            captured_at=1000.0,
+            policy=RefreshPolicy(MODE_INTERVAL, 60),
+            fingerprint="fp",
+        )
+    assert store.get("auth", "e1") == legacy.get("auth", "e1")
+    assert store.list_all() == legacy.list_all()
+
+
+def test_list_orders_by_captured_at_desc(store) -> None:
+    for i, captured in enumerate([100.0, 300.0, 200.0]):
+        store.save(
+            _entry("auth", f"e{i}"),
+            captured_at=captured,
+            policy=RefreshPolicy(MODE_STATIC),
+        )
+    store.save(_entry("other", "x"), captured_at=250.0, policy=RefreshPolicy())
+
+    assert [e["entry_id"] for e in store.list("auth")] == ["e1", "e2", "e0"]
+    assert [e["entry_id"] for e in store.list_all()] == ["e1", "x", "e2", "e0"]
+
+
+def test_save_carries_last_checked_at_forward(store) -> None:
+    policy = RefreshPolicy(MODE_STATIC)
+    store.save(_entry("auth", "e1"), captured_at=100.0, policy=policy)
+    assert store.get("auth", "e1")["last_checked_at"] == 100.0
+
+    store.save(_entry("auth", "e1"), 100.0, policy, last_checked_at=150.0)
+    store.save(_entry("auth", "e1", "new"), captured_at=200.0, policy=policy)
+
+    snap = store.get("auth", "e1")
+    assert snap["captured_at"] == 200.0
+    assert snap["last_checked_at"] == 150.0
+    assert snap["content"] == "new"
+
+
+def test_prune_and_prune_stale(tmp_path) -> None:
+    s = SqliteEntrySnapshotStore(tmp_path, max_per_source=2)
+    for i in range(6):
+        s.save(
+            _entry("auth", f"e{i}"),
+            captured_at=float(i),
+            policy=RefreshPolicy(MODE_STATIC),
+        )
+    s.prune_stale("auth", {f"e{i}" for i in range(6)})
+    assert len(s.list("auth")) == 6
+    s.prune_stale("auth", {"e0"})
+    assert [e["entry_id"] for e in s.list("auth")] == ["e5", "e4", "e0"]
+    s.prune("auth")
+    assert [e["entry_id"] for e in s.list("auth")] == ["e5", "e4"]
+    s.close()
+
+
+def test_due_for_refresh_only_interval(store) -> None:
+    store.save(
+        _entry("auth", "iv"), captured_at=0.0, policy=RefreshPolicy(MODE_INTERVAL, 10)
+    )
+    store.save(
+        _entry("auth", "later"),
+        captured_at=0.0,
+        policy=RefreshPolicy(MODE_INTERVAL, 100),
+    )
+    store.save(_entry("auth", "od"), captured_at=0.0, policy=RefreshPolicy("on_demand"))
+    store.save(_entry("auth", "st"), captured_at=0.0, policy=RefreshPolicy(MODE_STATIC))
+
+    assert store.due_for_refresh(now=15.0) == [("auth", "iv")]
+
+
+def test_due_for_refresh_uses_index(tmp_path, store) -> None:
+    store.save(_entry("a", "e"), 0.0, RefreshPolicy(MODE_INTERVAL, 10))
+    conn = sqlite3.connect(tmp_path / "snapshots.db")
+    plan = " ".join(
+        str(row[-1])
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT authority, entry_id FROM snapshots "
+            "WHERE refresh_mode = 'interval' AND next_refresh_at <= ?",
+            (1.0,),
+        )
+    )
+    conn.close()
+    assert "idx_snapshots_due" in plan
+
+
+def test_clear_authority_and_clear_cache(store) -> None:
+    store.save(_entry("a", "a1"), 1.0, RefreshPolicy(MODE_STATIC))
+    store.save(_entry("b", "b1"), 1.0, RefreshPolicy(MODE_STATIC))
+
+    store.clear_authority("a")
+    assert store.get("a", "a1") is None
+    assert store.get("b", "b1") is not None
+
+    store.clear_cache()
+    assert store.list_all() == []
+
+
+def test_migrates_legacy_directories_once(tmp_path) -> None:
+    legacy = EntrySnapshotStore(tmp_path)
+    legacy.save(_entry("a", "a1"), 100.0, RefreshPolicy(MODE_INTERVAL, 10))
+    legacy.save(
+        _entry("b", "b1"), 200.0, RefreshPolicy(MODE_STATIC), last_checked_at=250.0
+    )
+    expected = legacy.list_all()
+    (tmp_path / "snapshots" / "broken").mkdir()
+    (tmp_path / "snapshots" / "broken" / "x.json").write_text("{", encoding="utf-8")
+
+    s = SqliteEntrySnapshotStore(tmp_path)
+    assert s.list_all() == expected
+    assert s.due_for_refresh(now=110.0) == [("a", "a1")]
+    assert not (tmp_path / "snapshots").exists()
+    s.close()
+
+    # 已迁移：旧目录重新出现也不再导入
+    legacy.save(_entry("c", "c1"), 300.0, RefreshPolicy(MODE_STATIC))
+    reopened = SqliteEntrySnapshotStore(tmp_path)
+    assert reopened.get("c", "c1") is None
+    assert len(reopened.list_all()) == 2
+    reopened.close()
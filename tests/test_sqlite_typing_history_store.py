@@ -0,0 +1,80 @@
+"""Tests for the SQLite typing history store."""
+
+import json
+
+from src.backend.integration.sqlite_typing_history_store import (
+    SqliteTypingHistoryStore,
+)
+
+
+def _record(date_text: str, chars: int):
+    return {"date": date_text, "charNum": chars}
+
+
+def test_append_is_newest_first_and_enforces_retention(tmp_path):
+    store = SqliteTypingHistoryStore(tmp_path / "history.db")
+
+    evicted = []
+    for chars in range(5):
+        evicted += store.append(_record("2026-07-09 10:00:00", chars), 3)
+
+    assert [r["charNum"] for r in store.recent(10)] == [4, 3, 2]
+    assert [r["charNum"] for r in evicted] == [0, 1]
+    assert store.count() == 3
+
+
+def test_records_since_uses_date_range(tmp_path):
+    store = SqliteTypingHistoryStore(tmp_path / "history.db")
+    store.append(_record("2026-07-01 10:00:00", 1), 100)
+    store.append(_record("2026-07-08T09:00:00", 2), 100)
+    store.append(_record("2026-07-09 23:00:00", 3), 100)
+
+    since = store.records_since("2026-07-08")
+
+    assert [r["charNum"] for r in since] == [3, 2]
+
+
+def test_truncate_returns_removed_records(tmp_path):
+    store = SqliteTypingHistoryStore(tmp_path / "history.db")
+    for chars in range(4):
+        store.append(_record("2026-07-09 10:00:00", chars), 100)
+
+    removed = store.truncate(1)
+
+    assert [r["charNum"] for r in removed] == [2, 1, 0]
+    assert [r["charNum"] for r in store.load()["records"]] == [3]
+
+
+def test_migrates_legacy_json_once(tmp_path):
+    legacy = tmp_path / "typing_history.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "records": [
+                    _record("2026-07-09 10:00:00", 2),
+                    _record("2026-07-08 10:00:00", 1),
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    db_path = tmp_path / "history.db"
+
+    store = SqliteTypingHistoryStore(db_path, legacy_json_path=legacy)
+    assert [r["charNum"] for r in store.recent(10)] == [2, 1]
+    store.append(_record("2026-07-10 10:00:00", 3), 100)
+    store.close()
+
+    reopened = SqliteTypingHistoryStore(db_path, legacy_json_path=legacy)
+    assert [r["charNum"] for r in reopened.recent(10)] == [3, 2, 1]
+    assert legacy.exists()
+
+
+def test_save_replaces_all_records(tmp_path):
+    store = SqliteTypingHistoryStore(tmp_path / "history.db")
+    store.append(_record("2026-07-09 10:00:00", 1), 100)
+
+    store.save({"records": [_record("2026-07-09 11:00:00", 9), "bad"]})
+
+    assert store.load()["records"] == [_record("2026-07-09 11:00:00", 9)]
@@ -1,6 +1,11 @@
 """TextSessionUseCase 和 Feistel permutation 测试。"""
 
+import pytest
+
 from src.backend.application.usecases.text_session_usecase import (
+    SHUFFLE_VERSION,
+    SHUFFLE_VERSION_MIX64,
+    SHUFFLE_VERSION_SHA256,
     TextSessionUseCase,
     _FeistelPermutation,
     _ShuffledSegmentProvider,
@@ -58,6 +63,36 @@ class TestFeistelPermutation:
         results = [perm.encode(i) for i in range(2)]
         assert sorted(results) == [0, 1]
 
+    def test_sha256_version_reproduces_saved_orders(self):
+        # 旧进度只存了 seed：SHA-256 版的排列必须与历史版本逐位一致
+        perm = _FeistelPermutation(1000, seed=42)
+        assert perm.encode_many(range(8)) == [629, 514, 986, 676, 795, 490, 845, 444]
+        perm = _FeistelPermutation(10_000_000, seed=850682343)
+        assert perm.encode_many([0, 1, 2, 9_999_999]) == [
+            6060178,
+            3473126,
+            875080,
+            8841281,
+        ]
+
+    def test_mix64_version_is_a_distinct_bijection(self):
+        for n in [2, 3, 5, 97, 128, 129, 12345]:
+            perm = _FeistelPermutation(n, seed=42, version=SHUFFLE_VERSION_MIX64)
+            assert sorted(perm.encode_many(range(n))) == list(range(n))
+        legacy = _FeistelPermutation(1000, seed=42)
+        mixed = _FeistelPermutation(1000, seed=42, version=SHUFFLE_VERSION_MIX64)
+        assert mixed.encode_many(range(1000)) != legacy.encode_many(range(1000))
+
+    def test_encode_many_matches_encode(self):
+        for version in (SHUFFLE_VERSION_SHA256, SHUFFLE_VERSION_MIX64):
+            perm = _FeistelPermutation(5000, seed=7, version=version)
+            indices = [4999, 0, 17, 17, 2500]
+            assert perm.encode_many(indices) == [perm.encode(i) for i in indices]
+
+    def test_unknown_version_rejected(self):
+        with pytest.raises(ValueError):
+            _FeistelPermutation(100, seed=1, version=99)
+
 
 class TestShuffledSegmentProvider:
     def test_preserves_all_characters(self):
@@ -85,6 +120,17 @@ class TestShuffledSegmentProvider:
         assert shuffled.get_segment(0, 0) == ""
         assert shuffled.get_segment(-1, 5) == ""
 
+    def test_segment_matches_per_char_lookup(self):
+        text = "".join(chr(0x4E00 + i % 500) for i in range(3000))
+        provider = InMemorySegmentProvider(text)
+        perm = _FeistelPermutation(len(text), seed=9)
+        shuffled = _ShuffledSegmentProvider(provider, perm)
+        expected = "".join(text[perm.encode(i)] for i in range(100, 900))
+        assert shuffled.get_segment(100, 800) == expected
+        assert shuffled.get_chars([5, 5, 2999]) == (
+            text[perm.encode(5)] * 2 + text[perm.encode(2999)]
+        )
+
     def test_get_total_chars(self):
         text = "abcdef"
         provider = InMemorySegmentProvider(text)
@@ -160,3 +206,19 @@ class TestShuffleAllVirtual:
             seg = shuffled.get_segment(i, 1)
             all_chars += seg.content
         assert sorted(all_chars) == sorted(text)
+
+    def test_feistel_path_uses_requested_version(self):
+        text = "".join(chr(0x4E00 + i) for i in range(300))
+        usecase = _make_usecase(text, full_shuffle_threshold=10)
+
+        current = usecase.shuffle_all_virtual(seed=42)
+        legacy = usecase.shuffle_all_virtual(seed=42, shuffle_version=None)
+        pinned = usecase.shuffle_all_virtual(
+            seed=42, shuffle_version=SHUFFLE_VERSION_SHA256
+        )
+
+        assert usecase.shuffle_version is None
+        assert current.shuffle_version == SHUFFLE_VERSION
+        assert legacy.shuffle_version == SHUFFLE_VERSION_SHA256
+        assert legacy.get_segment(1, 300).content == pinned.get_segment(1, 300).content
+        assert current.get_segment(1, 300).content != legacy.get_segment(1, 300).content
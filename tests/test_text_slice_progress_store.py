@@ -0,0 +1,136 @@
+"""TextSliceProgressStore：内存索引 + 追加日志 + write-behind + compaction。"""
+
+import json
+
+from src.backend.integration import text_slice_progress_store as tsps
+from src.backend.integration.text_slice_progress_store import (
+    TextSliceProgressStore,
+    _text_hash,
+)
+
+
+def _progress(current: int, accessed: str = "2026-01-01T00:00:00") -> dict:
+    return {"current_slice": current, "total_slices": 10, "last_accessed": accessed}
+
+
+def _log_lines(path) -> list[dict]:
+    """解析日志：头部 JSON，写入记录附带条目（键 "v"）。"""
+    records = []
+    for line in path.read_text("utf-8").splitlines():
+        head, _, raw = line.partition("\t")
+        record = json.loads(head)
+        if raw:
+            record["v"] = json.loads(raw)
+        records.append(record)
+    return records
+
+
+def test_writes_are_deferred_until_flush_and_survive_reopen(tmp_path):
+    path = tmp_path / "progress.json"
+    store = TextSliceProgressStore(path, flush_delay=60)
+
+    store.save_progress("text-a", "甲", _progress(2))
+    store.save_progress("text-b", "乙", _progress(5))
+    store.delete_progress("text-b")
+
+    # 读走内存，尚未落盘
+    assert store.get_progress("text-a")["current_slice"] == 2
+    assert store.get_progress("text-b") is None
+    assert not (tmp_path / "progress.jsonl").exists()
+
+    store.close()
+    reopened = TextSliceProgressStore(path)
+    assert reopened.get_progress("text-a")["current_slice"] == 2
+    assert reopened.get_progress("text-b") is None
+    assert len(_log_lines(tmp_path / "progress.jsonl")) == 3
+
+
+def test_returned_entries_are_independent_copies(tmp_path):
+    store = TextSliceProgressStore(tmp_path / "progress.json", flush_delay=0)
+    store.save_progress("text-a", "甲", _progress(2))
+
+    entry = store.get_progress("text-a")
+    entry["current_slice"] = 99
+
+    assert store.get_progress("text-a")["current_slice"] == 2
+
+
+def test_title_prefix_lookup_returns_latest_and_tracks_renames(tmp_path):
+    store = TextSliceProgressStore(tmp_path / "progress.json", flush_delay=0)
+    store.save_progress("old", "前五百 2/50", _progress(2, "2025-01-01T00:00:00"))
+    store.save_progress("new", "前五百 1/50", _progress(1, "2026-05-29T10:00:00"))
+    store.save_progress("other", "后五百", _progress(7, "2027-01-01T00:00:00"))
+
+    key, entry = store.find_latest_by_title_prefix("前五百")
+    assert key == _text_hash("new")
+    assert entry["current_slice"] == 1
+
+    store.save_progress("new", "别的标题", _progress(1, "2026-05-29T10:00:00"))
+    key, _ = store.find_latest_by_title_prefix("前五百")
+    assert key == _text_hash("old")
+    store.delete_progress("old")
+    assert store.find_latest_by_title_prefix("前五百") is None
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    path = tmp_path / "progress.json"
+    legacy = {_text_hash("text-a"): {"text_title": "甲", "current_slice": 4}}
+    path.write_text(json.dumps(legacy, ensure_ascii=False), encoding="utf-8")
+
+    store = TextSliceProgressStore(path)
+
+    assert store.get_progress("text-a")["current_slice"] == 4
+    assert not path.exists()
+    backup = tmp_path / "progress.json.migrated"
+    assert json.loads(backup.read_text("utf-8")) == legacy
+    assert _log_lines(tmp_path / "progress.jsonl") == [
+        {
+            "k": _text_hash("text-a"),
+            "t": "甲",
+            "a": "",
+            "v": legacy[_text_hash("text-a")],
+        }
+    ]
+
+
+def test_pending_writes_are_flushed_at_exit(tmp_path):
+    path = tmp_path / "progress.json"
+    store = TextSliceProgressStore(path, flush_delay=60)
+    store.save_progress("text-a", "甲", _progress(6))
+
+    tsps._flush_open_stores()  # 即 atexit 钩子
+
+    assert TextSliceProgressStore(path).get_progress("text-a")["current_slice"] == 6
+
+
+def test_log_is_compacted_once_it_outgrows_live_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(tsps, "_COMPACT_MIN_RECORDS", 8)
+    path = tmp_path / "progress.json"
+    store = TextSliceProgressStore(path, flush_delay=0)
+
+    for i in range(20):
+        store.save_progress("text-a", "甲", _progress(i))
+    store.save_progress("text-b", "乙", _progress(1))
+
+    assert len(_log_lines(tmp_path / "progress.jsonl")) <= 8
+    reopened = TextSliceProgressStore(path)
+    assert reopened.get_progress("text-a")["current_slice"] == 19
+    assert reopened.get_progress("text-b")["current_slice"] == 1
+
+
+def test_torn_tail_line_is_skipped_and_repaired(tmp_path):
+    path = tmp_path / "progress.json"
+    store = TextSliceProgressStore(path, flush_delay=0)
+    store.save_progress("text-a", "甲", _progress(3))
+    log_path = tmp_path / "progress.jsonl"
+    with log_path.open("a", encoding="utf-8") as f:
+        f.write('{"k":"abc","t":"丙","a":""}\t{"text_ti')
+
+    reopened = TextSliceProgressStore(path, flush_delay=0)
+    assert reopened.get_progress("text-a")["current_slice"] == 3
+    reopened.save_progress("text-b", "乙", _progress(1))
+
+    assert [r["k"] for r in _log_lines(log_path)] == [
+        _text_hash("text-a"),
+        _text_hash("text-b"),
+    ]
@@ -1,12 +1,15 @@
-"""TypingAdapter.restore_slice_progress 针对性单测。
+"""TypingAdapter.restore_slice_progress 与提交着色针对性单测。
 
 覆盖 slice_pass_counts / slice_metrics / slice_stats 三分支，
-含 None / 空 dict / 越界等边界。
+含 None / 空 dict / 越界等边界；以及按段合并的提交着色。
 """
 
 from unittest.mock import MagicMock
 
+from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor, QTextDocument
+
 from src.backend.application.session_context import TypingSessionContext
+from src.backend.domain.services.typing_service import TypingService
 from src.backend.presentation.adapters.typing_adapter import TypingAdapter
 
 
@@ -270,3 +273,77 @@ def test_get_slice_criteria_text_after_decrease():
 
     assert text.startswith("击键≥")
     assert "键准≥" in text
+
+
+# ---------------------------------------------------------------------------
+# 提交着色：按格式合并连续位置，逐段一次 setCharFormat
+# ---------------------------------------------------------------------------
+
+
+class _CountingCursor(QTextCursor):
+    def __init__(self, doc: QTextDocument):
+        super().__init__(doc)
+        self.format_calls = 0
+
+    def setCharFormat(self, fmt: QTextCharFormat) -> None:
+        self.format_calls += 1
+        super().setCharFormat(fmt)
+
+
+def _make_coloring_adapter(text: str) -> tuple[TypingAdapter, _CountingCursor]:
+    service = TypingService()
+    adapter = TypingAdapter(typing_service=service, score_gateway=MagicMock())
+    doc = QTextDocument(text)
+    adapter._rich_doc = doc
+    cursor = _CountingCursor(doc)
+    adapter._cursor = cursor
+    service.set_total_chars(len(text))
+    service.set_plain_doc(text)
+    service.start()
+    return adapter, cursor
+
+
+def _background_at(doc: QTextDocument, pos: int) -> str:
+    cursor = QTextCursor(doc)
+    cursor.setPosition(pos + 1)
+    return cursor.charFormat().background().color().name()
+
+
+def test_phrase_commit_colors_one_range_per_format_run():
+    adapter, cursor = _make_coloring_adapter("天地玄黄宇宙洪荒")
+
+    adapter.handleCommittedText("天地x黄", 4)
+
+    # 对对 | 错 | 对 → 3 段
+    assert cursor.format_calls == 3
+    doc = adapter._rich_doc
+    assert _background_at(doc, 0) == _background_at(doc, 1)
+    assert _background_at(doc, 2) == QColor("red").name()
+    assert _background_at(doc, 3) == QColor("gray").name()
+
+
+def test_partial_deletion_clears_deleted_range_in_one_call():
+    adapter, cursor = _make_coloring_adapter("天地玄黄宇宙洪荒")
+    adapter.handleCommittedText("天地玄黄宇宙", 6)
+    cursor.format_calls = 0
+
+    adapter.handleCommittedText("", -5)
+
+    assert cursor.format_calls == 1
+    assert _background_at(adapter._rich_doc, 0) == QColor("gray").name()
+    assert _background_at(adapter._rich_doc, 3) != QColor("gray").name()
+
+
+def test_full_deletion_clears_document_formatting():
+    adapter, cursor = _make_coloring_adapter("天地玄黄")
+    adapter.handleCommittedText("天地玄黄"[:3], 3)
+    cursor.format_calls = 0
+    colored_doc = adapter._rich_doc
+    # QML 替换了 _rich_doc：清除仍须作用于 cursor 所在的文档
+    adapter._rich_doc = QTextDocument("天地玄黄")
+
+    adapter.handleCommittedText("", -3)
+
+    assert cursor.format_calls == 0
+    for pos in range(3):
+        assert _background_at(colored_doc, pos) == QColor("transparent").name()
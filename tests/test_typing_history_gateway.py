@@ -1,9 +1,10 @@
 from datetime import date
 
 from src.backend.application.gateways.typing_history_gateway import TypingHistoryGateway
+from src.backend.ports.typing_history_store import TypingHistoryStore
 
 
-class InMemoryTypingHistoryStore:
+class InMemoryTypingHistoryStore(TypingHistoryStore):
     def __init__(self, records=None):
         self.data = {"version": 1, "records": records or []}
 
@@ -95,3 +96,99 @@ def test_monthly_trend_aggregates_recent_12_months():
     assert len(trend) == 12
     assert trend[-2] == {"date": "2026-06", "period": "month", "chars": 3}
     assert trend[-1] == {"date": "2026-07", "period": "month", "chars": 27}
+
+
+def test_append_record_keeps_newest_first_within_max_records():
+    store = InMemoryTypingHistoryStore()
+    gateway = TypingHistoryGateway(store, max_records=2)
+
+    for chars in (1, 2, 3):
+        gateway.append_record(_record("2026-07-09 10:00:00", chars))
+
+    assert [r["charNum"] for r in gateway.get_records()] == [3, 2]
+    assert gateway.get_count() == 2
+
+
+def test_set_max_records_truncates_oldest():
+    store = InMemoryTypingHistoryStore(
+        [_record("2026-07-09 10:00:00", n) for n in (3, 2, 1)]
+    )
+    gateway = TypingHistoryGateway(store)
+
+    gateway.set_max_records(1)
+
+    assert [r["charNum"] for r in store.load()["records"]] == [3]
+
+
+class CountingHistoryStore(InMemoryTypingHistoryStore):
+    def __init__(self, records=None):
+        super().__init__(records)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return super().load()
+
+
+def test_summary_and_trends_reuse_aggregates_across_appends():
+    store = CountingHistoryStore([_record("2026-07-09 10:00:00", 5)])
+    gateway = TypingHistoryGateway(store, today_provider=lambda: date(2026, 7, 9))
+    gateway.get_summary()
+    loads_after_build = store.loads
+
+    gateway.append_record({"date": "2026-07-09 11:30:00", "charNum": 7, "speed": 90})
+    for period in ("hour", "day", "week", "month"):
+        gateway.get_trend(period)
+    summary = gateway.get_summary()
+
+    # append 自身经默认实现读一次存储；查询不再全量加载
+    assert store.loads == loads_after_build + 1
+    assert summary["total_chars"] == 12
+    assert summary["total_sessions"] == 2
+    assert gateway.get_trend("hour")[11]["chars"] == 7
+    assert gateway.get_trend("day")[-1]["chars"] == 12
+
+
+def test_aggregates_drop_evicted_records():
+    gateway = TypingHistoryGateway(
+        InMemoryTypingHistoryStore(),
+        max_records=2,
+        today_provider=lambda: date(2026, 7, 9),
+    )
+    gateway.get_summary()
+
+    for speed, chars in ((150, 10), (80, 20), (100, 30)):
+        gateway.append_record(
+            {"date": "2026-07-09 10:00:00", "charNum": chars, "speed": speed}
+        )
+
+    summary = gateway.get_summary()
+    assert summary["total_sessions"] == 2
+    assert summary["total_chars"] == 50
+    assert summary["max_speed"] == 100.0
+    assert summary["average_speed"] == 90.0
+    assert gateway.get_trend("day")[-1]["chars"] == 50
+
+
+def test_incremental_aggregates_match_rebuild():
+    store = InMemoryTypingHistoryStore()
+    gateway = TypingHistoryGateway(
+        store, max_records=3, today_provider=lambda: date(2026, 7, 9)
+    )
+    gateway.get_summary()
+    for i in range(6):
+        gateway.append_record(
+            {
+                "date": f"2026-07-0{i + 1} 0{i}:00:00",
+                "charNum": i + 1,
+                "speed": 50 + i,
+                "keyAccuracy": 90 + i,
+            }
+        )
+    gateway.set_max_records(2)
+    incremental = gateway.get_summary(), gateway.get_trend("day")
+
+    gateway.rebuild_aggregates()
+
+    assert (gateway.get_summary(), gateway.get_trend("day")) == incremental
+    assert incremental[0]["max_speed"] == 55.0
@@ -0,0 +1,71 @@
+"""TypingService 错字计数（树状数组）测试。"""
+
+from src.backend.domain.services.typing_service import (
+    ErrorFenwickTree,
+    TypingService,
+)
+
+
+def _make_service(text: str) -> TypingService:
+    service = TypingService()
+    service.set_total_chars(len(text))
+    service.set_plain_doc(text)
+    service.start()
+    return service
+
+
+def test_fenwick_range_counts():
+    tree = ErrorFenwickTree(10)
+    for pos in (1, 4, 5, 9):
+        tree.set(pos, True)
+    tree.set(4, True)  # 重复设置不重复计数
+
+    assert tree.prefix(10) == 4
+    assert tree.range_count(2, 6) == 2
+    assert tree.range_count(6, 9) == 0
+    tree.set(5, False)
+    assert tree.range_count(0, 10) == 3
+    tree.set(42, True)  # 越界忽略
+    assert tree.prefix(100) == 3
+
+
+def test_wrong_count_tracks_typed_errors():
+    service = _make_service("中国功夫")
+    service.handle_committed_text("中x", 2)
+    service.handle_committed_text("功y", 2)
+
+    assert service.wrong_num == 2
+
+
+def test_deletion_drops_errors_of_deleted_positions():
+    service = _make_service("中国功夫")
+    service.handle_committed_text("中x功y", 4)
+    assert service.wrong_num == 2
+
+    service.handle_committed_text("", -2)
+
+    assert service.wrong_num == 1
+    assert service.score_data.char_count == 2
+
+
+def test_mid_text_correction_keeps_later_errors():
+    service = _make_service("中国功夫")
+    service.handle_committed_text("x国功y", 4)
+    assert service.wrong_num == 2
+
+    # 改正首字：纯替换（grow_length=0），提交串覆盖从改动位置到末尾
+    service.handle_committed_text("中国功y", 0)
+
+    assert service.wrong_num == 1
+    assert service.state.wrong_chars.range_count(0, 4) == 1
+
+
+def test_completion_requires_correct_last_char():
+    service = _make_service("中国")
+    _, completed = service.handle_committed_text("中x", 2)
+    assert not completed
+
+    service.handle_committed_text("", -1)
+    _, completed = service.handle_committed_text("国", 1)
+    assert completed
+    assert service.wrong_num == 0